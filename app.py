@@ -1,19 +1,21 @@
 import gradio as gr
 import main  # main.py에 작성된 전처리 로직 호출
-import os
-import pandas as pd
+import threading
 import traceback
-import sys
-import re
-from io import StringIO
+from core import config as cfg
+from core.result import PipelineResult
+from utils.cache_utils import result_cache
+from utils.job_utils import JobQueue
+from utils.profile_utils import format_profile
 
-def process_file(file_path, voucher_number, employee_number):
+# 변환 작업은 제한된 작업 풀에서 처리 (동시 요청이 서로를 막거나 로그가 섞이지 않도록)
+job_queue = JobQueue(max_workers=cfg.WEB_MAX_WORKERS, max_pending=cfg.WEB_MAX_PENDING_JOBS)
+
+def process_file(file_path, voucher_number, employee_number, profile=False, aggregate=False, max_lines=0):
     # 상태 메시지와 결과를 함께 반환하기 위한 변수 초기화
     status_message = ""
     output_file_path = None
-    
-    # 로그를 캡처하기 위한 StringIO 객체
-    log_capture = StringIO()
+    job = None
     
     # 입력값 검증
     if file_path is None:
@@ -25,27 +27,22 @@ def process_file(file_path, voucher_number, employee_number):
     if not employee_number or not employee_number.strip():
         return None, "사원번호를 입력해주세요. 사원번호는 필수 입력값입니다."
 
-    try:
-        # 표준 출력을 캡처
-        original_stdout = sys.stdout
-        sys.stdout = log_capture
-        
-        # 파일 확장자 확인
-        ext = os.path.splitext(file_path)[1].lower()
+    # 전표당 최대 라인 수 (0 또는 빈 값이면 나누지 않음)
+    max_lines = int(max_lines) if max_lines else None
+    if max_lines is not None and max_lines < 2:
+        return None, "전표당 최대 라인 수는 2 이상이어야 합니다. (나누지 않으려면 0)"
 
-        if ext == ".xlsx":
-            # 엑셀 파일을 CSV로 변환
-            df = pd.read_excel(file_path)
-            csv_path = file_path.replace(".xlsx", ".csv")
-            df.to_csv(csv_path, index=False)
-            input_path = csv_path
-        else:
-            # 이미 CSV 파일이면 그대로 사용
-            input_path = file_path
+    # 처리 결과 (오류가 나도 그때까지 인식된 필드, 매핑되지 않은 팀명 등이 채워짐)
+    result = PipelineResult()
 
-        # 메인 전처리 함수 호출 (전표번호와 사원번호 넘겨주기)
-        output_path = main.process_rental_company_with_voucher(input_path, voucher_number, employee_number)
-        output_file_path = output_path
+    try:
+        # 메인 전처리 함수를 작업 큐에 등록 (전표번호와 사원번호 넘겨주기)
+        # CSV와 .xlsx 모두 업로드 경로 그대로 전달 (엑셀은 필요한 컬럼만 메모리에서 직접 읽음)
+        # 화면 표시는 결과 객체로 하므로 작업 중 print 출력은 캡처하지 않음
+        job = job_queue.submit(main.process_rental_company_with_voucher, file_path, voucher_number, employee_number,
+                               verbose=False, result=result, profile=profile, aggregate=aggregate,
+                               max_lines=max_lines, capture_log=False)
+        output_file_path = job.result().output_path
         
         # 성공 메시지 작성
         status_message = "✅ 파일 변환 성공! 위 버튼을 클릭하여 다운로드하세요."
@@ -55,57 +52,28 @@ def process_file(file_path, voucher_number, employee_number):
         status_message = f"❌ 오류 발생: {str(e)}"
     
     finally:
-        # 캡처된 로그 가져오기
-        log_output = log_capture.getvalue()
-        sys.stdout = original_stdout  # 원래 표준 출력으로 복구
-        
-        # 주요 정보 추출 (오류 발생 여부와 상관없이)
-        important_info = []
-        
-        # 금액 필드 정보 추출
-        amount_field_match = re.search(r"사용할 금액 필드: '([^']*)'", log_output)
-        if amount_field_match:
-            important_info.append(f"사용할 금액 필드: '{amount_field_match.group(1)}'")
-        
-        # 팀 필드 정보 추출
-        team_field_match = re.search(r"팀 필드로 '([^']*)'를 자동 인식했습니다", log_output)
-        if team_field_match:
-            important_info.append(f"팀 필드로 '{team_field_match.group(1)}'를 자동 인식했습니다.")
-        
-        # 제외된 항목 정보 추출
-        excluded_rows_match = re.search(r"금액이 없는 행\(반납 항목\) (\d+)개를 제외합니다", log_output)
-        if excluded_rows_match:
-            important_info.append(f"금액이 없는 행(반납 항목) {excluded_rows_match.group(1)}개를 제외합니다.")
+        # 주요 정보 (오류 발생 여부와 상관없이), 매핑 오류 정보는 오류가 있을 경우에만 표시
+        important_info = result.summary_lines(include_unmapped=not output_file_path)
         
-        # 금액 정보 추출
-        amt_info = []
-        debit_sum_match = re.search(r"차변 금액 합계: (\d+)", log_output)
-        credit_sum_match = re.search(r"대변 금액: (\d+)", log_output)
-        debit_count_match = re.search(r"차변 건수: (\d+)", log_output)
-        credit_count_match = re.search(r"대변 건수: (\d+)", log_output)
+        # 성능 프로파일 (선택 시)
+        if result.profile is not None:
+            important_info.extend(format_profile(result.profile))
+            important_info.append(f"프로파일 저장: {result.profile_path}")
         
-        if debit_sum_match:
-            amt_info.append(f"차변 금액 합계: {int(debit_sum_match.group(1)):,}")
-        if credit_sum_match:
-            amt_info.append(f"대변 금액: {int(credit_sum_match.group(1)):,}")
-        if debit_count_match:
-            amt_info.append(f"차변 건수: {debit_count_match.group(1)}")
-        if credit_count_match:
-            amt_info.append(f"대변 건수: {credit_count_match.group(1)}")
+        # 작업 대기/처리 시간 및 대기열 상태
+        if job is not None:
+            queue_stats = job_queue.stats()
+            important_info.append(
+                f"처리 시간: 대기 {job.wait_time:.1f}초 / 변환 {job.run_time:.1f}초 "
+                f"(대기열 {queue_stats['queue_depth']}건, 처리 중 {queue_stats['running']}건)"
+            )
         
-        if amt_info:
-            important_info.append("AMT 필드 확인:")
-            important_info.extend(amt_info)
-        
-        # 매핑 오류 정보 추출 (오류가 있을 경우에만)
-        if not output_file_path and "매핑되지 않은 팀명" in log_output:  # 오류 발생 시에만 매핑 정보 표시
-            unmapped_section = re.search(r"매핑되지 않은 팀명 (\d+)개:(.*?)(?=\n\n|\Z)", log_output, re.DOTALL)
-            if unmapped_section:
-                unmapped_count = unmapped_section.group(1)
-                unmapped_teams = re.findall(r"- '([^']*)'", unmapped_section.group(2))
-                important_info.append(f"매핑되지 않은 팀명 {unmapped_count}개:")
-                for team in unmapped_teams:
-                    important_info.append(f"- '{team}'")
+        # 전처리 결과 캐시 상태 (같은 파일 재제출 시 재사용)
+        cache_stats = result_cache.stats()
+        important_info.append(
+            f"전처리 결과 캐시: 재사용 {cache_stats['hits']}회 / 새로 처리 {cache_stats['misses']}회 "
+            f"(보관 {cache_stats['entries']}건, {cache_stats['bytes'] / (1024 * 1024):.1f}MB)"
+        )
         
         # 주요 정보를 상태 메시지에 추가 (항상)
         if important_info:
@@ -135,6 +103,21 @@ with gr.Blocks() as demo:
             placeholder="예: 00616"
         )
 
+    with gr.Row():
+        profile_input = gr.Checkbox(
+            label="성능 프로파일 기록 (단계별 시간/메모리 측정, 처리 속도가 느려짐)",
+            value=False
+        )
+        aggregate_input = gr.Checkbox(
+            label="차변 라인 집계 (계정/프로젝트/적요가 같은 행을 한 라인으로, 라인별 원본 행 내역 파일 함께 저장)",
+            value=False
+        )
+        max_lines_input = gr.Number(
+            label="전표당 최대 라인 수 (0이면 나누지 않음, 넘으면 전표번호 뒤에 -1, -2 ...를 붙인 여러 전표를 zip으로 받음)",
+            value=0,
+            precision=0
+        )
+
     with gr.Row():
         submit_btn = gr.Button("제출", variant="primary")
         clear_btn = gr.Button("지우기")
@@ -149,18 +132,25 @@ with gr.Blocks() as demo:
     )
 
     # 버튼 클릭 이벤트 연결
+    # 핸들러는 작업 큐에 넘기고 기다리기만 하므로 대기열 크기만큼 동시에 받음
     submit_btn.click(
         fn=process_file,
-        inputs=[file_input, voucher_input, employee_input],
-        outputs=[output_file, status_output]
+        inputs=[file_input, voucher_input, employee_input, profile_input, aggregate_input, max_lines_input],
+        outputs=[output_file, status_output],
+        concurrency_limit=cfg.WEB_MAX_WORKERS + cfg.WEB_MAX_PENDING_JOBS
     )
 
     clear_btn.click(
-        fn=lambda: (None, "", "", ""),
+        fn=lambda: (None, "", "", False, False, 0, ""),
         inputs=[],
-        outputs=[file_input, voucher_input, employee_input, status_output]
+        outputs=[file_input, voucher_input, employee_input, profile_input, aggregate_input, max_lines_input, status_output]
     )
 
-# 시작 메시지 표시
-print("ERP 자동 전표 변환기가 시작되었습니다.")
-demo.launch()
\ No newline at end of file
+if __name__ == "__main__":
+    # 첫 요청이 pandas 등 모듈 로드를 기다리지 않도록 화면을 띄우는 동안 미리 로드
+    threading.Thread(target=main.preload_modules, daemon=True).start()
+    
+    # 시작 메시지 표시
+    print("ERP 자동 전표 변환기가 시작되었습니다.")
+    cfg.ensure_directories()
+    demo.launch()
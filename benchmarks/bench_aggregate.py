@@ -0,0 +1,69 @@
+"""
+집계 전표 벤치마크: 원본 행마다 차변 라인 vs 계정/프로젝트/적요별 집계 라인
+
+합성 렌탈료 CSV를 실제 매핑으로 전처리한 df_filtered로 전표 라인 수, 집계 시간, 저장 시간,
+출력 파일 크기를 비교한다 (집계 방식의 CSV 시간에는 라인별 원본 행 내역 파일 저장이 포함됨).
+집계 전표의 차변 합계와 라인별 원본 행 내역 합계가 원본 금액 합계와 같은지도 확인한다.
+
+실행: python -m benchmarks.bench_aggregate [--rows 10000 100000]
+"""
+import argparse
+import io
+import os
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+from core.config import RENTAL_COMPANIES
+from generators.korea_rental_gen import build_compact_voucher
+from mappers.mapping_utils import load_mapping_file
+from processors.rental_processor import aggregate_lines, build_drilldown, load_and_preprocess_data
+from utils.excel_utils import save_drilldown_file, write_excel_file, write_voucher_csv
+from benchmarks.synthetic import generate_rental_csv
+
+
+def main():
+    parser = argparse.ArgumentParser(description='집계 전표 벤치마크')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    config = dict(RENTAL_COMPANIES['한국렌탈'], id_write='00616')
+    print(f"{'원본 행':>8} | {'방식':<4} | {'라인 수':>8} | {'집계 (s)':>8} | {'CSV (s)':>8} | {'엑셀 (s)':>8} | "
+          f"{'CSV (MB)':>8} | {'엑셀 (MB)':>9} | 합계 일치")
+    with tempfile.TemporaryDirectory(prefix='bench_aggregate_') as work_dir:
+        for rows in args.rows:
+            with redirect_stdout(io.StringIO()):
+                input_file = generate_rental_csv(os.path.join(work_dir, f'input_{rows}.csv'), rows, config)
+                _, df_filtered = load_and_preprocess_data(input_file, config, load_mapping_file(config['mapping_file']))
+            total = int(df_filtered["금액"].sum())
+            for label in ('원본', '집계'):
+                with redirect_stdout(io.StringIO()):
+                    start = time.perf_counter()
+                    if label == '집계':
+                        lines, line_numbers = aggregate_lines(df_filtered)
+                        drilldown = build_drilldown(df_filtered, line_numbers)
+                    else:
+                        lines, drilldown = df_filtered, None
+                    aggregate_sec = time.perf_counter() - start
+
+                    voucher = build_compact_voucher(lines, config).apply_template(None)
+                    csv_path = os.path.join(work_dir, f'{label}_{rows}.csv')
+                    start = time.perf_counter()
+                    write_voucher_csv(voucher, csv_path)
+                    if drilldown is not None:
+                        save_drilldown_file(drilldown, csv_path)
+                    csv_sec = time.perf_counter() - start
+                    start = time.perf_counter()
+                    excel_path = write_excel_file(voucher, os.path.join(work_dir, f'{label}_{rows}.xls'))
+                    excel_sec = time.perf_counter() - start
+
+                matches = int(lines["금액"].sum()) == total
+                if drilldown is not None:
+                    matches = matches and int(drilldown["금액"].sum()) == total
+                print(f"{rows:>8,} | {label:<4} | {len(lines):>8,} | {aggregate_sec:>8.3f} | {csv_sec:>8.3f} | {excel_sec:>8.3f} | "
+                      f"{os.path.getsize(csv_path) / 2**20:>8.2f} | {os.path.getsize(excel_path) / 2**20:>9.2f} | "
+                      f"{'예' if matches else '아니오'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+전표 메모리 벤치마크: 전체 데이터프레임(140여 개 object 컬럼) vs 압축 전표(CompactVoucher)
+
+양식 적용까지 마친 전표가 차지하는 메모리(tracemalloc 기준)와, 저장한 CSV가 같은지 비교한다.
+압축 전표는 계정/적요 배열을 df_filtered와 공유하므로 그만큼은 유지 메모리에 포함되지 않는다.
+
+실행: python -m benchmarks.bench_compact_voucher [--rows 10000 100000]
+"""
+import argparse
+import filecmp
+import io
+import os
+import tempfile
+import tracemalloc
+from contextlib import redirect_stdout
+
+from core.config import RENTAL_COMPANIES
+from generators.korea_rental_gen import build_compact_voucher, build_erp_frame
+from utils.excel_utils import save_to_csv
+from utils.template_utils import prepare_file_with_template
+from benchmarks.bench_erp_builder import make_filtered_frame
+
+
+def _retained_mb(build) -> tuple:
+    """
+    build()가 만든 객체가 유지하는 메모리와 생성 중 최대 메모리(MB) 측정
+    """
+    tracemalloc.start()
+    try:
+        obj = build()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return obj, current / (1024 * 1024), peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='전표 메모리 벤치마크')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    config = dict(RENTAL_COMPANIES['한국렌탈'], id_write='00616')
+
+    print(f"{'행 수':>10} | {'프레임 유지 (MB)':>16} | {'압축 유지 (MB)':>14} | {'배율':>6} | {'압축 생성 최대 (MB)':>18} | CSV 동일")
+    for rows in args.rows:
+        df_filtered = make_filtered_frame(rows)
+        with redirect_stdout(io.StringIO()), tempfile.TemporaryDirectory(prefix='bench_voucher_') as work_dir:
+            frame, frame_mb, _ = _retained_mb(
+                lambda: prepare_file_with_template(build_erp_frame(df_filtered, config), None))
+            voucher, voucher_mb, voucher_peak_mb = _retained_mb(
+                lambda: prepare_file_with_template(build_compact_voucher(df_filtered, config), None))
+
+            # 저장 결과가 같은지 확인
+            frame_csv = os.path.join(work_dir, 'frame.csv')
+            voucher_csv = os.path.join(work_dir, 'voucher.csv')
+            save_to_csv(frame, frame_csv)
+            save_to_csv(voucher, voucher_csv)
+            same = filecmp.cmp(frame_csv, voucher_csv, shallow=False)
+
+        print(f"{rows:>10,} | {frame_mb:>16.1f} | {voucher_mb:>14.1f} | {frame_mb / voucher_mb:>5.1f}x | "
+              f"{voucher_peak_mb:>18.1f} | {'예' if same else '아니오'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+CSV 저장 벤치마크: 조각별 데이터프레임 to_csv vs 스트리밍 CSV 기록(write_voucher_csv)
+
+양식이 적용된 압축 전표를 두 방식으로 저장하여 저장 시간과 최대 할당 메모리(tracemalloc)를
+비교하고 두 파일이 같은지 확인한다.
+
+실행: python -m benchmarks.bench_csv_writer [--rows 10000 100000]
+"""
+import argparse
+import filecmp
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from typing import Callable, Tuple
+
+from core import config as cfg
+from core.config import RENTAL_COMPANIES
+from core.voucher import CompactVoucher
+from generators.korea_rental_gen import build_compact_voucher
+from utils.excel_utils import write_voucher_csv
+from benchmarks.bench_erp_builder import make_filtered_frame
+
+
+def legacy_write(voucher: CompactVoucher, output_path: str) -> None:
+    """
+    기존 방식: 조각마다 데이터프레임을 만들어 to_csv (첫 조각에 양식 행을 붙임)
+    """
+    for index, frame in enumerate(voucher.iter_frames()):
+        if index == 0:
+            frame.to_csv(output_path, index=False, encoding=cfg.CSV_OUTPUT_ENCODING)
+        else:
+            frame.to_csv(output_path, index=False, header=False, mode='a', encoding=cfg.DEFAULT_ENCODING)
+
+
+def _timed(write: Callable[[CompactVoucher, str], None], voucher: CompactVoucher, output_path: str) -> Tuple[float, float]:
+    """
+    저장 시간(tracemalloc 없이)과 최대 할당 MB(tracemalloc으로 한 번 더 실행) 측정
+    """
+    start = time.perf_counter()
+    write(voucher, output_path)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    write(voucher, output_path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CSV 저장 벤치마크')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    config = dict(RENTAL_COMPANIES['한국렌탈'], id_write='00616')
+    print(f"{'라인 수':>8} | {'방식':<8} | {'시간 (s)':>8} | {'최대 할당 (MB)':>14} | 같은 파일")
+    with tempfile.TemporaryDirectory(prefix='bench_csv_') as work_dir:
+        for rows in args.rows:
+            with redirect_stdout(io.StringIO()):
+                voucher = build_compact_voucher(make_filtered_frame(rows), config).apply_template(None)
+            legacy_path = os.path.join(work_dir, f'legacy_{rows}.csv')
+            stream_path = os.path.join(work_dir, f'stream_{rows}.csv')
+            legacy_sec, legacy_mb = _timed(legacy_write, voucher, legacy_path)
+            stream_sec, stream_mb = _timed(write_voucher_csv, voucher, stream_path)
+            same = '예' if filecmp.cmp(legacy_path, stream_path, shallow=False) else '아니오'
+            print(f"{voucher.line_count:>8,} | {'to_csv':<8} | {legacy_sec:>8.3f} | {legacy_mb:>14.1f} |")
+            print(f"{voucher.line_count:>8,} | {'스트리밍':<8} | {stream_sec:>8.3f} | {stream_mb:>14.1f} | {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+전처리 데이터프레임 메모리 벤치마크: 기존 object 컬럼 vs 자료형 계획(범주형/int64)
+
+합성 CSV로 다음을 비교한다.
+- 읽은 직후 데이터프레임의 행당 바이트 (기존: 전체 컬럼 자동 추론, 계획: 필요한 컬럼만 범주형으로)
+- 전처리 결과(df_filtered)의 행당 바이트 (memory_usage(deep=True), 문자열 객체 포함)
+- 로드+전처리 중 최대 할당 메모리 (tracemalloc)와 시간
+두 방식의 결과 값이 같은지도 확인한다.
+
+실행: python -m benchmarks.bench_dtype_plan [--rows 10000 100000]
+"""
+import argparse
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from typing import Any, Callable, Dict, Tuple
+
+import pandas as pd
+
+from benchmarks.synthetic import generate_rental_csv
+from core.config import RENTAL_COMPANIES
+from mappers import mapping_utils
+from processors import rental_processor
+from processors.header_analyzer import header_analyzer
+
+COMPANY = '한국렌탈'
+
+
+def legacy_read(input_file: str, config: Dict[str, Any]) -> pd.DataFrame:
+    """
+    기존 방식의 읽기: 전체 컬럼을 자동 추론으로 읽고 컬럼명 정리
+    """
+    rental_df = pd.read_csv(input_file, encoding='cp949')
+    analysis = header_analyzer.analyze([str(col) for col in rental_df.columns], config, verbose=False)
+    rental_df.columns = list(analysis.columns)
+    return rental_df
+
+
+def legacy_preprocess(input_file: str, config: Dict[str, Any], mapping_dict) -> pd.DataFrame:
+    """
+    기존 방식의 전처리: object 컬럼 그대로 팀명 병합, 행마다 적요 문자열 생성
+    """
+    rental_df = legacy_read(input_file, config)
+    analysis = header_analyzer.analyze(list(rental_df.columns), config, verbose=False)
+    amount_field, team_fields = analysis.amount_field, list(analysis.team_fields)
+    df = rental_df[list(analysis.available_columns)].copy()
+    df = df[pd.to_numeric(df[amount_field], errors='coerce').notna()].copy()
+    df["금액"] = pd.to_numeric(df[amount_field], errors='coerce').astype(int)
+    df["원본팀명"] = df[team_fields[0]].copy()
+    for field in team_fields[1:]:
+        df["원본팀명"] = df["원본팀명"].combine_first(df[field])
+    mapped = mapping_utils.resolve_mapping(df["원본팀명"], mapping_utils.build_mapping_table(mapping_dict))
+    df["팀명"] = mapped["present"]
+    df["CD_ACCT"] = mapped["CD_ACCT"]
+    df["CD_PJT"] = pd.to_numeric(mapped["CD_PJT"], errors='coerce').fillna(1000).astype(int)
+    df["적요"] = f"{config['note_prefix']}(" + df["팀명"] + ")"
+    df["CD_MNG1"] = config['cost_center']
+    df["CD_MNG3"] = config['partner_code']
+    return df[(df["CD_ACCT"] != "") & (df["CD_PJT"] != "")].copy()
+
+
+def planned_read(input_file: str, config: Dict[str, Any]) -> pd.DataFrame:
+    """
+    자료형 계획으로 읽기 (필요한 컬럼만 범주형)
+    """
+    rental_df, _ = rental_processor._read_csv_columns(input_file, 'cp949', config)
+    return rental_df
+
+
+def planned_preprocess(input_file: str, config: Dict[str, Any], mapping_dict) -> pd.DataFrame:
+    _, df_filtered = rental_processor.load_and_preprocess_data(input_file, config, mapping_dict)
+    return df_filtered
+
+
+def bytes_per_row(df: pd.DataFrame) -> float:
+    return int(df.memory_usage(deep=True).sum()) / max(len(df), 1)
+
+
+def measure(func: Callable[[], pd.DataFrame]) -> Tuple[pd.DataFrame, float, float]:
+    """
+    함수 실행 시간과 최대 할당 메모리 측정
+
+    Returns:
+        (결과 데이터프레임, 실행 시간 초, 최대 할당 MB)
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        result = func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='전처리 데이터프레임 메모리 벤치마크')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    config = RENTAL_COMPANIES[COMPANY]
+    with redirect_stdout(io.StringIO()):
+        mapping_dict = mapping_utils.load_mapping_file(config['mapping_file'])
+
+    print(f"{'행 수':>8} | {'방식':<6} | {'읽기 B/행':>9} | {'결과 B/행':>9} | {'최대 할당 (MB)':>14} | {'시간 (s)':>8} | 결과 동일")
+    with tempfile.TemporaryDirectory(prefix='bench_dtype_') as work_dir:
+        for rows in args.rows:
+            with redirect_stdout(io.StringIO()):
+                input_file = generate_rental_csv(os.path.join(work_dir, f'dtype_{rows}.csv'), rows, config)
+            results = {}
+            for label, read, preprocess in (('기존', legacy_read, legacy_preprocess), ('계획', planned_read, planned_preprocess)):
+                with redirect_stdout(io.StringIO()):
+                    read_bytes = bytes_per_row(read(input_file, config))
+                df_filtered, elapsed, peak_mb = measure(lambda: preprocess(input_file, config, mapping_dict))
+                results[label] = df_filtered
+                same = ''
+                if label == '계획':
+                    legacy = results['기존']
+                    same = '예' if df_filtered[legacy.columns].astype(object).equals(legacy.astype(object)) else '아니오'
+                print(f"{rows:>8,} | {label:<6} | {read_bytes:>9.0f} | {bytes_per_row(df_filtered):>9.0f} | "
+                      f"{peak_mb:>14.1f} | {elapsed:>8.3f} | {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+ERP 전표 프레임 생성 벤치마크: 리스트 복제 + 컬럼 개별 추가 방식 vs 컬럼 명세 일괄 생성 방식
+
+실행: python -m benchmarks.bench_erp_builder [--rows 10000 100000]
+"""
+import argparse
+import io
+import random
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+
+import pandas as pd
+
+from core import config as cfg
+from core.config import RENTAL_COMPANIES
+from generators.korea_rental_gen import ERP_COLUMNS, build_erp_frame, set_management_items
+
+
+def make_filtered_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    전처리 결과(df_filtered)와 같은 구조의 데이터프레임 생성
+    """
+    rng = random.Random(seed)
+    return pd.DataFrame({
+        "CD_ACCT": ["45871"] * rows,
+        "CD_PJT": [rng.randint(1000000, 1009999) for _ in range(rows)],
+        "금액": [rng.randint(20, 90) * 1000 for _ in range(rows)],
+        "적요": [f"한국렌탈㈜_PC 렌탈료(팀{rng.randint(1, 200)})" for _ in range(rows)],
+    })
+
+
+def legacy_build(df_filtered: pd.DataFrame, company_config) -> pd.DataFrame:
+    """
+    기존 방식: 컬럼마다 리스트 복제, AMT는 apply, 나머지 컬럼은 하나씩 추가
+    """
+    current_date = datetime.now().strftime("%Y%m%d")
+    document_number = f"FI{current_date[-8:]}{company_config.get('id_write', '00000')[-3:]}"
+    n = len(df_filtered)
+    debit_data = {
+        "ROW_ID": [document_number] * n,
+        "ROW_NO": [str(i) for i in range(1, n + 1)],
+        "NO_TAX": ["*"] * n,
+        "CD_PC": [company_config['cd_pc']] * n,
+        "CD_WDEPT": [company_config['cd_wdept']] * n,
+        "NO_DOCU": [document_number] * n,
+        "NO_DOLINE": [str(i) for i in range(1, n + 1)],
+        "CD_COMPANY": [company_config['cd_company']] * n,
+        "ID_WRITE": [company_config['id_write']] * n,
+        "CD_DOCU": [cfg.ERP_DOCUMENT_TYPE] * n,
+        "DT_ACCT": [current_date] * n,
+        "ST_DOCU": [cfg.ERP_APPROVAL_STATUS] * n,
+        "TP_DRCR": ["1"] * n,
+        "CD_ACCT": df_filtered["CD_ACCT"].tolist(),
+        "AMT": df_filtered["금액"].apply(lambda x: str(int(x)) if pd.notnull(x) else "0").tolist(),
+        "CD_PARTNER": [company_config['partner_code']] * n,
+        "NM_NOTE": df_filtered["적요"].tolist(),
+        "TP_DOCU": [cfg.ERP_PROCESS_STATUS] * n,
+        "NO_ACCT": ["0"] * n,
+        "TP_GUBUN": [cfg.ERP_DOCUMENT_GUBUN] * n,
+    }
+    credit_data = {
+        "ROW_ID": [document_number], "ROW_NO": [str(n + 1)], "NO_TAX": ["*"],
+        "CD_PC": [company_config['cd_pc']], "CD_WDEPT": [company_config['cd_wdept']],
+        "NO_DOCU": [document_number], "NO_DOLINE": [str(n + 1)],
+        "CD_COMPANY": [company_config['cd_company']], "ID_WRITE": [company_config['id_write']],
+        "CD_DOCU": [cfg.ERP_DOCUMENT_TYPE], "DT_ACCT": [current_date], "ST_DOCU": [cfg.ERP_APPROVAL_STATUS],
+        "TP_DRCR": ["2"], "CD_ACCT": [company_config['payable_acct']], "AMT": [str(df_filtered["금액"].sum())],
+        "CD_PARTNER": [company_config['partner_code']], "NM_NOTE": [f"{company_config['note_prefix']} 미지급금"],
+        "TP_DOCU": [cfg.ERP_PROCESS_STATUS], "NO_ACCT": ["0"], "TP_GUBUN": [cfg.ERP_DOCUMENT_GUBUN],
+    }
+    erp_df = pd.concat([pd.DataFrame(debit_data), pd.DataFrame(credit_data)], ignore_index=True)
+    for col in ERP_COLUMNS:
+        if col not in erp_df.columns:
+            erp_df[col] = [""] * len(erp_df)
+    erp_df = erp_df[ERP_COLUMNS]
+    return set_management_items(erp_df, df_filtered, company_config)
+
+
+def _best_of(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ERP 전표 프레임 생성 벤치마크')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    config = dict(RENTAL_COMPANIES['한국렌탈'], id_write='00616')
+
+    print(f"{'행 수':>10} | {'기존 (s)':>10} | {'명세 (s)':>10} | {'배율':>6}")
+    with redirect_stdout(io.StringIO()) as sink:
+        results = []
+        for rows in args.rows:
+            df_filtered = make_filtered_frame(rows)
+
+            # 두 방식의 결과가 같은지 먼저 확인
+            pd.testing.assert_frame_equal(legacy_build(df_filtered, config), build_erp_frame(df_filtered, config))
+
+            legacy = _best_of(lambda: legacy_build(df_filtered, config), args.repeat)
+            builder = _best_of(lambda: build_erp_frame(df_filtered, config), args.repeat)
+            results.append((rows, legacy, builder))
+            sink.truncate(0)
+
+    for rows, legacy, builder in results:
+        print(f"{rows:>10,} | {legacy:>10.4f} | {builder:>10.4f} | {legacy / builder:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
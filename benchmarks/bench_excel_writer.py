@@ -0,0 +1,99 @@
+"""
+엑셀 출력 벤치마크: iterrows + pyexcel_xls 저장 vs 일괄 변환 + xlwt 직접 저장
+
+실행: python -m benchmarks.bench_excel_writer [--rows 10000 100000]
+"""
+import argparse
+import io
+import os
+import random
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+import pandas as pd
+
+try:
+    from pyexcel_xls import save_data
+except ImportError:  # 기존 방식 비교는 pyexcel_xls가 설치된 경우에만
+    save_data = None
+
+from core.config import RENTAL_COMPANIES, XLS_MAX_ROWS
+from generators.korea_rental_gen import generate_erp_data, prepare_erp_columns, set_management_items
+from utils.excel_utils import frame_to_rows, write_excel_file
+from utils.template_utils import prepare_file_with_template
+
+
+def make_result_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    ERP 양식(약 140컬럼)과 같은 구조의 결과 데이터프레임 생성 (차변 rows행 + 대변 1행)
+    """
+    rng = random.Random(seed)
+    config = dict(RENTAL_COMPANIES['한국렌탈'], id_write='00616')
+    df_filtered = pd.DataFrame({
+        "CD_ACCT": ["45871"] * rows,
+        "CD_PJT": [rng.randint(1000000, 1009999) for _ in range(rows)],
+        "금액": [rng.randint(1, 90) * 1000 for _ in range(rows)],
+        "적요": [f"{config['note_prefix']}(팀{rng.randint(1, 200)})" for _ in range(rows)],
+    })
+    with redirect_stdout(io.StringIO()):
+        erp_df = generate_erp_data(df_filtered, config)
+        erp_df = prepare_erp_columns(erp_df)
+        erp_df = set_management_items(erp_df, df_filtered, config)
+        return prepare_file_with_template(erp_df, None)
+
+
+def legacy_rows(df: pd.DataFrame):
+    """
+    기존 방식: iterrows로 한 행씩 리스트 변환
+    """
+    data = [df.columns.tolist()]
+    for _, row in df.iterrows():
+        data.append(row.tolist())
+    return data
+
+
+def legacy_write(df: pd.DataFrame, xls_path: str) -> None:
+    """
+    기존 방식: iterrows 변환 후 pyexcel_xls로 저장
+    """
+    save_data(xls_path, {"Sheet1": legacy_rows(df)})
+
+
+def _timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='엑셀 출력 벤치마크')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'행 수':>8} | {'iterrows 변환':>12} | {'일괄 변환':>12} | {'기존 저장':>12} | {'신규 저장':>12} | 형식  (단위: 행/s)")
+    for rows in args.rows:
+        df = make_result_frame(rows)
+        assert legacy_rows(df) == frame_to_rows(df)
+
+        legacy = _timed(lambda: legacy_rows(df))
+        bulk = _timed(lambda: frame_to_rows(df))
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            legacy_write_rate = "-"
+            if save_data is not None and len(df) < XLS_MAX_ROWS:
+                elapsed = _timed(lambda: legacy_write(df, os.path.join(tmp_dir, 'legacy.xls')))
+                legacy_write_rate = f"{len(df) / elapsed:,.0f}"
+
+            saved = {}
+            with redirect_stdout(io.StringIO()):
+                write = _timed(lambda: saved.setdefault('path', write_excel_file(df, os.path.join(tmp_dir, 'bench.xls'))))
+            file_format = os.path.splitext(saved['path'])[1]
+
+        print(f"{len(df):>8,} | {len(df) / legacy:>12,.0f} | {len(df) / bulk:>12,.0f} | {legacy_write_rate:>12} | {len(df) / write:>12,.0f} | {file_format}")
+
+    print(f"\n참고: .xls 형식은 시트당 {XLS_MAX_ROWS:,}행까지만 저장 가능하여 그 이상은 .xlsx로 저장됩니다.")
+
+
+if __name__ == "__main__":
+    main()
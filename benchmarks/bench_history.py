@@ -0,0 +1,91 @@
+"""
+처리 이력 저장소 벤치마크: 월 이력 저장 시간과 두 달 비교 시간 (행 수별)
+
+합성 렌탈료 CSV를 실제 매핑으로 전처리한 결과를 이전 달로 저장하고, 일부 행을 삭제/금액 변경/추가한
+결과를 다음 달로 저장한 뒤 비교한다. 비교 결과 건수는 같은 자산 키로 pandas에서 직접 계산한 값과 맞춰 본다.
+이력 파일은 임시 폴더에 만들므로 output/history에는 영향이 없다.
+
+실행: python -m benchmarks.bench_history [--rows 100000 1000000] [--change-ratio 0.02]
+"""
+import argparse
+import io
+import os
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+import numpy as np
+import pandas as pd
+
+from core.config import RENTAL_COMPANIES
+from mappers.mapping_utils import load_mapping_file
+from processors.history_store import DIFF_COLUMNS, HistoryStore, asset_keys
+from processors.rental_processor import load_and_preprocess_data
+from benchmarks.synthetic import generate_rental_csv
+
+
+def next_month(df_filtered: pd.DataFrame, ratio: float, seed: int = 1) -> pd.DataFrame:
+    """
+    ratio 비율만큼 행 삭제, 금액 변경, 새 자산 추가
+    """
+    rng = np.random.default_rng(seed)
+    count = max(1, int(len(df_filtered) * ratio))
+    picked = rng.permutation(len(df_filtered))
+    frame = df_filtered.drop(index=df_filtered.index[picked[:count]])
+    changed = df_filtered.index[picked[count:2 * count]]
+    frame.loc[changed, "금액"] = frame.loc[changed, "금액"] + 1000
+    added = df_filtered.iloc[picked[2 * count:3 * count]].copy()
+    added["시리얼번호"] = [f"NEW{i:09d}" for i in range(len(added))]
+    frame = frame.astype({"시리얼번호": object})
+    return pd.concat([frame, added], ignore_index=True)
+
+
+def expected_counts(before: pd.DataFrame, after: pd.DataFrame) -> dict:
+    """
+    자산 키로 두 달을 맞춰 pandas에서 직접 계산한 추가/삭제/변경 건수
+    """
+    left = pd.DataFrame({col: before[col].to_numpy(dtype=object) for col in DIFF_COLUMNS}, index=asset_keys(before))
+    right = pd.DataFrame({col: after[col].to_numpy(dtype=object) for col in DIFF_COLUMNS}, index=asset_keys(after))
+    common = left.index.intersection(right.index)
+    changed = (left.loc[common] != right.loc[common]).any(axis=1).sum()
+    return {"추가": len(right.index.difference(left.index)), "삭제": len(left.index.difference(right.index)),
+            "변경": int(changed)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='처리 이력 저장/비교 벤치마크')
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--change-ratio', type=float, default=0.02)
+    args = parser.parse_args()
+
+    config = dict(RENTAL_COMPANIES['한국렌탈'], id_write='00616')
+    with redirect_stdout(io.StringIO()):
+        mapping_dict = load_mapping_file(config['mapping_file'])
+
+    print(f"{'행 수':>10} | {'저장 (s)':>8} | {'다음 달 저장 (s)':>14} | {'비교 (s)':>8} | {'추가/삭제/변경':>20} | 일치")
+    with tempfile.TemporaryDirectory(prefix='bench_history_') as work_dir:
+        for rows in args.rows:
+            store = HistoryStore(os.path.join(work_dir, f'history_{rows}.sqlite3'))
+            with redirect_stdout(io.StringIO()):
+                input_file = generate_rental_csv(os.path.join(work_dir, f'input_{rows}.csv'), rows, config)
+                _, before = load_and_preprocess_data(input_file, config, mapping_dict)
+            after = next_month(before, args.change_ratio)
+
+            start = time.perf_counter()
+            store.save('한국렌탈', '2026-09', before, config['team_fields'])
+            save_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            store.save('한국렌탈', '2026-10', after, config['team_fields'])
+            next_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            diff = store.diff('한국렌탈', '2026-09', '2026-10')
+            diff_seconds = time.perf_counter() - start
+
+            counts = {kind: int((diff["구분"] == kind).sum()) for kind in ("추가", "삭제", "변경")}
+            matched = '예' if counts == expected_counts(before, after) else f"아니오 {expected_counts(before, after)}"
+            label = "/".join(f"{counts[kind]:,}" for kind in ("추가", "삭제", "변경"))
+            print(f"{len(before):>10,} | {save_seconds:>8.2f} | {next_seconds:>14.2f} | {diff_seconds:>8.2f} | {label:>20} | {matched}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+팀명 매핑 벤치마크: 행 단위 apply 방식 vs 조회 테이블 조인 방식
+
+실행: python -m benchmarks.bench_mapping [--rows 10000 100000 500000]
+"""
+import argparse
+import os
+import random
+import time
+
+import numpy as np
+import pandas as pd
+
+from core.config import MAPPING_DIR
+from mappers import mapping_utils
+
+
+def make_team_names(mapping_dict, rows: int, seed: int = 0) -> pd.Series:
+    """
+    매핑 키, 매핑되지 않은 팀명, 빈 값이 섞인 팀명 시리즈 생성
+    """
+    rng = random.Random(seed)
+    teams = list(mapping_dict.keys()) + ["미등록팀_A", "미등록팀_B", "", np.nan]
+    return pd.Series([rng.choice(teams) for _ in range(rows)], dtype=object)
+
+
+def legacy_mapping(team_names: pd.Series, mapping_dict) -> pd.DataFrame:
+    """
+    기존 방식: 행마다 딕셔너리를 만들고 apply를 네 번 수행
+    """
+    df = pd.DataFrame({"원본팀명": team_names})
+    df["매핑정보"] = df["원본팀명"].apply(lambda x: mapping_utils.apply_mapping(x, mapping_dict))
+    df["팀명"] = df["매핑정보"].apply(lambda x: x["present"])
+    df["CD_ACCT"] = df["매핑정보"].apply(lambda x: x["CD_ACCT"])
+    df["CD_PJT"] = df["매핑정보"].apply(lambda x: x["CD_PJT"])
+    df["CD_PJT"] = pd.to_numeric(df["CD_PJT"], errors='coerce').fillna(1000).astype(int)
+    return df[["팀명", "CD_ACCT", "CD_PJT"]]
+
+
+def vectorized_mapping(team_names: pd.Series, mapping_dict) -> pd.DataFrame:
+    """
+    신규 방식: 조회 테이블 생성 후 한 번의 조인으로 세 필드를 해석
+    """
+    mapping_table = mapping_utils.build_mapping_table(mapping_dict)
+    mapped = mapping_utils.resolve_mapping(team_names, mapping_table)
+    df = pd.DataFrame({"팀명": mapped["present"], "CD_ACCT": mapped["CD_ACCT"]})
+    df["CD_PJT"] = pd.to_numeric(mapped["CD_PJT"], errors='coerce').fillna(1000).astype(int)
+    return df
+
+
+def _best_of(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='팀명 매핑 벤치마크')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 500_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--mapping', type=str, default=os.path.join(MAPPING_DIR, 'team_name_mapping.json'))
+    args = parser.parse_args()
+
+    # 기존 방식과 같은 조건으로 비교하도록 일반 딕셔너리 사용
+    mapping_dict = dict(mapping_utils.load_mapping_file(args.mapping))
+
+    print(f"{'행 수':>10} | {'apply (s)':>10} | {'조인 (s)':>10} | {'배율':>6}")
+    for rows in args.rows:
+        team_names = make_team_names(mapping_dict, rows)
+
+        # 두 방식의 결과가 같은지 먼저 확인
+        expected = legacy_mapping(team_names, mapping_dict)
+        actual = vectorized_mapping(team_names, mapping_dict)
+        pd.testing.assert_frame_equal(expected, actual)
+
+        legacy = _best_of(lambda: legacy_mapping(team_names, mapping_dict), args.repeat)
+        vectorized = _best_of(lambda: vectorized_mapping(team_names, mapping_dict), args.repeat)
+        print(f"{rows:>10,} | {legacy:>10.4f} | {vectorized:>10.4f} | {legacy / vectorized:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
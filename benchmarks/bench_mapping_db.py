@@ -0,0 +1,77 @@
+"""
+매핑 DB 벤치마크: 가져오기/변경분 가져오기/기준일 매핑 로드/일괄 조회 시간 (매핑 항목 수별)
+
+렌탈사 3곳에 같은 크기의 합성 매핑을 가져온 뒤, 한 렌탈사의 5% 항목을 바꿔 다시 가져온다.
+기준일 매핑 로드는 컴파일된 매핑 JSON 로드(load_mapping_store)와 비교하고 조회 테이블이 같은지 확인한다.
+일괄 조회는 고유 팀명 전체를 쿼리 한 번으로 찾는 lookup과 팀명마다 쿼리하는 방식을 비교한다.
+
+실행: python -m benchmarks.bench_mapping_db [--entries 187 5000 50000]
+"""
+import argparse
+import io
+import json
+import os
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+from mappers.mapping_db import MappingRepository
+from mappers.mapping_store import load_mapping_store
+from benchmarks.bench_mapping_store import write_mapping_json
+
+VENDORS = ["한국렌탈", "렌탈B", "렌탈C"]
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    value = func(*args)
+    return value, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='매핑 DB 벤치마크')
+    parser.add_argument('--entries', type=int, nargs='+', default=[187, 5000, 50000])
+    args = parser.parse_args()
+
+    print(f"{'항목 수':>8} | {'가져오기 (ms)':>12} | {'변경분 (ms)':>10} | {'DB 로드 (ms)':>11} | {'JSON 로드 (ms)':>13} | "
+          f"{'일괄 조회 (ms)':>13} | {'개별 조회 (ms)':>13} | 일치")
+    with tempfile.TemporaryDirectory(prefix='bench_mapping_db_') as work_dir:
+        for entries in args.entries:
+            mapping_file = os.path.join(work_dir, f'mapping_{entries}.json')
+            write_mapping_json(mapping_file, entries)
+            repository = MappingRepository(os.path.join(work_dir, f'mapping_{entries}.sqlite3'))
+            for vendor in VENDORS[1:]:
+                repository.import_json(vendor, mapping_file, '2026-01-01')
+            _, import_seconds = timed(repository.import_json, VENDORS[0], mapping_file, '2026-01-01')
+
+            with open(mapping_file, 'r', encoding='utf-8') as f:
+                records = json.load(f)
+            for item in records[::20]:
+                item['CD_PJT'] += 1
+            counts, change_seconds = timed(repository.import_records, VENDORS[0], records, '2026-02-01')
+
+            store, db_seconds = timed(repository.load_store, VENDORS[0], '2026-01-15')
+            with redirect_stdout(io.StringIO()):
+                load_mapping_store(mapping_file, os.path.join(work_dir, 'compiled'))  # 컴파일 파일 생성
+            compiled, json_seconds = timed(load_mapping_store, mapping_file, os.path.join(work_dir, 'compiled'))
+
+            names = [item['past'] for item in records] + [f"미등록{i}" for i in range(entries // 10)]
+            found, lookup_seconds = timed(repository.lookup, VENDORS[0], names, '2026-02-01')
+            sample = names[:min(len(names), 2000)]
+            with repository._open() as connection:
+                start = time.perf_counter()
+                for name in sample:
+                    connection.execute("SELECT present, CD_ACCT, CD_PJT FROM mappings WHERE vendor = ? AND past = ? "
+                                       "AND valid_from <= ? AND (valid_to IS NULL OR valid_to > ?)",
+                                       (VENDORS[0], name, '2026-02-01', '2026-02-01')).fetchone()
+                single_seconds = (time.perf_counter() - start) * len(names) / len(sample)
+
+            matched = (store.table.equals(compiled.table) and len(found) == entries
+                       and counts['changed'] == len(records[::20]))
+            print(f"{entries:>8,} | {import_seconds * 1000:>12.1f} | {change_seconds * 1000:>10.1f} | {db_seconds * 1000:>11.1f} | "
+                  f"{json_seconds * 1000:>13.1f} | {lookup_seconds * 1000:>13.1f} | {single_seconds * 1000:>13.1f} | "
+                  f"{'예' if matched else '아니오'}")
+
+
+if __name__ == "__main__":
+    main()
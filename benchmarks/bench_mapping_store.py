@@ -0,0 +1,81 @@
+"""
+매핑 로드 벤치마크: JSON 파싱 + 딕셔너리/조회 테이블 생성 vs 컴파일된 매핑 저장소 로드
+
+매핑 항목 수를 늘린 합성 JSON(기존 파일과 같은 들여쓰기 형식)으로 로드부터 조회 테이블 준비까지의
+시간을 비교하고, 두 방식의 조회 테이블이 같은지 확인한다.
+
+실행: python -m benchmarks.bench_mapping_store [--entries 187 5000 50000]
+"""
+import argparse
+import io
+import json
+import os
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+import pandas as pd
+
+from mappers import mapping_utils
+from mappers.mapping_store import compile_mapping, load_mapping_store
+
+
+def write_mapping_json(path: str, entries: int) -> None:
+    """
+    기존 매핑 파일과 같은 구조의 합성 매핑 JSON 생성
+    """
+    records = [{
+        "CD_ACCT": "45871",
+        "past": f"팀{i:06d}",
+        "present": f"팀{i:06d}" if i % 10 else f"신규팀{i:06d}",
+        "CD_PJT": 1000000 + i,
+        "name": f"팀{i:06d}_사업{i % 7}_CVS_IN",
+    } for i in range(entries)]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(records, f, ensure_ascii=False, indent=2)
+
+
+def legacy_load(path: str) -> pd.DataFrame:
+    """
+    기존 방식: JSON 파싱 → 중첩 딕셔너리 → 조회 테이블
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        mapping_list = json.load(f)
+    mapping_dict = {}
+    for item in mapping_list:
+        mapping_dict[item['past']] = {'present': item['present'], 'CD_ACCT': item['CD_ACCT'], 'CD_PJT': item['CD_PJT']}
+    return mapping_utils.build_mapping_table(mapping_dict)
+
+
+def _best_of(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='매핑 로드 벤치마크')
+    parser.add_argument('--entries', type=int, nargs='+', default=[187, 5_000, 50_000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'항목 수':>10} | {'JSON (ms)':>10} | {'컴파일 (ms)':>11} | {'컴파일 로드 (ms)':>16} | {'배율':>6}")
+    with tempfile.TemporaryDirectory(prefix='bench_mapping_') as work_dir:
+        for entries in args.entries:
+            json_path = os.path.join(work_dir, f'mapping_{entries}.json')
+            write_mapping_json(json_path, entries)
+            with redirect_stdout(io.StringIO()):
+                compile_sec = _best_of(lambda: compile_mapping(json_path, work_dir), 1)
+                pd.testing.assert_frame_equal(legacy_load(json_path), load_mapping_store(json_path, work_dir).table)
+
+                legacy = _best_of(lambda: legacy_load(json_path), args.repeat)
+                compiled = _best_of(lambda: load_mapping_store(json_path, work_dir).table, args.repeat)
+            print(f"{entries:>10,} | {legacy * 1000:>10.2f} | {compile_sec * 1000:>11.2f} | {compiled * 1000:>16.2f} | "
+                  f"{legacy / compiled:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+전체 전표 생성 파이프라인 벤치마크 (합성 입력 1k/10k/100k/1M행)
+
+process_rental_company를 입력 크기별로 실행하여 전체/단계별 시간, 처리량(행/초),
+최대 메모리(tracemalloc)를 측정하고, 저장된 기준값보다 tolerance 이상 느려지면
+종료 코드 1로 실패한다.
+
+실행: python -m benchmarks.bench_pipeline [--rows 1000 10000 100000 1000000] [--update-baseline]
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Dict, List
+
+import pandas as pd
+
+from core.config import RENTAL_COMPANIES
+from benchmarks.synthetic import generate_rental_csv
+from utils.job_utils import capture_output
+import main as pipeline
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline_pipeline.json')
+BENCH_COMPANY = '한국렌탈_벤치마크'
+
+# 이보다 짧은 단계는 측정 오차가 커서 회귀 판정에서 제외
+MIN_COMPARE_SEC = 0.25
+
+
+def _register_company(work_dir: str, input_file: str) -> None:
+    """
+    합성 입력과 임시 출력 경로를 쓰는 벤치마크용 렌탈사 설정 등록 (한국렌탈 설정 복사)
+    """
+    RENTAL_COMPANIES[BENCH_COMPANY] = dict(
+        RENTAL_COMPANIES['한국렌탈'],
+        input_file=input_file,
+        output_csv=os.path.join(work_dir, 'bench.csv'),
+        output_excel=os.path.join(work_dir, 'bench.xls'),
+    )
+
+
+def bench_size(rows: int, encoding: str, repeat: int, memory: bool, work_dir: str) -> Dict[str, Any]:
+    """
+    한 입력 크기에 대해 파이프라인을 실행하고 측정값 반환
+
+    Args:
+        rows: 입력 행 수
+        encoding: 합성 입력 인코딩
+        repeat: 시간 측정 반복 횟수 (가장 빠른 실행 기준)
+        memory: tracemalloc으로 최대 메모리를 측정하는 실행을 추가할지 여부
+        work_dir: 입력/출력 파일을 둘 폴더
+
+    Returns:
+        {rows, wall_sec, rows_per_sec, stages, peak_mem_mb}
+    """
+    with capture_output(None):
+        input_file = generate_rental_csv(os.path.join(work_dir, f'rental_{rows}.csv'), rows, encoding=encoding)
+    _register_company(work_dir, input_file)
+
+    # 전처리 결과 캐시를 쓰면 두 번째 실행부터 로드/전처리를 건너뛰므로 끄고 측정
+    # 처리 이력은 실제 이력 저장소에 합성 데이터를 남기고 기준값에 없던 단계 시간을 더하므로 저장하지 않음
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = pipeline.process_rental_company(BENCH_COMPANY, verbose=False, use_cache=False, save_history=False)
+        wall = time.perf_counter() - start
+        if best is None or wall < best['wall_sec']:
+            best = {'wall_sec': wall, 'stages': dict(result.timings)}
+
+    record = {
+        'rows': rows,
+        'wall_sec': round(best['wall_sec'], 4),
+        'rows_per_sec': round(rows / best['wall_sec'], 1),
+        'stages': {stage: round(seconds, 4) for stage, seconds in best['stages'].items()},
+        'peak_mem_mb': None,
+    }
+
+    # 메모리 측정은 tracemalloc 부하가 시간 측정에 섞이지 않도록 별도 실행
+    if memory:
+        tracemalloc.start()
+        try:
+            pipeline.process_rental_company(BENCH_COMPANY, verbose=False, use_cache=False, save_history=False)
+            record['peak_mem_mb'] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+        finally:
+            tracemalloc.stop()
+
+    os.remove(input_file)
+    return record
+
+
+def compare_to_baseline(records: List[Dict[str, Any]], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    기준값 대비 tolerance 이상 느려진 전체/단계 시간 목록 반환
+
+    Args:
+        records: bench_size 결과 목록
+        baseline: 저장된 기준값 ({'results': {행 수: record}})
+        tolerance: 허용 비율 (0.25면 25%까지 느려지는 것은 허용)
+
+    Returns:
+        회귀 내용 문자열 목록 (없으면 빈 목록)
+    """
+    regressions = []
+    for record in records:
+        base = baseline.get('results', {}).get(str(record['rows']))
+        if base is None:
+            continue
+        pairs = [('전체', record['wall_sec'], base['wall_sec'])]
+        pairs += [(stage, seconds, base['stages'][stage])
+                  for stage, seconds in record['stages'].items() if stage in base.get('stages', {})]
+        for name, current, previous in pairs:
+            if previous >= MIN_COMPARE_SEC and current > previous * (1 + tolerance):
+                regressions.append(f"{record['rows']:,}행 {name}: {previous:.3f}초 -> {current:.3f}초 "
+                                   f"(+{(current / previous - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='전표 생성 파이프라인 벤치마크')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument('--encoding', type=str, default='cp949', choices=['cp949', 'utf-8'])
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--no-memory', action='store_true', help='최대 메모리 측정 실행 생략')
+    parser.add_argument('--baseline', type=str, default=BASELINE_FILE)
+    parser.add_argument('--tolerance', type=float, default=0.25, help='허용 속도 저하 비율 (기본값: 0.25)')
+    parser.add_argument('--update-baseline', action='store_true', help='측정값을 새 기준값으로 저장')
+    parser.add_argument('--json', type=str, default=None, help='측정값을 저장할 JSON 경로')
+    args = parser.parse_args()
+
+    records = []
+    print(f"{'행 수':>10} | {'전체 (s)':>9} | {'행/초':>10} | {'최대 메모리':>10} | 단계별 (s)")
+    with tempfile.TemporaryDirectory(prefix='bench_pipeline_') as work_dir:
+        for rows in args.rows:
+            record = bench_size(rows, args.encoding, args.repeat, not args.no_memory, work_dir)
+            records.append(record)
+            memory = f"{record['peak_mem_mb']:.1f}MB" if record['peak_mem_mb'] is not None else '-'
+            stages = ", ".join(f"{stage} {seconds:.3f}" for stage, seconds in record['stages'].items())
+            print(f"{rows:>10,} | {record['wall_sec']:>9.3f} | {record['rows_per_sec']:>10,.0f} | {memory:>10} | {stages}")
+    RENTAL_COMPANIES.pop(BENCH_COMPANY, None)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(records, f, ensure_ascii=False, indent=2)
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding='utf-8') as f:
+                baseline = json.load(f)
+        baseline.setdefault('results', {}).update({str(record['rows']): record for record in records})
+        # 기준값은 측정한 환경에서만 의미가 있으므로 환경 정보를 함께 저장
+        baseline['environment'] = {'python': platform.python_version(), 'pandas': pd.__version__,
+                                   'platform': platform.platform(), 'encoding': args.encoding}
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, ensure_ascii=False, indent=2)
+        print(f"기준값 저장: {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"기준값 파일이 없어 비교를 생략합니다: {args.baseline} (--update-baseline으로 생성)")
+        return
+
+    with open(args.baseline, encoding='utf-8') as f:
+        regressions = compare_to_baseline(records, json.load(f), args.tolerance)
+    if regressions:
+        print(f"\n성능 저하 감지 (허용 {args.tolerance * 100:.0f}%):")
+        for line in regressions:
+            print(f"- {line}")
+        sys.exit(1)
+    print(f"\n기준값 대비 성능 저하 없음 (허용 {args.tolerance * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
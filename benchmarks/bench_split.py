@@ -0,0 +1,68 @@
+"""
+전표 분할 벤치마크: 한 전표로 저장 vs 최대 라인 수로 나눈 전표를 순차/동시 저장
+
+큰 차변 데이터로 전표를 만들어 분할 시간, CSV+엑셀 저장 시간(전표 파일 전체)을 비교한다.
+나뉜 전표마다 라인 수가 최대 라인 수 이하인지, 대변 금액이 그 전표의 차변 합계와 같은지,
+전체 차변 합계가 원본 금액 합계와 같은지도 확인한다.
+(동시 저장은 CPU 코어 수만큼만 빨라지므로 단일 코어 환경에서는 순차 저장과 비슷하다)
+
+실행: python -m benchmarks.bench_split [--rows 100000] [--max-lines 10000] [--workers 4]
+"""
+import argparse
+import io
+import os
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+from core.config import RENTAL_COMPANIES, VOUCHER_SPLIT_WORKERS
+from core.voucher import CompactVoucher
+from generators.korea_rental_gen import build_split_vouchers
+from utils.excel_utils import save_parts_to_files
+from benchmarks.bench_erp_builder import make_filtered_frame
+
+
+def voucher_totals(voucher: CompactVoucher):
+    """
+    (차변 합계, 대변 금액)
+    """
+    amounts = [int(value) for value in voucher.column_values('AMT')]
+    debit, credit = sum(amounts[:-1]), amounts[-1]
+    return debit, credit
+
+
+def main():
+    parser = argparse.ArgumentParser(description='전표 분할 벤치마크')
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--max-lines', type=int, default=10_000)
+    parser.add_argument('--workers', type=int, default=VOUCHER_SPLIT_WORKERS)
+    args = parser.parse_args()
+
+    config = dict(RENTAL_COMPANIES['한국렌탈'], id_write='00616')
+    df_filtered = make_filtered_frame(args.rows)
+    total = int(df_filtered["금액"].sum())
+    print(f"CPU 코어 수: {os.cpu_count()}, 차변 {args.rows:,}행, 전표당 최대 {args.max_lines:,}라인")
+    print(f"{'방식':<14} | {'전표 수':>6} | {'라인 수 (최소~최대)':>18} | {'분할 (s)':>8} | {'저장 (s)':>8} | 금액 일치")
+    with tempfile.TemporaryDirectory(prefix='bench_split_') as work_dir:
+        for label, max_lines, workers in (('한 전표', None, 1),
+                                          ('분할 순차', args.max_lines, 1),
+                                          (f'분할 동시({args.workers})', args.max_lines, args.workers)):
+            with redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                vouchers, _ = build_split_vouchers(df_filtered, config, max_lines)
+                split_sec = time.perf_counter() - start
+                parts = [voucher.apply_template(None) for voucher in vouchers]
+                start = time.perf_counter()
+                save_parts_to_files(parts, os.path.join(work_dir, f'{label}.csv'), os.path.join(work_dir, f'{label}.xls'), workers)
+                save_sec = time.perf_counter() - start
+
+            line_counts = [voucher.line_count for voucher in vouchers]
+            totals = [voucher_totals(voucher) for voucher in vouchers]
+            matches = (all(debit == credit for debit, credit in totals) and sum(debit for debit, _ in totals) == total
+                       and (max_lines is None or max(line_counts) <= max_lines))
+            print(f"{label:<14} | {len(vouchers):>6} | {min(line_counts):>8,} ~ {max(line_counts):>7,} | {split_sec:>8.3f} | "
+                  f"{save_sec:>8.3f} | {'예' if matches else '아니오'}")
+
+
+if __name__ == "__main__":
+    main()
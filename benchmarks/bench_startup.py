@@ -0,0 +1,75 @@
+"""
+CLI 시작 시간 벤치마크: 새 프로세스로 main.py를 실행하여 전체 실행 시간과 pandas 로드 여부 측정
+
+- --version / --help / --dry-run: pandas 등 무거운 모듈을 로드하지 않고 끝나야 함
+- -c 한국렌탈: 작은 합성 입력(기본 100행)으로 실제 변환까지 실행 (시작 비용이 대부분을 차지)
+
+실행: python -m benchmarks.bench_startup [--repeat 5] [--rows 100]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Tuple
+
+from benchmarks.synthetic import generate_rental_csv
+
+COMPANY = '한국렌탈'
+
+# 실행 후 pandas가 로드되었는지 확인하는 래퍼 (main.py를 __main__으로 실행)
+_PROBE = (
+    "import runpy, sys, atexit;"
+    "atexit.register(lambda: sys.stderr.write('\\nPANDAS_LOADED=%d\\n' % ('pandas' in sys.modules)));"
+    "sys.argv = ['main.py'] + sys.argv[1:];"
+    "runpy.run_path('main.py', run_name='__main__')"
+)
+
+
+def run_once(args: List[str]) -> Tuple[float, bool, int]:
+    """
+    main.py를 새 프로세스로 한 번 실행
+
+    Returns:
+        (실행 시간 초, pandas 로드 여부, 종료 코드)
+    """
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, '-c', _PROBE] + args, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    return wall, 'PANDAS_LOADED=1' in completed.stderr, completed.returncode
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CLI 시작 시간 벤치마크')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--rows', type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='bench_startup_') as work_dir:
+        input_file = generate_rental_csv(os.path.join(work_dir, 'startup.csv'), args.rows)
+        stem = os.path.splitext(os.path.basename(input_file))[0]
+        commands = [
+            ('--version', ['--version']),
+            ('--help', ['--help']),
+            ('--dry-run', ['-c', COMPANY, '-i', input_file, '--dry-run']),
+            (f'-c {COMPANY} ({args.rows}행)', ['-c', COMPANY, '-i', input_file, '--no-cache']),
+        ]
+
+        print(f"{'명령':<24} | {'최소 (s)':>9} | {'중앙값 (s)':>10} | {'pandas 로드':>10} | 종료 코드")
+        for label, command in commands:
+            runs = [run_once(command) for _ in range(args.repeat)]
+            walls = sorted(wall for wall, _, _ in runs)
+            print(f"{label:<24} | {walls[0]:>9.3f} | {walls[len(walls) // 2]:>10.3f} | "
+                  f"{'예' if runs[-1][1] else '아니오':>10} | {runs[-1][2]}")
+
+    # 변환 실행이 만든 출력 파일 정리
+    from core.config import OUTPUT_DIR
+    for extension in ('.csv', '.xls'):
+        output_path = os.path.join(OUTPUT_DIR, f'자동전표_{COMPANY}_{stem}{extension}')
+        if os.path.exists(output_path):
+            os.remove(output_path)
+
+
+if __name__ == "__main__":
+    main()
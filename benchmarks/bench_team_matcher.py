@@ -0,0 +1,133 @@
+"""
+팀명 보정/후보 검색 벤치마크: n-gram 역색인 매처 vs difflib 전체 비교
+
+매핑 팀명에 표기 차이(공백, 전각 문자, '㈜', 대소문자)와 오타(글자 누락/교체/추가)를 넣은
+합성 팀명으로 다음을 측정한다.
+- 표기 차이: 자동 보정 비율 (정답 팀명으로 보정되어야 함)
+- 오타: 후보 안에 정답 팀명이 있는 비율 (top-k)
+- 처리 시간: 매처 생성, 보정+후보 검색, 같은 이름에 대한 difflib.get_close_matches
+
+실행: python -m benchmarks.bench_team_matcher [--names 1000 5000] [--mapping-size 187 5000]
+"""
+import argparse
+import difflib
+import io
+import random
+import time
+from contextlib import redirect_stdout
+from typing import List, Tuple
+
+from core import config as cfg
+from core.config import RENTAL_COMPANIES
+from mappers import mapping_utils
+from mappers.team_matcher import TeamNameMatcher, normalize_team_name
+
+_FULL_WIDTH = {chr(code): chr(code + 0xFEE0) for code in range(0x21, 0x7F)}
+_HANGUL = "가나다라마바사아자차카타파하개발운영본부실팀"
+
+
+def format_noise(name: str, rng: random.Random) -> str:
+    """
+    표기 차이만 넣기 (정규화하면 원래 이름과 같아짐)
+    """
+    choice = rng.randrange(4)
+    if choice == 0:
+        return "".join(_FULL_WIDTH.get(ch, ch) for ch in name)
+    if choice == 1:
+        position = rng.randint(0, len(name))
+        return f" {name[:position]}  {name[position:]} "
+    if choice == 2:
+        return name.swapcase() if name.swapcase() != name else f"{name} "
+    return name.replace("(주)", "㈜") if "(주)" in name else f"{name}　"
+
+
+def typo_noise(name: str, rng: random.Random) -> str:
+    """
+    글자 하나 누락/교체/추가
+    """
+    position = rng.randrange(len(name))
+    choice = rng.randrange(3)
+    if choice == 0 and len(name) > 2:
+        return name[:position] + name[position + 1:]
+    if choice == 1:
+        return name[:position] + rng.choice(_HANGUL) + name[position + 1:]
+    return name[:position] + rng.choice(_HANGUL) + name[position:]
+
+
+def make_noisy_names(keys: List[str], count: int, seed: int = 0) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]]]:
+    """
+    (노이즈 이름, 정답 팀명) 목록을 표기 차이/오타로 나누어 생성
+    """
+    rng = random.Random(seed)
+    exact_keys = {normalize_team_name(key) for key in keys}
+    formatted, typos = [], []
+    for i in range(count):
+        key = rng.choice(keys)
+        if i % 2 == 0:
+            formatted.append((format_noise(key, rng), key))
+        else:
+            noisy = typo_noise(key, rng)
+            if normalize_team_name(noisy) not in exact_keys:
+                typos.append((noisy, key))
+    return formatted, typos
+
+
+def make_keys(mapping_keys: List[str], size: int, seed: int = 0) -> List[str]:
+    """
+    매핑 팀명 목록을 size개가 되도록 늘림 (실제 팀명 + 합성 팀명)
+    """
+    rng = random.Random(seed)
+    keys = list(mapping_keys[:size])
+    seen = {normalize_team_name(key) for key in keys}
+    while len(keys) < size:
+        key = f"{rng.choice(mapping_keys)}_{''.join(rng.choice(_HANGUL) for _ in range(3))}{rng.randint(1, 99)}"
+        if normalize_team_name(key) not in seen:
+            seen.add(normalize_team_name(key))
+            keys.append(key)
+    return keys
+
+
+def main():
+    parser = argparse.ArgumentParser(description='팀명 보정/후보 검색 벤치마크')
+    parser.add_argument('--names', type=int, nargs='+', default=[1_000, 5_000])
+    parser.add_argument('--mapping-size', type=int, nargs='+', default=[187, 5_000])
+    parser.add_argument('--difflib-limit', type=int, default=500, help='difflib은 느리므로 이 개수만 측정 후 환산')
+    args = parser.parse_args()
+
+    with redirect_stdout(io.StringIO()):
+        mapping_keys = list(mapping_utils.load_mapping_file(RENTAL_COMPANIES['한국렌탈']['mapping_file']))
+
+    print(f"{'매핑 수':>8} | {'이름 수':>8} | {'생성 (ms)':>9} | {'매처 (ms)':>9} | {'difflib (ms)':>12} | "
+          f"{'표기 보정':>8} | {'오타 top-' + str(cfg.TEAM_MATCH_MAX_SUGGESTIONS):>10} | {'difflib top-' + str(cfg.TEAM_MATCH_MAX_SUGGESTIONS):>12}")
+    for size in args.mapping_size:
+        keys = make_keys(mapping_keys, size)
+        for count in args.names:
+            formatted, typos = make_noisy_names(keys, count)
+            names = [name for name, _ in formatted + typos]
+
+            start = time.perf_counter()
+            matcher = TeamNameMatcher(keys)
+            build_sec = time.perf_counter() - start
+
+            start = time.perf_counter()
+            resolved = matcher.resolve(names)
+            suggestions = matcher.suggest([name for name in names if name not in resolved])
+            match_sec = time.perf_counter() - start
+
+            sample = typos[:args.difflib_limit]
+            start = time.perf_counter()
+            difflib_hits = sum(
+                key in difflib.get_close_matches(name, keys, n=cfg.TEAM_MATCH_MAX_SUGGESTIONS, cutoff=cfg.TEAM_MATCH_MIN_SCORE)
+                for name, key in sample
+            )
+            difflib_sec = (time.perf_counter() - start) / max(len(sample), 1) * len(names)
+
+            format_rate = sum(keys[resolved[name]] == key for name, key in formatted if name in resolved) / len(formatted)
+            typo_rate = sum(key in [candidate for candidate, _ in suggestions.get(name, [])] for name, key in typos) / max(len(typos), 1)
+            difflib_rate = difflib_hits / max(len(sample), 1)
+            print(f"{size:>8,} | {len(names):>8,} | {build_sec * 1000:>9.1f} | {match_sec * 1000:>9.1f} | {difflib_sec * 1000:>12.1f} | "
+                  f"{format_rate:>8.1%} | {typo_rate:>10.1%} | {difflib_rate:>12.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+전표 검증 벤치마크: 라인 수별 검증 시간 (압축 전표 / 데이터프레임 전표)
+
+합성 렌탈료 CSV를 실제 매핑으로 전처리해 만든 전표를 검증하고, 같은 전표에 문제(차대 불일치,
+매핑에 없는 코드, 필수 값 누락, 라인 번호 중복)를 넣었을 때 모두 찾는지도 확인한다.
+데이터프레임 전표는 build_erp_frame 결과로 --frame-rows 이하 크기에서만 측정한다.
+
+실행: python -m benchmarks.bench_validator [--rows 100000 1000000] [--frame-rows 100000]
+"""
+import argparse
+import io
+import os
+import tempfile
+from contextlib import redirect_stdout
+
+from core.config import RENTAL_COMPANIES
+from generators.korea_rental_gen import build_compact_voucher, build_erp_frame
+from generators.voucher_validator import validate_vouchers
+from mappers.mapping_utils import get_mapping_codes, load_mapping_file
+from processors.rental_processor import load_and_preprocess_data
+from benchmarks.synthetic import generate_rental_csv
+
+REPEAT = 3
+
+
+def best_ms(voucher, accounts, projects) -> float:
+    return min(validate_vouchers([voucher], accounts, projects).elapsed for _ in range(REPEAT)) * 1000
+
+
+def corrupt(frame):
+    """
+    데이터프레임 전표에 검사 종류마다 문제 하나씩 넣기
+    """
+    frame = frame.copy()
+    frame.loc[1, "AMT"] = str(int(frame.loc[1, "AMT"]) + 1)  # 차대 불일치
+    frame.loc[2, "CD_ACCT"] = "99999"                         # 매핑에 없는 계정
+    frame.loc[3, "CD_PJT"] = 42                               # 매핑에 없는 프로젝트
+    frame.loc[4, "NM_NOTE"] = ""                              # 필수 값 누락
+    frame.loc[5, "NO_DOLINE"] = frame.loc[6, "NO_DOLINE"]     # 라인 번호 중복
+    return frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description='전표 검증 벤치마크')
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--frame-rows', type=int, default=100_000)
+    args = parser.parse_args()
+
+    config = dict(RENTAL_COMPANIES['한국렌탈'], id_write='00616')
+    with redirect_stdout(io.StringIO()):
+        mapping_dict = load_mapping_file(config['mapping_file'])
+    accounts, projects = get_mapping_codes(mapping_dict)
+    accounts.add(config['payable_acct'])
+
+    print(f"{'라인 수':>10} | {'압축 (ms)':>9} | {'프레임 (ms)':>11} | 문제 검출")
+    with tempfile.TemporaryDirectory(prefix='bench_validator_') as work_dir:
+        for rows in args.rows:
+            with redirect_stdout(io.StringIO()):
+                input_file = generate_rental_csv(os.path.join(work_dir, f'input_{rows}.csv'), rows, config)
+                _, df_filtered = load_and_preprocess_data(input_file, config, mapping_dict)
+                voucher = build_compact_voucher(df_filtered, config)
+            compact_ms = best_ms(voucher, accounts, projects)
+            frame_ms, detected = '-', '-'
+            if rows <= args.frame_rows:
+                with redirect_stdout(io.StringIO()):
+                    frame = build_erp_frame(df_filtered, config)
+                frame_ms = f"{best_ms(frame, accounts, projects):.1f}"
+                checks = {issue.check for issue in validate_vouchers([corrupt(frame)], accounts, projects).issues}
+                detected = '예' if checks == {'balance', 'account', 'project', 'required', 'duplicate_line'} else f"아니오 {sorted(checks)}"
+            print(f"{voucher.line_count:>10,} | {compact_ms:>9.1f} | {frame_ms:>11} | {detected}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+한국렌탈 렌탈료 명세서 형식의 합성 입력 파일 생성기
+
+실행: python -m benchmarks.synthetic --rows 10000 [--encoding cp949] [-o input/한국렌탈_렌탈료.csv]
+"""
+import argparse
+import csv
+import os
+import random
+from typing import Any, Dict, List, Optional
+
+from core.config import RENTAL_COMPANIES
+from mappers import mapping_utils
+
+# 매핑 파일에 없는 팀명 (매핑 실패 행)
+UNMAPPED_TEAMS = ["미등록팀_A", "미등록팀_B", "폐지된팀"]
+
+MODEL_NAMES = ["LG그램 15Z90", "삼성 갤럭시북3", "HP ProBook 450", "Dell Latitude 5430", "Lenovo ThinkPad E14"]
+BRANCHES = ["본사", "강남지점", "부산지점", "대전지점"]
+
+
+def synthetic_header(config: Dict[str, Any]) -> List[str]:
+    """
+    렌탈료 명세서 헤더 생성 (실제 파일처럼 일부 컬럼명 앞뒤에 공백 포함)
+
+    Args:
+        config: 렌탈사 설정 정보 (amount_field, team_fields 사용)
+
+    Returns:
+        컬럼명 목록
+    """
+    current_team_field, previous_team_field = config['team_fields'][:2]
+    return ['No', '모델명', ' 영업분류', '관리부서', '거래처명', '관리지점', '시리얼번호',
+            previous_team_field, f'{current_team_field} ', config['amount_field']]
+
+
+def generate_rental_csv(output_path: str, rows: int, config: Optional[Dict[str, Any]] = None, encoding: str = 'cp949',
+                        unmapped_ratio: float = 0.01, returned_ratio: float = 0.05, changed_ratio: float = 0.1,
+                        seed: int = 0) -> str:
+    """
+    합성 렌탈료 CSV 파일 생성
+
+    팀명은 렌탈사 매핑 파일의 past 값에서 뽑고, 일부 행은 매핑되지 않은 팀명,
+    일부 행은 금액이 없는 반납 항목으로 만든다. 변경PJT는 changed_ratio 비율의 행에만 채운다.
+
+    Args:
+        output_path: 저장할 파일 경로
+        rows: 데이터 행 수
+        config: 렌탈사 설정 정보 (기본값: 한국렌탈)
+        encoding: 파일 인코딩 (cp949 또는 utf-8)
+        unmapped_ratio: 매핑되지 않은 팀명 비율
+        returned_ratio: 금액이 없는 반납 항목 비율
+        changed_ratio: 당월 변경PJT가 채워진 행 비율
+        seed: 난수 시드
+
+    Returns:
+        저장된 파일 경로
+    """
+    if config is None:
+        config = RENTAL_COMPANIES['한국렌탈']
+
+    mapping_dict = mapping_utils.load_mapping_file(config['mapping_file'])
+    teams = list(mapping_dict.keys())
+    if not teams:
+        raise ValueError(f"매핑 파일에서 팀명을 찾을 수 없습니다: {config['mapping_file']}")
+
+    rng = random.Random(seed)
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    with open(output_path, 'w', newline='', encoding=encoding) as f:
+        writer = csv.writer(f)
+        writer.writerow(synthetic_header(config))
+        for i in range(1, rows + 1):
+            team = rng.choice(UNMAPPED_TEAMS) if rng.random() < unmapped_ratio else rng.choice(teams)
+            changed_team = rng.choice(teams) if rng.random() < changed_ratio else ''
+            amount = "" if rng.random() < returned_ratio else str(rng.randint(20, 90) * 1000)
+            writer.writerow([
+                i, rng.choice(MODEL_NAMES), '렌탈', '운영2팀', '한국렌탈㈜', rng.choice(BRANCHES),
+                f'SN{rng.randrange(10 ** 9):09d}', team, changed_team, amount,
+            ])
+
+    return output_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='합성 렌탈료 CSV 생성')
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--encoding', type=str, default='cp949', choices=['cp949', 'utf-8', 'utf-8-sig'])
+    parser.add_argument('--unmapped-ratio', type=float, default=0.01)
+    parser.add_argument('--returned-ratio', type=float, default=0.05)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', type=str, default=RENTAL_COMPANIES['한국렌탈']['input_file'])
+    args = parser.parse_args()
+
+    path = generate_rental_csv(args.output, args.rows, encoding=args.encoding, unmapped_ratio=args.unmapped_ratio,
+                               returned_ratio=args.returned_ratio, seed=args.seed)
+    print(f"{args.rows:,}행 생성 완료: {path} ({os.path.getsize(path) / (1024 * 1024):.1f}MB)")
+
+
+if __name__ == "__main__":
+    main()
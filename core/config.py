@@ -10,10 +10,19 @@ OUTPUT_DIR = os.path.join(os.getcwd(), 'output')
 MAPPING_DIR = os.path.join(os.getcwd(), 'mapping')
 TEMPLATE_DIR = os.path.join(os.getcwd(), 'templates')
 
-# 디렉토리가 없으면 생성
-for directory in [INPUT_DIR, OUTPUT_DIR, MAPPING_DIR, TEMPLATE_DIR]:
-    if not os.path.exists(directory):
-        os.makedirs(directory)
+# 프로그램 버전 (main.py --version)
+APP_VERSION = '1.1.0'
+
+
+def ensure_directories() -> None:
+    """
+    기본 폴더(입력/출력/매핑/양식)가 없으면 생성
+
+    설정을 읽기만 하는 경우(--help, --version, --dry-run 등)에는 폴더를 만들지 않도록
+    import 시점이 아니라 실제 처리를 시작할 때 호출한다.
+    """
+    for directory in [INPUT_DIR, OUTPUT_DIR, MAPPING_DIR, TEMPLATE_DIR]:
+        os.makedirs(directory, exist_ok=True)
 
 # 현재 날짜 정보
 CURRENT_DATE = datetime.now().strftime("%Y%m%d")
@@ -24,6 +33,8 @@ RENTAL_COMPANIES = {
     '한국렌탈': {
         'input_file': os.path.join(INPUT_DIR, '한국렌탈_렌탈료.csv'),
         'mapping_file': os.path.join(MAPPING_DIR, 'team_name_mapping.json'),
+        'mapping_backend': 'json',  # 매핑 원본: 'json'(mapping_file) 또는 'sqlite'(MAPPING_DB_PATH의 오늘 기준 매핑)
+        'mapping_vendor': '한국렌탈',  # 매핑 DB에서 이 렌탈사 매핑을 구분하는 이름
         'erp_form_file': os.path.join(TEMPLATE_DIR, 'erp_form.csv'),
         'output_csv': os.path.join(OUTPUT_DIR, f'자동전표_한국렌탈_{CURRENT_DATE}.csv'),
         'output_excel': os.path.join(OUTPUT_DIR, f'자동전표_한국렌탈_{CURRENT_DATE}.xls'),
@@ -42,7 +53,71 @@ RENTAL_COMPANIES = {
 
 # 기본 설정값
 DEFAULT_ENCODING = 'utf-8'
+INPUT_FALLBACK_ENCODING = 'cp949'  # UTF-8이 아닌 입력 파일 인코딩 (EUC-KR 상위 호환)
+ENCODING_SAMPLE_BYTES = 64 * 1024  # 인코딩 판별 시 검사하는 파일 앞부분 크기
 CSV_OUTPUT_ENCODING = 'utf-8-sig'  # Excel에서 한글이 깨지지 않도록 BOM 포함
+XLS_MAX_ROWS = 65536  # Excel 97-2003(.xls) 시트당 최대 행 수
+VOUCHER_WRITE_CHUNK_ROWS = 20000  # 압축 전표를 저장할 때 한 번에 데이터프레임으로 만드는 행 수
+
+# 집계 전표 모드 (main.py --aggregate, 웹 '차변 라인 집계') - 이 컬럼 값이 같은 행을 금액 합계 한 라인으로
+VOUCHER_AGGREGATE_KEYS = ["CD_ACCT", "CD_PJT", "적요"]
+DRILLDOWN_FILE_SUFFIX = '_상세'  # 전표 라인별 원본 행 내역 파일 (출력 파일명 뒤에 붙임, CSV)
+
+# 매핑의 프로젝트 코드가 비어 있거나 숫자가 아닐 때 쓰는 프로젝트 코드
+DEFAULT_PROJECT_CODE = 1000
+
+# 전표 검증 (저장 전에 실행, 문제가 있으면 파일을 만들지 않고 중단)
+VOUCHER_REQUIRED_COLUMNS = [
+    "ROW_ID", "ROW_NO", "CD_PC", "CD_WDEPT", "NO_DOCU", "NO_DOLINE", "CD_COMPANY", "ID_WRITE",
+    "DT_ACCT", "TP_DRCR", "CD_ACCT", "AMT", "CD_PARTNER", "NM_NOTE",
+]
+VALIDATION_MAX_EXAMPLES = 5  # 문제 항목마다 안내할 값 예시 수
+
+# 대용량 입력 스트리밍 처리 시 기본 청크 행 수 (main.py --chunksize)
+CSV_CHUNK_SIZE = 50000
+
+# 캐시 설정
+FILE_CACHE_MAX_ENTRIES = 16  # 메모리에 보관할 매핑/양식 파일 수 (렌탈사별 설정 포함)
+HEADER_CACHE_MAX_ENTRIES = 64  # 필드 인식 결과를 보관할 헤더 구성(파일 양식) 수
+MAPPING_COMPILED_DIR = os.path.join(OUTPUT_DIR, 'cache', 'mapping')  # 컴파일된 매핑 파일 저장 폴더 (JSON이 바뀌면 자동 재생성)
+RESULT_CACHE_DIR = os.path.join(OUTPUT_DIR, 'cache')  # 전처리 결과(df_filtered) 디스크 캐시 폴더
+RESULT_CACHE_MAX_BYTES = 512 * 1024 * 1024            # 디스크 캐시 최대 크기 (넘으면 오래 안 쓴 항목부터 삭제)
+RESULT_CACHE_MAX_AGE_SEC = 7 * 24 * 60 * 60           # 디스크 캐시 항목 보관 기간
+RESULT_CACHE_VERSION = 6  # 전처리 규칙이 바뀌면 올려서 이전 캐시를 무효화
+MAPPING_DB_PATH = os.path.join(MAPPING_DIR, 'team_name_mapping.sqlite3')  # 매핑 DB (mapping_backend가 'sqlite'인 렌탈사가 사용)
+
+
+def mapping_source(company_config: dict) -> str:
+    """
+    렌탈사 매핑을 읽어 오는 파일 경로 (mapping_backend가 'sqlite'면 매핑 DB, 아니면 매핑 JSON)
+    """
+    return MAPPING_DB_PATH if company_config.get('mapping_backend') == 'sqlite' else company_config['mapping_file']
+
+
+# 매핑되지 않은 팀명 보정/후보 검색 (표기 차이만 있으면 자동 보정, 비슷한 이름은 후보만 안내)
+TEAM_MATCH_NGRAM = 2              # 유사도 계산에 쓰는 문자 n-gram 길이
+TEAM_MATCH_MIN_SCORE = 0.5        # 후보로 안내할 최소 유사도 (0~1)
+TEAM_MATCH_MAX_SUGGESTIONS = 3    # 팀명별 최대 후보 수
+
+# 월별 처리 이력 (실행마다 전처리 결과를 렌탈사/월별로 저장, main.py --history-list / --history-diff로 월간 비교)
+HISTORY_DB_PATH = os.path.join(OUTPUT_DIR, 'history', 'rental_history.sqlite3')
+SQLITE_TIMEOUT_SEC = 30  # 이력/매핑 DB를 다른 프로세스(배치 작업, 웹 요청)가 저장 중일 때 기다리는 최대 시간
+ASSET_KEY_FIELDS = ['시리얼번호', '자산번호', '관리번호']  # 자산 키로 쓸 컬럼 (앞의 것 우선)
+
+# 성능 프로파일 (main.py --profile, 웹 '성능 프로파일 기록') 결과 저장 폴더
+PROFILE_DIR = os.path.join(OUTPUT_DIR, 'profiles')
+
+# 배치 실행 (main.py --all, 여러 입력 파일) 설정
+BATCH_MAX_WORKERS = min(4, os.cpu_count() or 1)  # 동시에 처리할 최대 프로세스 수 (main.py --workers)
+BATCH_DIR = os.path.join(OUTPUT_DIR, 'batch')    # 배치 실행 목록(manifest)과 작업별 로그 저장 폴더
+
+# 단독 CLI 실행에서 전표 분할(--max-lines) 시 나뉜 전표 파일을 동시에 저장할 최대 프로세스 수
+# (웹 작업 큐와 배치 작업 프로세스에서는 풀을 중첩하지 않도록 차례로 저장)
+VOUCHER_SPLIT_WORKERS = BATCH_MAX_WORKERS
+
+# 웹 인터페이스 작업 큐 설정
+WEB_MAX_WORKERS = 2        # 동시에 변환할 최대 작업 수
+WEB_MAX_PENDING_JOBS = 16  # 처리 중인 작업 외 대기 가능한 작업 수 (초과 시 요청 거절)
 
 # ERP 관련 설정
 ERP_DATA_ROW_START = 4  # 데이터 시작 행 (5행)
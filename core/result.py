@@ -0,0 +1,108 @@
+"""
+전표 생성 파이프라인 실행 결과
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def format_suggestions(candidates: Optional[List[Tuple[str, float]]]) -> str:
+    """
+    유사한 매핑 팀명 후보를 화면 표시용 문자열로 변환 (후보가 없으면 빈 문자열)
+    """
+    if not candidates:
+        return ""
+    return " (유사한 매핑 팀명: " + ", ".join(f"'{key}'" for key, _ in candidates) + ")"
+
+
+@dataclass
+class PipelineResult:
+    """
+    파이프라인 한 번 실행의 결과 (출력 파일, 인식된 필드, 건수/금액, 단계별 시간)
+
+    실패한 실행에서도 그때까지 채워진 값(인식된 필드, 매핑되지 않은 팀명 등)은 유지된다.
+    """
+    output_path: Optional[str] = None
+    output_paths: List[str] = field(default_factory=list)      # 전표별 출력 파일 (전표를 나누지 않으면 output_path 하나)
+    document_numbers: List[str] = field(default_factory=list)  # 전표별 전표번호
+    source_format: Optional[str] = None   # csv / xlsx / dataframe
+    encoding: Optional[str] = None
+    amount_field: Optional[str] = None
+    team_fields: List[str] = field(default_factory=list)
+    total_rows: int = 0                   # 금액이 있는 행 수
+    excluded_rows: int = 0                # 금액이 없어 제외된 행(반납 항목) 수
+    mapped_rows: int = 0                  # 팀명이 매핑된 행 수
+    unmapped_teams: List[Any] = field(default_factory=list)
+    corrected_teams: Dict[Any, str] = field(default_factory=dict)         # 표기 차이를 보정하여 매핑한 팀명: 매핑 팀명
+    team_suggestions: Dict[Any, List[Any]] = field(default_factory=dict)  # 매핑되지 않은 팀명: [(유사한 매핑 팀명, 유사도), ...]
+    debit_total: int = 0
+    credit_total: int = 0
+    debit_count: int = 0
+    credit_count: int = 0
+    aggregated_rows: int = 0              # 집계 모드에서 차변 라인으로 묶은 원본 행 수 (집계하지 않으면 0)
+    drilldown_path: Optional[str] = None  # 집계 모드의 라인별 원본 행 내역 파일
+    validation: Optional[Any] = None      # 저장 전 전표 검증 결과 (generators.voucher_validator.ValidationReport)
+    history_month: Optional[str] = None   # 처리 이력을 저장한 월 (YYYY-MM, 저장하지 않았으면 None)
+    cache_hit: bool = False               # 이전 전처리 결과(디스크 캐시)를 재사용했는지 여부
+    timings: Dict[str, float] = field(default_factory=dict)  # 단계명: 초
+    profile: Optional[Dict[str, Any]] = None  # 프로파일 모드일 때 단계별 측정 기록
+    profile_path: Optional[str] = None
+
+    def update(self, run_info: Dict[str, Any]) -> None:
+        """
+        로더가 채운 실행 정보 딕셔너리에서 알려진 항목만 반영
+        """
+        for key, value in run_info.items():
+            if key in self.__dataclass_fields__:
+                setattr(self, key, value)
+
+    def summary_lines(self, include_unmapped: bool = True) -> List[str]:
+        """
+        화면 표시용 요약 문자열 목록
+
+        Args:
+            include_unmapped: 매핑되지 않은 팀명 목록 포함 여부
+
+        Returns:
+            요약 문자열 목록
+        """
+        lines = []
+        if self.amount_field:
+            lines.append(f"사용할 금액 필드: '{self.amount_field}'")
+        if self.team_fields:
+            lines.append("사용할 팀 필드: " + ", ".join(f"'{team_field}'" for team_field in self.team_fields))
+        if self.encoding:
+            lines.append(f"파일 인코딩: {self.encoding}")
+        if self.excluded_rows:
+            lines.append(f"금액이 없는 행(반납 항목) {self.excluded_rows}개를 제외했습니다.")
+        if self.cache_hit:
+            lines.append("이전에 처리한 파일과 같아 저장된 전처리 결과를 재사용했습니다.")
+
+        if self.debit_count:
+            lines.append("AMT 필드 확인:")
+            lines.append(f"차변 금액 합계: {self.debit_total:,}")
+            lines.append(f"대변 금액: {self.credit_total:,}")
+            lines.append(f"차변 건수: {self.debit_count}")
+            lines.append(f"대변 건수: {self.credit_count}")
+        if self.aggregated_rows:
+            lines.append(f"차변 라인 집계: 원본 {self.aggregated_rows}개 행 → {self.debit_count}개 라인")
+        if len(self.document_numbers) > 1:
+            lines.append(f"전표 분할: {len(self.document_numbers)}개 전표 (전표번호 {self.document_numbers[0]} ~ {self.document_numbers[-1]})")
+        if self.drilldown_path:
+            lines.append(f"라인별 원본 행 내역: {self.drilldown_path}")
+        if self.validation is not None:
+            lines.extend(self.validation.summary_lines())
+        if self.history_month:
+            lines.append(f"처리 이력 저장: {self.history_month}")
+
+        if self.corrected_teams:
+            lines.append(f"표기 차이를 보정하여 매핑한 팀명 {len(self.corrected_teams)}개:")
+            lines.extend(f"- '{team}' -> '{key}'" for team, key in self.corrected_teams.items())
+
+        if include_unmapped and self.unmapped_teams:
+            lines.append(f"매핑되지 않은 팀명 {len(self.unmapped_teams)}개:")
+            lines.extend(f"- '{team}'{format_suggestions(self.team_suggestions.get(team))}" for team in self.unmapped_teams)
+
+        if self.timings:
+            total = sum(self.timings.values())
+            lines.append(f"단계별 시간: {total:.2f}초 (" + ", ".join(f"{stage} {seconds:.2f}초" for stage, seconds in self.timings.items()) + ")")
+        return lines
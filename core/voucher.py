@@ -0,0 +1,231 @@
+"""
+메모리를 적게 쓰는 전표 표현 (상수/빈 컬럼은 값 하나만 보관)
+"""
+import copy
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core import config as cfg
+
+class _LineNumber:
+    """
+    라인 번호 자리표시 (is로 비교하므로 다른 프로세스로 보낸 뒤에도 같은 객체로 복원)
+    """
+    def __reduce__(self):
+        return 'LINE_NUMBER'
+
+    def __repr__(self):
+        return 'LINE_NUMBER'
+
+
+# 차변 값으로 쓰면 라인 번호("1", "2", ...)를 저장할 때 생성
+LINE_NUMBER = _LineNumber()
+
+
+class CompactVoucher:
+    """
+    차변 n라인 + 대변 1라인으로 된 전표를 컬럼별로 압축해 보관하는 객체
+
+    ERP 양식 140여 개 컬럼 대부분은 빈 값이거나 실행마다 같은 상수(CD_PC, CD_COMPANY,
+    ID_WRITE ...)이므로 컬럼마다 (차변 값, 대변 값) 한 쌍만 보관한다. 라인마다 다른 차변 값은
+    원래 자료형의 배열(금액은 int64 등)로 보관하고, 라인 번호는 보관하지 않고 필요할 때 만든다.
+    저장할 때는 일정 행 수씩만 값 배열(CSV) 또는 데이터프레임(엑셀)으로 만들므로 큰 전표도 메모리를
+    적게 쓴다. to_frame() 결과는 기존 데이터프레임 방식(build_erp_frame, prepare_file_with_template
+    결과)과 셀 값과 자료형까지 같다.
+    """
+
+    def __init__(self, columns: List[str], debit_count: int, values: Dict[str, Tuple[Any, Any]],
+                 str_columns: Iterable[str] = ()):
+        """
+        Args:
+            columns: 컬럼 순서
+            debit_count: 차변 라인 수 (대변은 항상 마지막 1라인)
+            values: 컬럼명: (차변 값, 대변 값), 차변 값은 상수, 차변 라인 수 길이의 배열 또는 LINE_NUMBER
+                    (없는 컬럼은 빈 문자열)
+            str_columns: 차변 배열 값을 저장할 때 문자열로 바꿀 컬럼 (예: 금액 → "12000")
+        """
+        self.columns = list(columns)
+        self.debit_count = debit_count
+        self.str_columns = frozenset(str_columns)
+        self._values: Dict[str, Tuple[Any, Any]] = {}
+        for col, (debit, credit) in values.items():
+            if isinstance(debit, np.ndarray) and len(debit) != debit_count:
+                raise ValueError(f"'{col}' 컬럼 값 개수({len(debit)})가 차변 라인 수({debit_count})와 다릅니다.")
+            self._values[col] = (debit, credit)
+        self.prelude: Optional[pd.DataFrame] = None  # 데이터 앞에 오는 양식 행 (apply_template에서 설정)
+
+    @property
+    def line_count(self) -> int:
+        """전표 라인 수 (차변 + 대변)"""
+        return self.debit_count + 1
+
+    def __len__(self) -> int:
+        """양식 행을 포함한 전체 행 수 (같은 내용의 데이터프레임 행 수와 같음)"""
+        return self.line_count + (len(self.prelude) if self.prelude is not None else 0)
+
+    def set_constant(self, col: str, value: Any) -> None:
+        """
+        모든 라인에 같은 값 설정 (예: 전표번호)
+
+        Args:
+            col: 컬럼명 (컬럼 목록에 없으면 아무것도 하지 않음)
+            value: 설정할 값
+        """
+        if col in self.columns:
+            self._values[col] = (value, value)
+
+    def column_pair(self, col: str) -> Tuple[Any, Any]:
+        """
+        컬럼의 (차변 값, 대변 값)을 보관한 그대로 반환 (차변 값은 상수, 배열 또는 LINE_NUMBER, 없는 컬럼은 빈 문자열)
+        """
+        return self._values.get(col, ("", ""))
+
+    def column_values(self, col: str, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """
+        전표 라인 [start, stop) 구간의 컬럼 값 배열 생성
+
+        Args:
+            col: 컬럼명
+            start: 시작 라인
+            stop: 끝 라인 (기본값: 마지막 라인 다음)
+
+        Returns:
+            object 배열
+        """
+        stop = self.line_count if stop is None else stop
+        debit, credit = self._values.get(col, ("", ""))
+        debit_stop = min(stop, self.debit_count)
+
+        values = np.empty(stop - start, dtype=object)
+        if start < debit_stop:
+            if debit is LINE_NUMBER:
+                values[:debit_stop - start] = np.arange(start + 1, debit_stop + 1).astype(str)
+            elif isinstance(debit, np.ndarray):
+                segment = debit[start:debit_stop]
+                # astype(object)는 int64를 파이썬 int로 바꿈 (기존 프레임의 셀 자료형과 같게)
+                values[:debit_stop - start] = segment.astype(str).astype(object) if col in self.str_columns else segment.astype(object)
+            else:
+                values[:debit_stop - start] = debit
+        if start <= self.debit_count < stop:
+            values[self.debit_count - start] = credit
+        return values
+
+    def nullable_columns(self) -> List[str]:
+        """
+        값에 결측값(NaN/None)이 있을 수 있는 컬럼 목록
+
+        object/실수 배열이나 결측값 상수를 가진 컬럼만 해당한다 (정수 배열, 문자열 상수, 라인 번호는 제외).
+        """
+        columns = []
+        for col in self.columns:
+            debit, credit = self._values.get(col, ("", ""))
+            if isinstance(debit, np.ndarray):
+                nullable = debit.dtype == object or debit.dtype.kind == 'f'
+            else:
+                nullable = debit is not LINE_NUMBER and bool(pd.isna(debit))
+            if nullable or bool(pd.isna(credit)):
+                columns.append(col)
+        return columns
+
+    def apply_template(self, erp_form: Optional[pd.DataFrame]) -> "CompactVoucher":
+        """
+        ERP 양식 적용 (prepare_file_with_template과 같은 규칙)
+
+        양식이 있으면 양식의 컬럼 순서를 따르고 없는 컬럼은 빈 값으로 두며, 양식의 처음
+        (ERP_DATA_ROW_START - 1)행을 데이터 앞에 둔다. 양식이 없으면 같은 수의 빈 행을 둔다.
+
+        Args:
+            erp_form: ERP 양식 데이터프레임 또는 None
+
+        Returns:
+            양식이 적용된 새 전표 (라인 값 배열은 원본과 공유)
+        """
+        voucher = copy.copy(self)
+        voucher._values = dict(self._values)
+        if erp_form is not None:
+            voucher.columns = erp_form.columns.tolist()
+        voucher.prelude = template_prelude(voucher.columns, erp_form)
+        return voucher
+
+    def iter_frames(self, chunk_rows: int = cfg.VOUCHER_WRITE_CHUNK_ROWS, with_prelude: bool = True) -> Iterator[pd.DataFrame]:
+        """
+        양식 행과 전표 라인을 chunk_rows 라인씩 데이터프레임으로 만들어 반환
+
+        Args:
+            chunk_rows: 한 번에 만들 전표 라인 수
+            with_prelude: 첫 조각 앞에 양식 행을 붙일지 여부
+
+        Returns:
+            데이터프레임 이터레이터 (with_prelude이면 첫 조각에 양식 행 포함)
+        """
+        for start in range(0, self.line_count, chunk_rows):
+            stop = min(start + chunk_rows, self.line_count)
+            frame = pd.DataFrame({col: self.column_values(col, start, stop) for col in self.columns})
+            if start == 0 and with_prelude and self.prelude is not None:
+                frame = pd.concat([self.prelude, frame], ignore_index=True)
+            yield frame
+
+    def iter_rows(self, chunk_rows: int = cfg.VOUCHER_WRITE_CHUNK_ROWS) -> Iterator[List[Any]]:
+        """
+        헤더를 제외한 행을 하나씩 리스트로 반환 (frame_to_rows의 데이터 행과 같은 값)
+        """
+        for frame in self.iter_frames(chunk_rows):
+            yield from frame.values.tolist()
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        전체 데이터프레임으로 변환
+        """
+        return next(self.iter_frames(self.line_count))
+
+    def memory_usage(self) -> Tuple[int, int]:
+        """
+        (압축 보관 바이트, 전체 데이터프레임으로 만들었을 때의 대략적인 바이트) 추정치
+
+        압축 보관은 차변 배열과 배열이 가리키는 객체 크기의 합이다 (같은 객체는 한 번만 셈).
+        전체 데이터프레임은 여기에 컬럼마다 라인 수만큼의 포인터가 더 필요하다.
+        """
+        compact = 0
+        seen = set()
+        for debit, credit in self._values.values():
+            items = [credit]
+            if isinstance(debit, np.ndarray):
+                compact += debit.nbytes
+                if debit.dtype == object:
+                    items.extend(debit)
+            else:
+                items.append(debit)
+            for item in items:
+                if id(item) not in seen:
+                    seen.add(id(item))
+                    compact += sys.getsizeof(item)
+        full = len(self.columns) * self.line_count * np.dtype(object).itemsize + compact
+        return compact, full
+
+
+def template_prelude(columns: List[str], erp_form: Optional[pd.DataFrame]) -> pd.DataFrame:
+    """
+    데이터 앞에 두는 양식 행 (ERP_DATA_ROW_START - 1행)
+
+    양식이 있으면 양식의 처음 행들을 쓰고 모자라는 행은 빈 값으로 채우며,
+    양식이 없으면 모두 빈 행이다.
+
+    Args:
+        columns: 컬럼 순서 (양식이 있으면 양식의 컬럼과 같아야 함)
+        erp_form: ERP 양식 데이터프레임 또는 None
+
+    Returns:
+        양식 행 데이터프레임 (인덱스 0부터)
+    """
+    target_rows = cfg.ERP_DATA_ROW_START - 1
+    prelude = erp_form.iloc[:target_rows] if erp_form is not None else None
+    empty_rows = target_rows - (len(prelude) if prelude is not None else 0)
+    empty_df = pd.DataFrame([[""] * len(columns)] * empty_rows, columns=columns)
+    if prelude is None:
+        return empty_df
+    if empty_rows == 0:
+        return prelude.copy()
+    return pd.concat([prelude, empty_df], ignore_index=True)
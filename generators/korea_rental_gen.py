@@ -1,94 +1,212 @@
 """
 ERP 데이터 생성 모듈
 """
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 from core import config as cfg
+from core.voucher import CompactVoucher, LINE_NUMBER
 
 
-def generate_erp_data(df_filtered: pd.DataFrame, company_config: Dict[str, Any]) -> pd.DataFrame:
+# ERP 업로드 양식 컬럼 (순서 그대로)
+ERP_COLUMNS = [
+    "ROW_ID", "ROW_NO", "NO_TAX", "CD_PC", "CD_WDEPT", "NO_DOCU", "NO_DOLINE", 
+    "CD_COMPANY", "ID_WRITE", "CD_DOCU", "DT_ACCT", "ST_DOCU", "TP_DRCR", 
+    "CD_ACCT", "AMT", "CD_PARTNER", "DT_START", "DT_END", "AM_TAXSTD", 
+    "AM_ADDTAX", "TP_TAX", "NO_COMPANY", "NM_NOTE", "CD_BIZAREA", "CD_DEPT", 
+    "CD_CC", "CD_PJT", "CD_FUND", "CD_BUDGET", "NO_CASH", "ST_MUTUAL", 
+    "CD_CARD", "NO_DEPOSIT", "CD_BANK", "UCD_MNG1", "UCD_MNG2", "UCD_MNG3", 
+    "UCD_MNG4", "UCD_MNG5", "CD_EMPLOY", "CD_MNG", "NO_BDOCU", "NO_BDOLINE", 
+    "TP_DOCU", "NO_ACCT", "TP_TRADE", "NO_CHECK3", "NO_CHECK4", "CD_EXCH", 
+    "RT_EXCH", "CD_TRADE", "AM_EX", "TP_EXPORT", "NO_TO", "DT_SHIPPING", 
+    "TP_GUBUN", "NO_INVOICE", "NO_ITEM", "MD_TAX1", "NM_ITEM1", "NM_SIZE1", 
+    "QT_TAX1", "AM_PRC1", "AM_SUPPLY1", "AM_TAX1", "NM_NOTE1", "CD_BIZPLAN", 
+    "CD_BGACCT", "CD_MNGD1", "NM_MNGD1", "CD_MNGD2", "NM_MNGD2", "CD_MNGD3", 
+    "NM_MNGD3", "CD_MNGD4", "NM_MNGD4", "CD_MNGD5", "NM_MNGD5", "CD_MNGD6", 
+    "NM_MNGD6", "CD_MNGD7", "NM_MNGD7", "CD_MNGD8", "NM_MNGD8", "YN_ISS", 
+    "FINAL_STATUS", "NO_BILL", "NM_BIGO", "TP_BILL", "TP_RECORD", "TP_ETCACCT", 
+    "ST_GWARE", "SELL_DAM_NM", "SELL_DAM_EMAIL", "SELL_DAM_MOBIL", "SELL_DAM_TEL", 
+    "NM_PUMM", "JEONJASEND15_YN", "DT_WRITE", "ST_TAX", "MD_TAX2", "NM_ITEM2", 
+    "NM_SIZE2", "QT_TAX2", "AM_PRC2", "AM_SUPPLY2", "AM_TAX2", "NM_NOTE2", 
+    "MD_TAX3", "NM_ITEM3", "NM_SIZE3", "QT_TAX3", "AM_PRC3", "AM_SUPPLY3", 
+    "AM_TAX3", "NM_NOTE3", "MD_TAX4", "NM_ITEM4", "NM_SIZE4", "QT_TAX4", 
+    "AM_PRC4", "AM_SUPPLY4", "AM_TAX4", "NM_NOTE4", "NM_PTR", "EX_HP", 
+    "EX_EMIL", "NO_BIZTAX", "NO_ASSET", "TP_EVIDENCE", "NO_CAR", "NO_CARBODY", 
+    "CD_BIZCAR", "NM_PARTNER", "YN_IMPORT", "YN_FIXASSET"
+]
+
+# generate_erp_data가 채우는 전표 라인 기본 컬럼
+ERP_LINE_COLUMNS = [
+    "ROW_ID", "ROW_NO", "NO_TAX", "CD_PC", "CD_WDEPT", "NO_DOCU", "NO_DOLINE",
+    "CD_COMPANY", "ID_WRITE", "CD_DOCU", "DT_ACCT", "ST_DOCU", "TP_DRCR",
+    "CD_ACCT", "AMT", "CD_PARTNER", "NM_NOTE", "TP_DOCU", "NO_ACCT", "TP_GUBUN",
+]
+
+
+def build_erp_frame(df_filtered: pd.DataFrame, company_config: Dict[str, Any], columns: List[str] = ERP_COLUMNS,
+                    management_items: bool = True) -> pd.DataFrame:
     """
-    ERP 업로드용 데이터프레임 생성
+    컬럼 명세로 ERP 전표 데이터프레임을 한 번에 생성 (차변 라인 + 대변 미지급금 1라인)
+    
+    generate_erp_data → prepare_erp_columns → set_management_items를 차례로 실행한 것과
+    같은 결과를, 컬럼을 하나씩 추가하지 않고 한 번의 생성으로 만든다. 상수 컬럼은
+    브로드캐스트, 번호/금액 컬럼은 벡터 연산으로 채운다.
     
     Args:
         df_filtered: 필터링된 데이터프레임
         company_config: 렌탈사 설정 정보
+        columns: 생성할 컬럼 목록 (기본값: ERP 양식 전체 컬럼)
+        management_items: 관리항목(CD_CC, CD_DEPT, CD_PJT) 설정 여부
         
     Returns:
         ERP 업로드용 데이터프레임
     """
     print("ERP 업로드용 데이터프레임 생성 중...")
+    voucher = _build_voucher(df_filtered, company_config, columns, management_items)
+    return voucher.to_frame()
+
+
+def build_compact_voucher(df_filtered: pd.DataFrame, company_config: Dict[str, Any], columns: List[str] = ERP_COLUMNS) -> CompactVoucher:
+    """
+    build_erp_frame과 같은 내용의 전표를 압축 표현(CompactVoucher)으로 생성
+    
+    상수/빈 컬럼은 값 하나만, 라인마다 다른 컬럼만 배열로 보관하고 저장할 때 데이터프레임으로 만든다.
+    
+    Args:
+        df_filtered: 필터링된 데이터프레임
+        company_config: 렌탈사 설정 정보
+        columns: 컬럼 목록 (기본값: ERP 양식 전체 컬럼)
+        
+    Returns:
+        압축 전표
+    """
+    print("ERP 업로드용 전표 생성 중...")
+    return _build_voucher(df_filtered, company_config, columns, management_items=True)
+
+
+def build_split_vouchers(df_filtered: pd.DataFrame, company_config: Dict[str, Any], max_lines: Optional[int] = None,
+                         document_number: Optional[str] = None) -> Tuple[List[CompactVoucher], List[str]]:
+    """
+    전표당 라인 수가 max_lines 이하가 되도록 차변 라인을 나누어 여러 전표 생성
+    
+    차변 라인은 원래 순서대로 연속 구간으로 나누며 전표별 라인 수 차이는 최대 1이다.
+    전표마다 차변 합계와 같은 대변 라인이 붙고, 라인 번호(ROW_NO)는 전표마다 1부터 시작하며,
+    나눈 전표의 전표번호(ROW_ID, NO_DOCU)는 document_number 뒤에 '-1', '-2' ...를 붙인다 (split_document_numbers).
+    
+    Args:
+        df_filtered: 필터링된(또는 집계된) 데이터프레임
+        company_config: 렌탈사 설정 정보
+        max_lines: 전표당 최대 라인 수 (대변 1라인 포함, None이면 나누지 않음)
+        document_number: 첫 전표번호 (None이면 default_document_number)
+        
+    Returns:
+        압축 전표 목록, 전표번호 목록
+    """
+    part_count = 1
+    if max_lines is not None:
+        if max_lines < 2:
+            raise ValueError(f"전표당 최대 라인 수는 2 이상이어야 합니다 (차변 1라인 + 대변 1라인): {max_lines}")
+        part_count = max(1, -(-len(df_filtered) // (max_lines - 1)))
+    
+    numbers = split_document_numbers(document_number or default_document_number(company_config), part_count)
+    if part_count > 1:
+        print(f"전표 분할: 차변 {len(df_filtered)}라인을 전표 {part_count}개로 나눕니다 (전표당 최대 {max_lines}라인).")
+    
+    vouchers = []
+    bounds = np.linspace(0, len(df_filtered), part_count + 1).round().astype(int)
+    for number, start, stop in zip(numbers, bounds[:-1], bounds[1:]):
+        voucher = build_compact_voucher(df_filtered.iloc[start:stop], company_config)
+        voucher.set_constant('ROW_ID', number)
+        voucher.set_constant('NO_DOCU', number)
+        vouchers.append(voucher)
+    return vouchers, numbers
+
+
+def default_document_number(company_config: Dict[str, Any]) -> str:
+    """
+    기본 전표번호 (FI + 오늘 날짜 + 사원번호 끝 3자리)
+    """
     current_date = datetime.now().strftime("%Y%m%d")
-    document_number = f"FI{current_date[-8:]}{company_config.get('id_write', '00000')[-3:]}"
-    
-    # 1. 차변 데이터 생성 (각 팀별 계정별 비용)
-    debit_data = {
-        "ROW_ID": [document_number] * len(df_filtered), 
-        "ROW_NO": [str(i) for i in range(1, len(df_filtered)+1)],
-        "NO_TAX": ["*"] * len(df_filtered),
-        "CD_PC": [company_config['cd_pc']] * len(df_filtered),
-        "CD_WDEPT": [company_config['cd_wdept']] * len(df_filtered),
-        "NO_DOCU": [document_number] * len(df_filtered), 
-        "NO_DOLINE": [str(i) for i in range(1, len(df_filtered)+1)],
-        "CD_COMPANY": [company_config['cd_company']] * len(df_filtered),
-        "ID_WRITE": [company_config['id_write']] * len(df_filtered),
-        "CD_DOCU": [cfg.ERP_DOCUMENT_TYPE] * len(df_filtered),
-        "DT_ACCT": [current_date] * len(df_filtered),
-        "ST_DOCU": [cfg.ERP_APPROVAL_STATUS] * len(df_filtered),
-        "TP_DRCR": ["1"] * len(df_filtered),  # 차대구분 (1: 차변)
-        "CD_ACCT": df_filtered["CD_ACCT"].tolist(),  # 각 팀별 계정 코드
-        "AMT": df_filtered["금액"].apply(lambda x: str(int(x)) if pd.notnull(x) else "0").tolist(),
-        "CD_PARTNER": [company_config['partner_code']] * len(df_filtered),
-        "NM_NOTE": df_filtered["적요"].tolist(),
-        "TP_DOCU": [cfg.ERP_PROCESS_STATUS] * len(df_filtered),
-        "NO_ACCT": ["0"] * len(df_filtered),
-        "TP_GUBUN": [cfg.ERP_DOCUMENT_GUBUN] * len(df_filtered),
-    }
+    return f"FI{current_date[-8:]}{company_config.get('id_write', '00000')[-3:]}"
+
+
+def split_document_numbers(document_number: str, count: int) -> List[str]:
+    """
+    나눈 전표 count개의 전표번호 (나누지 않으면 document_number 그대로)
     
-    # 2. 대변 데이터 생성 (미지급금으로 합계 금액)
-    total_amount = df_filtered["금액"].sum()
-    total_amount_str = str(total_amount)
-    
-    # 대변 데이터
-    credit_data = {
-        "ROW_ID": [document_number], 
-        "ROW_NO": [str(len(df_filtered) + 1)],  # 마지막 번호 다음
-        "NO_TAX": ["*"],
-        "CD_PC": [company_config['cd_pc']],
-        "CD_WDEPT": [company_config['cd_wdept']],
-        "NO_DOCU": [document_number], 
-        "NO_DOLINE": [str(len(df_filtered) + 1)],  # 마지막 라인 다음
-        "CD_COMPANY": [company_config['cd_company']],
-        "ID_WRITE": [company_config['id_write']],
-        "CD_DOCU": [cfg.ERP_DOCUMENT_TYPE],
-        "DT_ACCT": [current_date],
-        "ST_DOCU": [cfg.ERP_APPROVAL_STATUS],
-        "TP_DRCR": ["2"],  # 차대구분 (2: 대변)
-        "CD_ACCT": [company_config['payable_acct']],  # 미지급금 계정코드
-        "AMT": [total_amount_str],  # 전체 금액의 합계
-        "CD_PARTNER": [company_config['partner_code']],
-        "NM_NOTE": [f"{company_config['note_prefix']} 미지급금"],  # 적요
-        "TP_DOCU": [cfg.ERP_PROCESS_STATUS],
-        "NO_ACCT": ["0"],
-        "TP_GUBUN": [cfg.ERP_DOCUMENT_GUBUN],
+    전표번호 끝자리는 사원번호이므로 숫자를 늘리지 않고 '-1', '-2' ...를 붙인다
+    (예: FI20250427616 → FI20250427616-1, FI20250427616-2). 숫자를 늘리면 다른 작성자의 전표번호와 겹친다.
+    """
+    if count == 1:
+        return [document_number]
+    return [f"{document_number}-{i}" for i in range(1, count + 1)]
+
+
+def _build_voucher(df_filtered: pd.DataFrame, company_config: Dict[str, Any], columns: List[str], management_items: bool) -> CompactVoucher:
+    """
+    컬럼별 (차변 값, 대변 값) 명세로 압축 전표 생성 후 금액 확인 정보 출력
+    """
+    current_date = datetime.now().strftime("%Y%m%d")
+    document_number = default_document_number(company_config)
+    debit_count = len(df_filtered)
+    amounts = df_filtered["금액"]
+    total_amount = amounts.sum()
+    
+    spec = {
+        "ROW_ID": (document_number, document_number),
+        "ROW_NO": (LINE_NUMBER, str(debit_count + 1)),  # 차변 1..n, 대변 n+1
+        "NO_TAX": ("*", "*"),
+        "CD_PC": (company_config['cd_pc'], company_config['cd_pc']),
+        "CD_WDEPT": (company_config['cd_wdept'], company_config['cd_wdept']),
+        "NO_DOCU": (document_number, document_number),
+        "NO_DOLINE": (LINE_NUMBER, str(debit_count + 1)),
+        "CD_COMPANY": (company_config['cd_company'], company_config['cd_company']),
+        "ID_WRITE": (company_config['id_write'], company_config['id_write']),
+        "CD_DOCU": (cfg.ERP_DOCUMENT_TYPE, cfg.ERP_DOCUMENT_TYPE),
+        "DT_ACCT": (current_date, current_date),
+        "ST_DOCU": (cfg.ERP_APPROVAL_STATUS, cfg.ERP_APPROVAL_STATUS),
+        "TP_DRCR": ("1", "2"),  # 차대구분 (1: 차변, 2: 대변)
+        "CD_ACCT": (df_filtered["CD_ACCT"].to_numpy(dtype=object), company_config['payable_acct']),  # 팀별 계정 / 미지급금 계정
+        "AMT": (amounts.fillna(0).to_numpy(dtype="int64"), str(total_amount)),  # 대변은 전체 금액의 합계
+        "CD_PARTNER": (company_config['partner_code'], company_config['partner_code']),
+        "NM_NOTE": (df_filtered["적요"].to_numpy(dtype=object), f"{company_config['note_prefix']} 미지급금"),
+        "TP_DOCU": (cfg.ERP_PROCESS_STATUS, cfg.ERP_PROCESS_STATUS),
+        "NO_ACCT": ("0", "0"),
+        "TP_GUBUN": (cfg.ERP_DOCUMENT_GUBUN, cfg.ERP_DOCUMENT_GUBUN),
     }
     
-    # 3. 차변과 대변 데이터프레임 생성
-    debit_df = pd.DataFrame(debit_data)
-    credit_df = pd.DataFrame(credit_data)
+    if management_items:
+        spec["CD_CC"] = (company_config['cost_center'], company_config['cost_center'])  # 코스트센터
+        if 'cd_wdept' in company_config:
+            spec["CD_DEPT"] = (company_config['cd_wdept'], company_config['cd_wdept'])  # 부서코드
+        # 프로젝트 코드는 차변에만 정수로 설정
+        spec["CD_PJT"] = (df_filtered["CD_PJT"].to_numpy(dtype="int64"), "")
     
-    # 4. 두 데이터프레임 합치기
-    erp_df = pd.concat([debit_df, credit_df], ignore_index=True)
+    voucher = CompactVoucher(columns, debit_count, spec, str_columns=["AMT"])
     
     # 금액 필드 확인
     print("\nAMT 필드 확인:")
-    print("차변 금액 합계:", df_filtered["금액"].sum())
+    print("차변 금액 합계:", total_amount)
     print("대변 금액:", total_amount)
-    print("차변 건수:", len(debit_df))
-    print("대변 건수:", len(credit_df))
+    print("차변 건수:", debit_count)
+    print("대변 건수:", 1)
     
-    return erp_df
+    return voucher
+
+
+def generate_erp_data(df_filtered: pd.DataFrame, company_config: Dict[str, Any]) -> pd.DataFrame:
+    """
+    ERP 업로드용 데이터프레임 생성 (전표 라인 기본 컬럼만, 나머지는 prepare_erp_columns에서 추가)
+    
+    Args:
+        df_filtered: 필터링된 데이터프레임
+        company_config: 렌탈사 설정 정보
+        
+    Returns:
+        ERP 업로드용 데이터프레임
+    """
+    return build_erp_frame(df_filtered, company_config, ERP_LINE_COLUMNS, management_items=False)
 
 
 def prepare_erp_columns(erp_df: pd.DataFrame) -> pd.DataFrame:
@@ -101,39 +219,10 @@ def prepare_erp_columns(erp_df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         표준 컬럼 구조를 가진 ERP 데이터프레임
     """
-    # 필드 순서 지정 - ERP 양식에 맞게 정확한 순서로 컬럼 정렬
-    erp_columns = [
-        "ROW_ID", "ROW_NO", "NO_TAX", "CD_PC", "CD_WDEPT", "NO_DOCU", "NO_DOLINE", 
-        "CD_COMPANY", "ID_WRITE", "CD_DOCU", "DT_ACCT", "ST_DOCU", "TP_DRCR", 
-        "CD_ACCT", "AMT", "CD_PARTNER", "DT_START", "DT_END", "AM_TAXSTD", 
-        "AM_ADDTAX", "TP_TAX", "NO_COMPANY", "NM_NOTE", "CD_BIZAREA", "CD_DEPT", 
-        "CD_CC", "CD_PJT", "CD_FUND", "CD_BUDGET", "NO_CASH", "ST_MUTUAL", 
-        "CD_CARD", "NO_DEPOSIT", "CD_BANK", "UCD_MNG1", "UCD_MNG2", "UCD_MNG3", 
-        "UCD_MNG4", "UCD_MNG5", "CD_EMPLOY", "CD_MNG", "NO_BDOCU", "NO_BDOLINE", 
-        "TP_DOCU", "NO_ACCT", "TP_TRADE", "NO_CHECK3", "NO_CHECK4", "CD_EXCH", 
-        "RT_EXCH", "CD_TRADE", "AM_EX", "TP_EXPORT", "NO_TO", "DT_SHIPPING", 
-        "TP_GUBUN", "NO_INVOICE", "NO_ITEM", "MD_TAX1", "NM_ITEM1", "NM_SIZE1", 
-        "QT_TAX1", "AM_PRC1", "AM_SUPPLY1", "AM_TAX1", "NM_NOTE1", "CD_BIZPLAN", 
-        "CD_BGACCT", "CD_MNGD1", "NM_MNGD1", "CD_MNGD2", "NM_MNGD2", "CD_MNGD3", 
-        "NM_MNGD3", "CD_MNGD4", "NM_MNGD4", "CD_MNGD5", "NM_MNGD5", "CD_MNGD6", 
-        "NM_MNGD6", "CD_MNGD7", "NM_MNGD7", "CD_MNGD8", "NM_MNGD8", "YN_ISS", 
-        "FINAL_STATUS", "NO_BILL", "NM_BIGO", "TP_BILL", "TP_RECORD", "TP_ETCACCT", 
-        "ST_GWARE", "SELL_DAM_NM", "SELL_DAM_EMAIL", "SELL_DAM_MOBIL", "SELL_DAM_TEL", 
-        "NM_PUMM", "JEONJASEND15_YN", "DT_WRITE", "ST_TAX", "MD_TAX2", "NM_ITEM2", 
-        "NM_SIZE2", "QT_TAX2", "AM_PRC2", "AM_SUPPLY2", "AM_TAX2", "NM_NOTE2", 
-        "MD_TAX3", "NM_ITEM3", "NM_SIZE3", "QT_TAX3", "AM_PRC3", "AM_SUPPLY3", 
-        "AM_TAX3", "NM_NOTE3", "MD_TAX4", "NM_ITEM4", "NM_SIZE4", "QT_TAX4", 
-        "AM_PRC4", "AM_SUPPLY4", "AM_TAX4", "NM_NOTE4", "NM_PTR", "EX_HP", 
-        "EX_EMIL", "NO_BIZTAX", "NO_ASSET", "TP_EVIDENCE", "NO_CAR", "NO_CARBODY", 
-        "CD_BIZCAR", "NM_PARTNER", "YN_IMPORT", "YN_FIXASSET"
-    ]
-    
-    # 나머지 열 추가 (빈 문자열로)
-    for col in erp_columns:
-        if col not in erp_df.columns:
-            erp_df[col] = [""] * len(erp_df)
-    
-    return erp_df[erp_columns]
+    # 없는 컬럼은 빈 문자열 배열 하나를 공유하여 한 번에 생성 (컬럼을 하나씩 추가하면 프레임이 조각남)
+    empty = np.full(len(erp_df), "", dtype=object)
+    return pd.DataFrame({col: erp_df[col].to_numpy() if col in erp_df.columns else empty for col in ERP_COLUMNS},
+                        index=erp_df.index)
 
 
 def set_management_items(erp_df: pd.DataFrame, df_filtered: pd.DataFrame, company_config: Dict[str, Any]) -> pd.DataFrame:
@@ -0,0 +1,291 @@
+"""
+전표 검증 모듈 (저장 전에 차대 균형, 코드, 필수 값, 라인 번호 중복을 확인)
+
+압축 전표는 컬럼별 (차변 값, 대변 값)을 그대로 검사하므로 상수 컬럼은 값 하나만 확인하고,
+배열 컬럼도 고유 값만 판정한 뒤 문제 값이 있을 때만 라인 수를 센다.
+데이터프레임 전표(build_erp_frame, set_management_items 결과)는 TP_DRCR로 차변/대변 라인을 나누어 같은 검사를 한다.
+"""
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, List, Optional, Set, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from core import config as cfg
+from core.voucher import CompactVoucher, LINE_NUMBER
+
+# 검사 종류: 안내 문구
+CHECK_LABELS = {
+    'balance': '차변 합계와 대변 합계가 다름',
+    'amount': '금액(AMT)이 숫자가 아님',
+    'drcr': '차대구분(TP_DRCR) 값 오류',
+    'account': '매핑에 없는 계정 코드',
+    'project': '매핑에 없는 프로젝트 코드',
+    'required': '필수 값 누락',
+    'duplicate_line': '전표 라인 번호 중복',
+}
+
+
+@dataclass
+class ValidationIssue:
+    """
+    검증에서 찾은 문제 (전표/검사/컬럼별로 라인 수를 묶음)
+    """
+    document_number: str
+    check: str                 # CHECK_LABELS의 키
+    column: str
+    count: int                 # 문제가 있는 라인 수 (balance는 1)
+    examples: List[Any] = field(default_factory=list)  # 문제 값 예시 (balance는 [차변 합계, 대변 합계])
+
+    def describe(self) -> str:
+        """
+        화면 표시용 한 줄 설명
+        """
+        if self.check == 'balance':
+            debit_total, credit_total = self.examples
+            detail = f"차변 {debit_total:,} / 대변 {credit_total:,}"
+        else:
+            detail = f"{self.count}개 라인"
+            if self.examples:
+                detail += " (예: " + ", ".join(repr(value) for value in self.examples) + ")"
+        return f"[{self.document_number}] {CHECK_LABELS[self.check]} - {self.column}: {detail}"
+
+
+@dataclass
+class ValidationReport:
+    """
+    전표 검증 결과 (여러 전표로 나눈 경우 전체 합계)
+    """
+    voucher_count: int = 0
+    line_count: int = 0
+    debit_total: int = 0
+    credit_total: int = 0
+    issues: List[ValidationIssue] = field(default_factory=list)
+    elapsed: float = 0.0       # 검증 시간 (초)
+
+    @property
+    def passed(self) -> bool:
+        return not self.issues
+
+    def summary_lines(self) -> List[str]:
+        """
+        화면 표시용 요약 문자열 목록
+        """
+        status = "통과" if self.passed else f"문제 {len(self.issues)}건"
+        lines = [f"전표 검증: {status} (전표 {self.voucher_count}개, {self.line_count:,}개 라인, {self.elapsed * 1000:.1f}ms)"]
+        lines.extend(f"- {issue.describe()}" for issue in self.issues)
+        return lines
+
+
+def validate_vouchers(vouchers: Iterable[Union[pd.DataFrame, CompactVoucher]], valid_accounts: Set[str], valid_projects: Set[int],
+                      required_columns: List[str] = cfg.VOUCHER_REQUIRED_COLUMNS) -> ValidationReport:
+    """
+    전표 검증 (관리항목 설정 후, 양식 적용/저장 전에 실행)
+
+    전표마다 다음을 확인한다.
+    - 차대 균형: 차변(TP_DRCR=1) 금액 합계와 대변(TP_DRCR=2) 금액 합계가 같은지, 금액이 숫자인지
+    - 코드: CD_ACCT는 valid_accounts, 차변 CD_PJT는 valid_projects(또는 기본 프로젝트 코드)에 있는지
+    - 필수 값: required_columns에 빈 값/결측값이 없는지
+    - 라인 번호: NO_DOLINE이 전표 안에서 중복되지 않는지
+
+    Args:
+        vouchers: 압축 전표 또는 데이터프레임 전표 목록
+        valid_accounts: 허용 계정 코드 (매핑 계정 + 대변 미지급금 계정)
+        valid_projects: 허용 프로젝트 코드 (정수)
+        required_columns: 빈 값이 없어야 하는 컬럼
+
+    Returns:
+        검증 결과 (문제가 없으면 report.passed)
+    """
+    start = time.perf_counter()
+    report = ValidationReport()
+    projects = set(valid_projects) | {cfg.DEFAULT_PROJECT_CODE}
+    for voucher in vouchers:
+        lines = _VoucherLines(voucher)
+        report.voucher_count += 1
+        report.line_count += lines.debit_count + lines.credit_count + lines.other_count
+        report.issues.extend(_check_voucher(lines, valid_accounts, projects, required_columns, report))
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+class _VoucherLines:
+    """
+    검증용 차변/대변 라인 값 조회 (차변 값은 상수, 배열 또는 LINE_NUMBER, 대변 값은 배열)
+    """
+
+    def __init__(self, voucher: Union[pd.DataFrame, CompactVoucher]):
+        self._voucher = voucher
+        self._uniques = {}  # id(배열): (배열, 고유 값) - 여러 검사가 같은 배열을 쓰면 한 번만 계산
+        self._pairs = {}    # 데이터프레임 전표의 컬럼명: (차변 값, 대변 값)
+        if isinstance(voucher, CompactVoucher):
+            self.debit_count, self.credit_count, self.other_count = voucher.debit_count, 1, 0
+            self._debit_mask = self._credit_mask = None
+        else:
+            drcr = voucher["TP_DRCR"].astype(str).to_numpy() if "TP_DRCR" in voucher.columns else np.full(len(voucher), "", dtype=object)
+            self._debit_mask, self._credit_mask = drcr == "1", drcr == "2"
+            self.debit_count = int(self._debit_mask.sum())
+            self.credit_count = int(self._credit_mask.sum())
+            self.other_count = len(voucher) - self.debit_count - self.credit_count
+
+    def pair(self, col: str) -> Tuple[Any, np.ndarray]:
+        """
+        (차변 값, 대변 값 배열)
+        """
+        if isinstance(self._voucher, CompactVoucher):
+            debit, credit = self._voucher.column_pair(col)
+            return debit, np.array([credit], dtype=object)
+        if col not in self._voucher.columns:
+            return "", np.full(self.credit_count, "", dtype=object)
+        if col not in self._pairs:
+            values = self._voucher[col].to_numpy()
+            self._pairs[col] = (values[self._debit_mask], values[self._credit_mask])
+        return self._pairs[col]
+
+    def unique(self, values: np.ndarray) -> np.ndarray:
+        """
+        배열의 고유 값 (같은 배열은 한 번만 계산)
+        """
+        cached = self._uniques.get(id(values))
+        if cached is None or cached[0] is not values:
+            cached = self._uniques[id(values)] = (values, pd.unique(values))
+        return cached[1]
+
+    def document_number(self) -> str:
+        debit, credit = self.pair("NO_DOCU")
+        values = [debit] if not isinstance(debit, np.ndarray) else list(debit[:1])
+        values.extend(credit[:1])
+        return str(values[0]) if values else ""
+
+
+def _check_voucher(lines: _VoucherLines, valid_accounts: Set[str], valid_projects: Set[int], required_columns: List[str],
+                   report: ValidationReport) -> List[ValidationIssue]:
+    """
+    전표 하나 검사 (금액 합계는 report에 더함)
+    """
+    document = lines.document_number()
+    issues = []
+
+    def add(check: str, col: str, found: Tuple[int, List[Any]]) -> None:
+        count, examples = found
+        if count:
+            issues.append(ValidationIssue(document, check, col, count, examples))
+
+    # 차대구분: 차변 라인은 1, 대변 라인은 2 (데이터프레임은 그 외 값인 라인 수)
+    debit, credit = lines.pair("TP_DRCR")
+    wrong_debit = _find(lines, debit, lines.debit_count, lambda value: str(value) != "1")
+    wrong_credit = _find(lines, credit, lines.credit_count, lambda value: str(value) != "2")
+    add('drcr', "TP_DRCR", (lines.other_count + wrong_debit[0] + wrong_credit[0], wrong_debit[1] + wrong_credit[1]))
+    if lines.credit_count == 0:
+        issues.append(ValidationIssue(document, 'drcr', "TP_DRCR", 1, ["대변 라인 없음"]))
+
+    # 차대 균형
+    debit, credit = lines.pair("AMT")
+    debit_total, debit_bad = _amount_total(debit, lines.debit_count)
+    credit_total, credit_bad = _amount_total(credit, lines.credit_count)
+    add('amount', "AMT", (debit_bad[0] + credit_bad[0], (debit_bad[1] + credit_bad[1])[:cfg.VALIDATION_MAX_EXAMPLES]))
+    if debit_total != credit_total:
+        issues.append(ValidationIssue(document, 'balance', "AMT", 1, [debit_total, credit_total]))
+    report.debit_total += debit_total
+    report.credit_total += credit_total
+
+    # 코드: 계정은 차변/대변 모두, 프로젝트는 차변만 (빈 값은 필수 값 검사에서 안내)
+    def is_unknown_account(value: Any) -> bool:
+        return not _is_blank(value) and str(value).strip() not in valid_accounts
+
+    debit, credit = lines.pair("CD_ACCT")
+    add('account', "CD_ACCT", _merge(_find(lines, debit, lines.debit_count, is_unknown_account),
+                                     _find(lines, credit, lines.credit_count, is_unknown_account)))
+    debit, _ = lines.pair("CD_PJT")
+    add('project', "CD_PJT", _find(lines, debit, lines.debit_count, lambda value: _as_int(value) not in valid_projects))
+
+    # 필수 값
+    for col in required_columns:
+        debit, credit = lines.pair(col)
+        add('required', col, _merge(_find(lines, debit, lines.debit_count, _is_blank), _find(lines, credit, lines.credit_count, _is_blank)))
+
+    # 라인 번호 중복
+    debit, credit = lines.pair("NO_DOLINE")
+    add('duplicate_line', "NO_DOLINE", _duplicate_lines(debit, lines.debit_count, credit))
+    return issues
+
+
+def _find(lines: _VoucherLines, values: Any, count: int, is_bad: Callable[[Any], bool]) -> Tuple[int, List[Any]]:
+    """
+    상수/배열 값 중 is_bad인 값을 가진 라인 수와 값 예시 (배열은 고유 값만 판정)
+    """
+    if values is LINE_NUMBER or count == 0:
+        return 0, []
+    if not isinstance(values, np.ndarray):
+        return (count, [values]) if is_bad(values) else (0, [])
+    bad = [value for value in lines.unique(values) if is_bad(value)]
+    if not bad:
+        return 0, []
+    return int(pd.Series(values, copy=False).isin(bad).sum()), _plain(bad[:cfg.VALIDATION_MAX_EXAMPLES])
+
+
+def _merge(*found: Tuple[int, List[Any]]) -> Tuple[int, List[Any]]:
+    examples = []
+    for _, values in found:
+        examples.extend(value for value in values if value not in examples)
+    return sum(count for count, _ in found), examples[:cfg.VALIDATION_MAX_EXAMPLES]
+
+
+def _amount_total(values: Any, count: int) -> Tuple[int, Tuple[int, List[Any]]]:
+    """
+    금액 합계와 (숫자가 아닌 라인 수, 예시) - 정수 배열은 그대로 합산
+    """
+    if count == 0:
+        return 0, (0, [])
+    if isinstance(values, np.ndarray) and values.dtype.kind in 'iu':
+        return int(values.sum()), (0, [])
+    if not isinstance(values, np.ndarray):
+        amount = pd.to_numeric(pd.Series([values]), errors='coerce')[0]
+        return (0, (count, [values])) if pd.isna(amount) else (int(amount) * count, (0, []))
+    amounts = pd.to_numeric(pd.Series(values, copy=False), errors='coerce')
+    invalid = amounts.isna().to_numpy()
+    if invalid.any():
+        return int(amounts.sum()), (int(invalid.sum()), _plain(list(pd.unique(values[invalid]))[:cfg.VALIDATION_MAX_EXAMPLES]))
+    return int(amounts.sum()), (0, [])
+
+
+def _duplicate_lines(debit: Any, debit_count: int, credit: np.ndarray) -> Tuple[int, List[Any]]:
+    """
+    라인 번호가 전표 안에서 두 번 이상 나오는 라인 수와 중복 번호 예시
+    """
+    if debit is LINE_NUMBER:
+        # 차변 라인 번호는 "1".."n"으로 중복이 없으므로 대변 번호만 확인
+        labels = pd.Series([str(label) for label in credit])
+        taken = labels.map(lambda text: text.isdigit() and str(int(text)) == text and 1 <= int(text) <= debit_count)
+        duplicated = labels.duplicated(keep=False) | taken
+        examples = list(pd.unique(labels[duplicated]))[:cfg.VALIDATION_MAX_EXAMPLES]
+        # 차변 번호와 겹치면 그 차변 라인도 중복
+        return int(duplicated.sum()) + len(pd.unique(labels[taken])), examples
+    if not isinstance(debit, np.ndarray):
+        debit = np.full(debit_count, debit, dtype=object)
+    labels = pd.Series(np.concatenate([debit.astype(object), credit.astype(object)])).astype(str)
+    duplicated = labels.duplicated(keep=False)
+    if not duplicated.any():
+        return 0, []
+    return int(duplicated.sum()), list(pd.unique(labels[duplicated]))[:cfg.VALIDATION_MAX_EXAMPLES]
+
+
+def _plain(values: List[Any]) -> List[Any]:
+    """
+    numpy 스칼라를 파이썬 값으로 (안내 문구에 np.int64(...)처럼 표시되지 않도록)
+    """
+    return [value.item() if isinstance(value, np.generic) else value for value in values]
+
+
+def _is_blank(value: Any) -> bool:
+    if isinstance(value, str):
+        return not value.strip()
+    return value is None or bool(pd.isna(value))
+
+
+def _as_int(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
@@ -3,59 +3,112 @@ ERP 자동 전표 생성 메인 실행 파일
 """
 import os
 import argparse
+import importlib
+import traceback
+import tempfile
+from contextlib import contextmanager, nullcontext
 from datetime import datetime
-from core.config import RENTAL_COMPANIES, OUTPUT_DIR
-from mappers.mapping_utils import load_mapping_file
-from processors.rental_processor import load_and_preprocess_data, summarize_data
-from generators.korea_rental_gen import generate_erp_data, prepare_erp_columns, set_management_items
-from utils import (
-    load_erp_form_template, prepare_file_with_template, save_to_files,
-    print_data_summary, generate_report_file
-)
-import pandas as pd
-from pyexcel_xls import save_data
-from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
+from core import config as cfg
+from core.config import RENTAL_COMPANIES, OUTPUT_DIR, CSV_CHUNK_SIZE, PROFILE_DIR, BATCH_MAX_WORKERS, BATCH_DIR, APP_VERSION
+from core.result import PipelineResult
 
+# pandas와 전처리/저장 모듈은 무거우므로 실제 처리를 시작할 때 각 함수에서 import
+# (--help, --version, --dry-run은 pandas를 로드하지 않고 끝남)
+if TYPE_CHECKING:
+    import pandas as pd
+    from core.voucher import CompactVoucher
+    from utils.profile_utils import StageProfiler
 
-def process_rental_company(company_name: str):
+
+def process_rental_company(company_name: str, employee_number: str = '00616', chunksize: Optional[int] = None, verbose: bool = True,
+                           profile: bool = False, input_file: Optional[str] = None, use_cache: bool = True,
+                           aggregate: bool = False, max_lines: Optional[int] = None,
+                           save_history: bool = True, output_name: Optional[str] = None,
+                           split_workers: int = 1) -> Optional[PipelineResult]:
     """
     특정 렌탈사의 데이터 처리 (CLI 실행용)
     
     Args:
         company_name: 처리할 렌탈사 이름
+        employee_number: 사원번호 (작성자)
+        chunksize: 지정 시 입력 CSV를 이 행 수 단위로 스트리밍 처리
+        verbose: 처리 과정 출력 여부
+        profile: 단계별 CPU 시간/메모리까지 측정하여 JSON으로 저장할지 여부
+        input_file: 설정의 입력 파일 대신 처리할 파일 (지정 시 출력 파일명에 입력 파일명을 붙임)
+        use_cache: 입력/매핑 파일과 설정이 같으면 이전 전처리 결과를 디스크 캐시에서 재사용할지 여부
+        aggregate: 계정/프로젝트/적요가 같은 차변 행을 한 라인으로 묶고 라인별 원본 행 내역 파일을 함께 저장할지 여부
+        max_lines: 전표당 최대 라인 수 (넘으면 여러 전표로 나누어 파일명 뒤에 _01, _02 ...를 붙여 저장)
+        save_history: 전처리 결과를 렌탈사/월 이력 저장소에 저장할지 여부 (월간 비교용)
+        output_name: input_file 지정 시 출력 파일명에 쓸 이름 (없으면 '렌탈사_입력 파일명', 배치 작업 ID 전달용)
+        split_workers: 나뉜 전표 파일을 동시에 저장할 최대 프로세스 수 (1이면 차례로 저장, 배치 작업에서는 1)
+        
+    Returns:
+        실행 결과 (렌탈사 설정이 없으면 None)
     """
     if company_name not in RENTAL_COMPANIES:
         print(f"오류: '{company_name}' 렌탈사 설정을 찾을 수 없습니다.")
-        return
+        return None
     
-    company_config = RENTAL_COMPANIES[company_name]
-    print(f"'{company_name}' 렌탈사 데이터 처리 시작...")
+    from utils import load_erp_form_template, prepare_file_with_template, save_parts_to_files, save_drilldown_file, print_data_summary
+    from utils.profile_utils import StageProfiler
     
-    input_file = company_config['input_file']
-    mapping_file = company_config['mapping_file']
-    erp_form_file = company_config['erp_form_file']
-    output_csv = company_config['output_csv']
-    output_excel = company_config['output_excel']
-    report_file = os.path.join(OUTPUT_DIR, f'보고서_{company_name}_{datetime.now().strftime("%Y%m%d")}.txt')
+    cfg.ensure_directories()
+    company_config = _company_config(company_name, employee_number, input_file, output_name)
+    result = PipelineResult()
+    profiler = StageProfiler(memory=profile, mode='cli', company=company_name,
+                             input_file=company_config['input_file'], chunksize=chunksize)
     
-    mapping_dict = load_mapping_file(mapping_file)
-    df, df_filtered = load_and_preprocess_data(input_file, company_config, mapping_dict)
-    summary = summarize_data(df_filtered, mapping_dict)
-    erp_df = generate_erp_data(df_filtered, company_config)
-    erp_df = prepare_erp_columns(erp_df)
-    erp_df = set_management_items(erp_df, df_filtered, company_config)
-    
-    erp_form = load_erp_form_template(erp_form_file)
-    result_df = prepare_file_with_template(erp_df, erp_form)
-    
-    save_to_files(result_df, output_csv, output_excel, len(erp_df))
-    print_data_summary(summary, company_config)
-    # generate_report_file(summary, erp_df, report_file)
+    with _output_context(verbose), _profiling(profiler, result, profile, company_name):
+        print(f"'{company_name}' 렌탈사 데이터 처리 시작...")
+        
+        output_csv = company_config['output_csv']
+        output_excel = company_config['output_excel']
+        report_file = os.path.join(OUTPUT_DIR, f'보고서_{company_name}_{datetime.now().strftime("%Y%m%d")}.txt')
+        
+        vouchers, summary, drilldown = _build_voucher(company_config['input_file'], company_config, chunksize, result, profiler,
+                                                      use_cache, aggregate, max_lines,
+                                                      history_company=company_name if save_history else None)
+        line_count = sum(voucher.line_count for voucher in vouchers)
+        
+        with profiler.stage('template', rows=line_count):
+            erp_form = load_erp_form_template(company_config['erp_form_file'])
+            parts = [prepare_file_with_template(voucher, erp_form) for voucher in vouchers]
+        
+        with profiler.stage('save', rows=line_count):
+            result.output_paths = save_parts_to_files(parts, output_csv, output_excel, split_workers)
+            if drilldown is not None:
+                result.drilldown_path = save_drilldown_file(drilldown, output_csv)
+        result.output_path = result.output_paths[0]
+        
+        print_data_summary(summary, company_config)
+        # generate_report_file(summary, erp_df, report_file)
+        
+        print(f"\n'{company_name}' 렌탈사 데이터 처리 완료.")
     
-    print(f"\n'{company_name}' 렌탈사 데이터 처리 완료.")
+    return result
 
 
-def process_rental_company_with_voucher(uploaded_file_path, voucher_number, employee_number):
+def _company_config(company_name: str, employee_number: str, input_file: Optional[str] = None,
+                    output_name: Optional[str] = None) -> Dict[str, Any]:
+    """
+    CLI 실행용 렌탈사 설정 복사본 생성 (사원번호, 입력 파일 지정 시 입력/출력 경로 반영)
+    """
+    company_config = RENTAL_COMPANIES[company_name].copy()  # 설정을 복사해서 사용
+    company_config['id_write'] = employee_number
+    if input_file:
+        # 같은 렌탈사의 여러 파일(예: 여러 달)을 처리할 때 출력 파일이 겹치지 않도록 입력 파일명 사용
+        name = output_name or f"{company_name}_{os.path.splitext(os.path.basename(input_file))[0]}"
+        company_config['input_file'] = input_file
+        company_config['output_csv'] = os.path.join(OUTPUT_DIR, f'자동전표_{name}.csv')
+        company_config['output_excel'] = os.path.join(OUTPUT_DIR, f'자동전표_{name}.xls')
+    return company_config
+
+
+def process_rental_company_with_voucher(uploaded_file_path, voucher_number, employee_number, chunksize: Optional[int] = None,
+                                        verbose: bool = True, result: Optional[PipelineResult] = None,
+                                        profile: bool = False, use_cache: bool = True, aggregate: bool = False,
+                                        max_lines: Optional[int] = None, save_history: bool = True) -> PipelineResult:
     """
     특정 렌탈사의 데이터 처리 (웹 인터페이스용)
     
@@ -63,72 +116,425 @@ def process_rental_company_with_voucher(uploaded_file_path, voucher_number, empl
         uploaded_file_path: 업로드된 파일 경로
         voucher_number: 전표번호
         employee_number: 사원번호 (필수)
+        chunksize: 지정 시 입력 CSV를 이 행 수 단위로 스트리밍 처리
+        verbose: 처리 과정 출력 여부 (False면 print 출력을 버림)
+        result: 결과를 채울 객체 (선택, 오류가 나도 그때까지의 정보를 호출자가 볼 수 있음)
+        profile: 단계별 CPU 시간/메모리까지 측정하여 JSON으로 저장할지 여부
+        use_cache: 같은 파일을 다시 올리면 이전 전처리 결과를 재사용하고 전표번호/사원번호 반영과 저장만 할지 여부
+        aggregate: 계정/프로젝트/적요가 같은 차변 행을 한 라인으로 묶고 라인별 원본 행 내역 파일을 함께 저장할지 여부
+        max_lines: 전표당 최대 라인 수 (넘으면 전표번호 뒤에 -1, -2 ...를 붙인 여러 전표로 나누고 zip 파일 하나로 묶음)
+        save_history: 전처리 결과를 렌탈사/월 이력 저장소에 저장할지 여부 (월간 비교용)
         
     Returns:
-        출력 파일 경로
+        실행 결과 (result.output_path: 출력 파일 경로, 전표를 나누면 zip 파일)
     """
     # 사원번호 필수 검증
     if not employee_number or not employee_number.strip():
         raise ValueError("사원번호를 입력해주세요. 사원번호는 필수 입력값입니다.")
     
+    from utils import load_erp_form_template, prepare_file_with_template, write_excel_parts, save_drilldown_file, zip_files
+    from utils.profile_utils import StageProfiler
+    
+    if result is None:
+        result = PipelineResult()
+    
     company_name = "한국렌탈"
     company_config = RENTAL_COMPANIES[company_name].copy()  # 설정을 복사해서 사용
     
     # 사원번호 설정 - 입력된 값 사용
     company_config['id_write'] = employee_number.strip()
+    profiler = StageProfiler(memory=profile, mode='web', company=company_name,
+                             input_file=os.path.basename(str(uploaded_file_path)), chunksize=chunksize)
     
-    mapping_file = company_config['mapping_file']
-    mapping_dict = load_mapping_file(mapping_file)
+    with _output_context(verbose), _profiling(profiler, result, profile, company_name):
+        # 전표번호 채워넣기 (전표를 나누면 입력한 번호 뒤에 -1, -2 ...)
+        vouchers, _, drilldown = _build_voucher(uploaded_file_path, company_config, chunksize, result, profiler, use_cache, aggregate,
+                                                max_lines, document_number=voucher_number,
+                                                history_company=company_name if save_history else None)
+        line_count = sum(voucher.line_count for voucher in vouchers)
 
-    df, df_filtered = load_and_preprocess_data(uploaded_file_path, company_config, mapping_dict)
-    summary = summarize_data(df_filtered, mapping_dict)
-    erp_df = generate_erp_data(df_filtered, company_config)
-    erp_df = prepare_erp_columns(erp_df)
-    erp_df = set_management_items(erp_df, df_filtered, company_config)
+        with profiler.stage('template', rows=line_count):
+            # ERP 양식 로드
+            erp_form = load_erp_form_template(company_config['erp_form_file'])
 
-    # 전표번호 채워넣기
-    if 'ROW_ID' in erp_df.columns:
-        erp_df['ROW_ID'] = voucher_number
-    if 'NO_DOCU' in erp_df.columns:
-        erp_df['NO_DOCU'] = voucher_number
+            # ERP 양식에 맞춰서 데이터 준비
+            parts = [prepare_file_with_template(voucher, erp_form) for voucher in vouchers]
 
-    # ERP 양식 로드
-    erp_form = load_erp_form_template(company_config['erp_form_file'])
+        # 저장 - 동시에 처리되는 요청끼리 파일을 덮어쓰지 않도록 요청별 폴더에 저장
+        with profiler.stage('save', rows=line_count):
+            output_filename = f"자동전표_완성파일_{datetime.now().strftime('%Y%m%d')}.xls"
+            os.makedirs(OUTPUT_DIR, exist_ok=True)
+            request_dir = tempfile.mkdtemp(prefix='web_', dir=OUTPUT_DIR)
+            output_path = os.path.join(request_dir, output_filename)
+            result.output_paths = write_excel_parts(parts, output_path)
+            result.output_path = result.output_paths[0]
+            if drilldown is not None:
+                result.drilldown_path = save_drilldown_file(drilldown, output_path)
+            if len(parts) > 1:
+                # 다운로드는 파일 하나로 받도록 분할 전표(와 상세 내역)를 zip으로 묶음
+                archive_files = result.output_paths + ([result.drilldown_path] if result.drilldown_path else [])
+                result.output_path = zip_files(archive_files, os.path.splitext(output_path)[0] + '.zip')
 
-    # ERP 양식에 맞춰서 데이터 준비
-    result_df = prepare_file_with_template(erp_df, erp_form)
+    return result
 
-    # 저장
-    output_filename = f"자동전표_완성파일_{datetime.now().strftime('%Y%m%d')}.xls"
-    output_path = os.path.join(OUTPUT_DIR, output_filename)
 
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
+def _build_voucher(input_file, company_config: Dict[str, Any], chunksize: Optional[int], result: PipelineResult,
+                   profiler: "StageProfiler", use_cache: bool = True, aggregate: bool = False, max_lines: Optional[int] = None,
+                   document_number: Optional[str] = None,
+                   history_company: Optional[str] = None) -> Tuple[List["CompactVoucher"], Dict[str, Any], Optional["pd.DataFrame"]]:
+    """
+    매핑 로드부터 관리항목 설정, 전표 검증까지 수행하여 ERP 전표 생성 (CLI/웹 공통)
+    
+    use_cache이면 입력 파일 로드/전처리 결과(df_filtered)를 디스크 캐시에서 찾아 재사용한다.
+    사원번호/전표번호는 전처리 결과에 들어가지 않으므로 캐시를 써도 매번 새로 반영된다.
+    aggregate이면 차변 라인을 집계한 전표를 만들고 라인별 원본 행 내역을 함께 반환한다
+    (요약 정보는 집계 전 원본 행 기준). max_lines를 넘는 전표는 여러 전표로 나누며,
+    나눈 전표의 전표번호는 document_number(없으면 기본 전표번호) 뒤에 '-1', '-2' ...를 붙인다.
+    검증(차대 균형, 코드, 필수 값, 라인 번호 중복)에 실패하면 파일을 저장하기 전에 ValueError를 발생시킨다.
+    history_company를 주면 검증을 통과한 전처리 결과를 그 렌탈사의 월별 이력으로 저장한다.
+    
+    Returns:
+        ERP 전표(압축 표현) 목록, 데이터 요약 정보, 라인별 원본 행 내역 (집계하지 않으면 None)
+    """
+    from mappers.mapping_utils import load_company_mapping, get_mapping_codes
+    from processors.rental_processor import summarize_data, aggregate_lines, build_drilldown
+    from generators.korea_rental_gen import build_split_vouchers
+    from generators.voucher_validator import validate_vouchers
+    from utils.cache_utils import result_cache
+    
+    with profiler.stage('load_mapping') as record:
+        mapping_dict = load_company_mapping(company_config)
+        record['rows'] = len(mapping_dict)
+    
+    run_info = {}
+    try:
+        with profiler.stage('load_and_preprocess') as record:
+            cache_key = _result_cache_key(input_file, company_config) if use_cache else None
+            cached = result_cache.get(cache_key) if cache_key else None
+            if cached is not None:
+                df_filtered, cached_info = cached
+                run_info.update(cached_info)
+                result.cache_hit = True
+                print("입력 파일과 매핑/설정이 이전과 같아 저장된 전처리 결과를 재사용합니다.")
+            else:
+                df_filtered = _load_filtered_data(input_file, company_config, mapping_dict, chunksize, run_info)
+                if cache_key:
+                    result_cache.put(cache_key, (df_filtered, run_info))
+            record['rows'] = len(df_filtered)
+            record['cache'] = 'hit' if cached is not None else ('miss' if cache_key else 'off')
+            if profiler.memory and len(df_filtered):
+                # 전처리 결과의 행당 메모리 (문자열 객체까지 포함)
+                record['bytes_per_row'] = round(int(df_filtered.memory_usage(deep=True).sum()) / len(df_filtered), 1)
+    finally:
+        # 실패하더라도 인식된 필드, 매핑되지 않은 팀명 등은 결과에 남김
+        result.update(run_info)
+    
+    rows = len(df_filtered)
+    with profiler.stage('summarize', rows=rows):
+        summary = summarize_data(df_filtered, mapping_dict, result.corrected_teams)
+    
+    voucher_lines, line_numbers = df_filtered, None
+    if aggregate:
+        with profiler.stage('aggregate', rows=rows) as record:
+            voucher_lines, line_numbers = aggregate_lines(df_filtered)
+            record['rows'] = len(voucher_lines)
+        result.aggregated_rows = rows
+    
+    with profiler.stage('build_voucher', rows=len(voucher_lines) + 1) as record:
+        # 차변/대변 라인, 전체 양식 컬럼, 관리항목을 한 번에 생성 (상수/빈 컬럼은 압축 보관, 저장 시 펼침)
+        vouchers, document_numbers = build_split_vouchers(voucher_lines, company_config, max_lines, document_number)
+        line_count = record['rows'] = sum(voucher.line_count for voucher in vouchers)
+    
+    result.debit_count = len(voucher_lines)
+    result.credit_count = len(vouchers)
+    result.document_numbers = document_numbers
+    
+    with profiler.stage('validate', rows=line_count):
+        accounts, projects = get_mapping_codes(mapping_dict)
+        report = validate_vouchers(vouchers, accounts | {company_config['payable_acct']}, projects)
+    result.validation = report
+    result.debit_total, result.credit_total = report.debit_total, report.credit_total  # 전표에서 실제로 합산한 금액
+    print("\n" + "\n".join(report.summary_lines()))
+    if not report.passed:
+        raise ValueError(f"전표 검증에서 문제 {len(report.issues)}건을 찾아 파일을 저장하지 않았습니다. "
+                         f"({report.issues[0].describe()})")
+    
+    if history_company:
+        with profiler.stage('history', rows=rows):
+            _save_history(history_company, input_file, company_config, df_filtered, result)
+    
+    drilldown = None
+    if line_numbers is not None:
+        drilldown = build_drilldown(df_filtered, line_numbers, document_numbers, [voucher.debit_count for voucher in vouchers])
+    
+    return vouchers, summary, drilldown
+
 
+def _save_history(company_name: str, input_file, company_config: Dict[str, Any], df_filtered: "pd.DataFrame",
+                  result: PipelineResult) -> None:
+    """
+    전처리 결과를 렌탈사/월 이력 저장소에 저장 (저장에 실패해도 경고만 출력하고 전표 생성은 계속)
+    
+    이력 월은 금액 필드명('10월렌탈료')으로 정하고, 입력/매핑 파일과 설정이 이미 저장된 달과 같으면 다시 쓰지 않는다.
+    """
+    import sqlite3
+    from processors.history_store import history_store, history_month
+    
+    month = history_month(result.amount_field)
     try:
-        # 데이터프레임을 리스트로 변환
-        headers = result_df.columns.tolist()
-        data = [headers]  # 헤더를 첫 번째 행으로 추가
-        
-        # 데이터프레임의 각 행을 리스트로 변환하여 data에 추가
-        for _, row in result_df.iterrows():
-            data.append(row.tolist())
-        
-        # OrderedDict 생성 (Sheet1이라는 이름의 시트에 데이터 저장)
-        data_dict = OrderedDict()
-        data_dict["Sheet1"] = data
+        saved = history_store.save(company_name, month, df_filtered, result.team_fields,
+                                   source_file=input_file if isinstance(input_file, str) else None,
+                                   source_digest=_result_cache_key(input_file, company_config))
+    except (sqlite3.Error, OSError) as e:
+        print(f"경고: 처리 이력을 저장하지 못했습니다: {e}")
+        return
+    result.history_month = month
+    print(f"처리 이력 저장: {company_name} {month}" + ("" if saved else " (이미 저장된 내용과 같음)"))
+
+
+# 전처리 결과에 영향을 주지 않는 설정 (출력 경로, 작성자 등) - 캐시 키에서 제외
+_CACHE_IGNORED_CONFIG_KEYS = {'input_file', 'mapping_file', 'erp_form_file', 'output_csv', 'output_excel', 'id_write'}
+
+
+def _result_cache_key(input_file, company_config: Dict[str, Any]) -> Optional[str]:
+    """
+    입력 파일 내용, 매핑 파일 내용, 전처리 관련 설정으로 결과 캐시 키 생성
+    
+    Returns:
+        캐시 키 (입력이 파일이 아니거나 파일을 읽을 수 없으면 None - 캐시 사용 안 함)
+    """
+    from utils.cache_utils import result_cache
+    
+    if not isinstance(input_file, str):
+        return None
+    params = {key: value for key, value in company_config.items() if key not in _CACHE_IGNORED_CONFIG_KEYS}
+    if company_config.get('mapping_backend') == 'sqlite':
+        # 매핑 DB는 같은 파일이라도 기준일(오늘)에 따라 적용되는 매핑이 다름
+        params['mapping_as_of'] = datetime.now().strftime('%Y-%m-%d')
+    try:
+        return result_cache.make_key([input_file, cfg.mapping_source(company_config)], params)
+    except OSError:
+        return None
+
+
+def _load_filtered_data(input_file: str, company_config: Dict[str, Any], mapping_dict: Dict[str, Dict[str, str]], chunksize: Optional[int],
+                        run_info: Optional[Dict[str, Any]] = None) -> "pd.DataFrame":
+    """
+    입력 파일을 로드하여 매핑된 행만 반환 (chunksize 지정 시 스트리밍 모드)
+    
+    전체 로드 시의 중간 데이터프레임은 여기서 버려지므로 이후 단계에서 메모리를 차지하지 않는다.
+    """
+    from processors.rental_processor import load_and_preprocess_data, load_and_preprocess_data_chunked
+    
+    if chunksize:
+        return load_and_preprocess_data_chunked(input_file, company_config, mapping_dict, chunksize, run_info)
+    
+    _, df_filtered = load_and_preprocess_data(input_file, company_config, mapping_dict, run_info)
+    return df_filtered
+
+
+@contextmanager
+def _profiling(profiler: "StageProfiler", result: PipelineResult, profile: bool, company_name: str) -> Iterator[None]:
+    """
+    실행이 끝나면(실패 포함) 단계별 시간을 result에 반영하고, profile이면 JSON 기록 저장
+    """
+    from utils.profile_utils import write_profile, format_profile
+    
+    error = None
+    try:
+        yield
+    except Exception as e:
+        error = str(e)
+        raise
+    finally:
+        record = profiler.finish()
+        result.timings = profiler.timings()
+        if profile:
+            record['error'] = error
+            record['output_path'] = result.output_path
+            result.profile = record
+            result.profile_path = write_profile(record, PROFILE_DIR, f'profile_{company_name}')
+            print("\n".join(format_profile(record)))
+            print(f"프로파일 저장: {result.profile_path}")
+
+
+def _output_context(verbose: bool):
+    """
+    verbose가 False면 현재 스레드의 print 출력을 버리는 컨텍스트
+    """
+    from utils.job_utils import capture_output
+    
+    return nullcontext() if verbose else capture_output(None)
+
+
+def run_batch_jobs(company_names: List[str], input_files: Optional[List[str]] = None, employee_number: str = '00616',
+                   chunksize: Optional[int] = None, max_workers: int = BATCH_MAX_WORKERS, profile: bool = False,
+                   use_cache: bool = True, aggregate: bool = False, max_lines: Optional[int] = None,
+                   save_history: bool = True) -> Dict[str, Any]:
+    """
+    여러 렌탈사/입력 파일을 프로세스 풀에서 병렬 처리하고 실행 목록(manifest) 저장
+    
+    Args:
+        company_names: 처리할 렌탈사 이름 목록
+        input_files: 렌탈사별로 처리할 입력 파일 목록 (없으면 각 렌탈사 설정의 입력 파일)
+        employee_number: 사원번호 (작성자)
+        chunksize: 지정 시 입력 CSV를 이 행 수 단위로 스트리밍 처리
+        max_workers: 동시에 처리할 최대 프로세스 수
+        profile: 작업별 프로파일 기록 여부
+        use_cache: 전처리 결과 디스크 캐시 사용 여부
+        aggregate: 차변 라인 집계 여부 (라인별 원본 행 내역 파일도 저장)
+        max_lines: 전표당 최대 라인 수 (넘으면 여러 전표로 나누어 저장)
+        save_history: 렌탈사/월 이력 저장 여부
         
-        # xls 파일로 저장
-        save_data(output_path, data_dict)
+    Returns:
+        실행 목록 (작업별 상태, 시간, 출력 파일, 로그 파일)
+    """
+    from utils.batch_utils import run_batch
+    
+    run_id = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+    log_dir = os.path.join(BATCH_DIR, run_id)
+    jobs = []
+    used_ids = set()
+    for company_name in company_names:
+        for input_file in (input_files or [None]):
+            base_id = f"{company_name}_{os.path.splitext(os.path.basename(input_file))[0]}" if input_file else company_name
+            # 다른 폴더의 같은 파일명이면 번호를 붙여 로그/출력 파일이 겹치지 않게 함 (data, data_2, ...)
+            job_id, number = base_id, 1
+            while job_id in used_ids:
+                number += 1
+                job_id = f"{base_id}_{number}"
+            used_ids.add(job_id)
+            jobs.append({
+                'job_id': job_id,
+                'company': company_name,
+                'input_file': input_file,
+                'employee_number': employee_number,
+                'chunksize': chunksize,
+                'profile': profile,
+                'use_cache': use_cache,
+                'aggregate': aggregate,
+                'max_lines': max_lines,
+                'save_history': save_history,
+                'log_file': os.path.join(log_dir, f'{job_id}.log'),
+            })
+    
+    return run_batch(jobs, _run_batch_job, max_workers, os.path.join(log_dir, 'manifest.json'))
+
+
+def _run_batch_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    배치 작업 하나 실행 (작업 프로세스에서 실행, 처리 과정 출력은 작업별 로그 파일에 저장)
+    """
+    from utils.job_utils import capture_output
+    
+    os.makedirs(os.path.dirname(job['log_file']), exist_ok=True)
+    with open(job['log_file'], 'w', encoding='utf-8') as log, capture_output(log):
+        try:
+            result = process_rental_company(job['company'], job['employee_number'], job['chunksize'],
+                                            profile=job['profile'], input_file=job['input_file'],
+                                            use_cache=job['use_cache'], aggregate=job['aggregate'],
+                                            max_lines=job['max_lines'], save_history=job['save_history'],
+                                            output_name=job['job_id'] if job['input_file'] else None)
+        except Exception:
+            traceback.print_exc(file=log)
+            raise
+    
+    if result is None:
+        raise ValueError(f"'{job['company']}' 렌탈사 설정을 찾을 수 없습니다.")
+    return {
+        'output_path': result.output_path,
+        'output_paths': result.output_paths,
+        'document_numbers': result.document_numbers,
+        'rows': result.debit_count,
+        'amount': result.debit_total,
+        'unmapped_teams': result.unmapped_teams,
+        'timings': result.timings,
+        'cache_hit': result.cache_hit,
+        'history_month': result.history_month,
+        'drilldown_path': result.drilldown_path,
+        'profile_path': result.profile_path,
+    }
+
+
+def preload_modules() -> None:
+    """
+    전처리/저장에 쓰는 무거운 모듈(pandas, xlwt 등)을 미리 import (웹 서버 시작 시 백그라운드 실행용)
+    """
+    for module_name in ('processors.rental_processor', 'generators.korea_rental_gen', 'utils.excel_utils', 'utils.template_utils'):
+        importlib.import_module(module_name)
+
+
+def dry_run(company_names: List[str], input_files: Optional[List[str]] = None, employee_number: str = '00616') -> int:
+    """
+    실제 처리 없이 설정과 파일 경로만 확인하여 실행 계획 출력 (pandas를 로드하지 않음)
+    
+    Args:
+        company_names: 처리할 렌탈사 이름 목록
+        input_files: 설정 대신 처리할 입력 파일 목록
+        employee_number: 사원번호
         
-        print(f"Excel 97-2003 형식(.xls)으로 파일 저장 완료: {output_path}")
-    except Exception as e:
-        print(f"Excel 97-2003 형식 저장 중 오류 발생: {e}")
-        # 오류 발생 시 기존 방식으로 저장
-        backup_path = output_path.replace('.xls', '.xlsx')
-        result_df.to_excel(backup_path, index=False, engine='openpyxl')
-        output_path = backup_path
-        print(f"대체 형식(.xlsx)으로 파일 저장 완료: {output_path}")
+    Returns:
+        문제(설정 없음, 필수 파일 없음) 개수
+    """
+    problems = 0
+    for company_name in company_names:
+        if company_name not in RENTAL_COMPANIES:
+            print(f"오류: '{company_name}' 렌탈사 설정을 찾을 수 없습니다.")
+            problems += 1
+            continue
+        for input_file in (input_files or [None]):
+            company_config = _company_config(company_name, employee_number, input_file)
+            print(f"[{company_name}]")
+            for label, key, required in [('입력 파일', 'input_file', True), ('매핑 파일', 'mapping_file', True),
+                                         ('ERP 양식', 'erp_form_file', False)]:
+                path = cfg.mapping_source(company_config) if key == 'mapping_file' else company_config[key]
+                if os.path.isfile(path):
+                    status = f"확인 ({os.path.getsize(path):,} bytes)"
+                elif required:
+                    status = "없음 (오류)"
+                    problems += 1
+                else:
+                    status = "없음 (양식 없이 진행)"
+                print(f"  {label}: {path} - {status}")
+            print(f"  출력 파일: {company_config['output_csv']}, {company_config['output_excel']}")
+    print(f"확인 완료: 문제 {problems}건" + (" - 실제 처리는 하지 않았습니다." if not problems else ""))
+    return problems
 
+
+def history_report(company_name: str, months: Optional[List[str]] = None) -> str:
+    """
+    렌탈사 처리 이력 조회 (months가 없으면 저장된 월 목록, [이전 월, 이후 월]이면 두 달 비교)
+    
+    두 달 비교는 구분(추가/삭제/변경)별 건수와 금액 차이를 출력하고 라인 목록을 CSV로 저장한다.
+    
+    Returns:
+        비교 결과 CSV 경로 (월 목록 조회면 빈 문자열)
+    """
+    from processors.history_store import history_store
+    
+    if not months:
+        listing = history_store.months(company_name)
+        if listing.empty:
+            print(f"'{company_name}' 처리 이력이 없습니다.")
+            return ""
+        print(f"'{company_name}' 처리 이력 {len(listing)}개월:")
+        for row in listing.itertuples(index=False):
+            print(f"- {row.month}: {row.row_count:,}행, 금액 {row.total_amount:,} (저장 {row.saved_at}, {row.source_file or '-'})")
+        return ""
+    
+    month_from, month_to = months
+    diff = history_store.diff(company_name, month_from, month_to)
+    counts = diff["구분"].value_counts()
+    print(f"'{company_name}' {month_from} → {month_to} 비교:")
+    for kind in ("추가", "삭제", "변경"):
+        print(f"- {kind}: {int(counts.get(kind, 0)):,}건")
+    amount_change = int(diff["금액(이후)"].fillna(0).sum() - diff["금액(이전)"].fillna(0).sum())
+    print(f"- 금액 증감: {amount_change:+,}")
+    
+    cfg.ensure_directories()
+    output_path = os.path.join(OUTPUT_DIR, f'이력비교_{company_name}_{month_from}_{month_to}.csv')
+    diff.to_csv(output_path, index=False, encoding=cfg.CSV_OUTPUT_ENCODING)
+    print(f"비교 결과 저장: {output_path}")
     return output_path
 
 
@@ -137,20 +543,64 @@ def main():
     메인 실행 함수 (CLI 실행)
     """
     parser = argparse.ArgumentParser(description='ERP 자동 전표 생성 프로그램')
+    parser.add_argument('--version', action='version', version=f'%(prog)s {APP_VERSION}')
     parser.add_argument('-c', '--company', type=str, help='처리할 렌탈사 이름')
     parser.add_argument('-a', '--all', action='store_true', help='모든 렌탈사 처리')
     parser.add_argument('-e', '--employee', type=str, default='00616', help='사원번호 (기본값: 00616)')
+    parser.add_argument('--chunksize', type=int, default=None,
+                        help=f'대용량 파일 스트리밍 처리 시 청크 행 수 (예: {CSV_CHUNK_SIZE})')
+    parser.add_argument('--profile', action='store_true',
+                        help='단계별 시간/CPU/메모리/행 수를 측정하여 JSON으로 저장')
+    parser.add_argument('-i', '--input', type=str, nargs='+', default=None,
+                        help='설정 대신 처리할 입력 파일 (여러 개 지정 시 배치 처리, 예: 여러 달 파일)')
+    parser.add_argument('-w', '--workers', type=int, default=BATCH_MAX_WORKERS,
+                        help=f'배치 처리 시 동시에 실행할 프로세스 수 (기본값: {BATCH_MAX_WORKERS})')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='이전 전처리 결과(디스크 캐시)를 재사용하지 않고 입력 파일을 다시 처리')
+    parser.add_argument('--aggregate', action='store_true',
+                        help='계정/프로젝트/적요가 같은 차변 행을 한 라인으로 집계 (라인별 원본 행 내역 파일 함께 저장)')
+    parser.add_argument('--max-lines', type=int, default=None,
+                        help='전표당 최대 라인 수 (대변 포함, 넘으면 전표번호 뒤에 -1, -2 ...를 붙인 여러 전표 파일로 나누어 저장)')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='처리하지 않고 설정과 입력/매핑/양식 파일 경로만 확인')
+    parser.add_argument('--no-history', action='store_true',
+                        help='전처리 결과를 렌탈사/월 이력 저장소에 저장하지 않음')
+    parser.add_argument('--history-list', action='store_true',
+                        help='처리하지 않고 렌탈사의 저장된 이력 월 목록만 출력')
+    parser.add_argument('--history-diff', type=str, nargs=2, metavar=('FROM', 'TO'), default=None,
+                        help='처리하지 않고 저장된 두 달(YYYY-MM) 이력을 비교하여 추가/삭제/변경 라인을 CSV로 저장')
     
     args = parser.parse_args()
     
-    if args.all:
-        for company_name in RENTAL_COMPANIES.keys():
-            process_rental_company(company_name)
-            print('-' * 80)
-    elif args.company:
-        process_rental_company(args.company)
+    company_names = list(RENTAL_COMPANIES.keys()) if args.all else [args.company or '한국렌탈']
+    
+    if args.dry_run:
+        if dry_run(company_names, args.input, args.employee):
+            raise SystemExit(1)
+        return
+    
+    if args.history_list or args.history_diff:
+        for company_name in company_names:
+            try:
+                history_report(company_name, args.history_diff)
+            except ValueError as e:
+                print(f"오류: {e}")
+                raise SystemExit(1)
+        return
+    
+    # 렌탈사 여러 곳 또는 입력 파일 여러 개는 배치로 병렬 처리
+    if len(company_names) > 1 or (args.input and len(args.input) > 1):
+        manifest = run_batch_jobs(company_names, args.input, args.employee, args.chunksize, args.workers, args.profile,
+                                  use_cache=not args.no_cache, aggregate=args.aggregate, max_lines=args.max_lines,
+                                  save_history=not args.no_history)
+        print(f"실행 목록 저장: {manifest['manifest_path']}")
+        if manifest['failed']:
+            raise SystemExit(1)
     else:
-        process_rental_company('한국렌탈')
+        process_rental_company(company_names[0], args.employee, args.chunksize, profile=args.profile,
+                               input_file=args.input[0] if args.input else None, use_cache=not args.no_cache,
+                               aggregate=args.aggregate, max_lines=args.max_lines, save_history=not args.no_history,
+                               split_workers=cfg.VOUCHER_SPLIT_WORKERS)
 
 
 if __name__ == "__main__":
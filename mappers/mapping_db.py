@@ -0,0 +1,317 @@
+"""
+SQLite 기반 팀명 매핑 저장소 (렌탈사별, 적용 시작일이 있는 버전 관리)
+
+매핑 JSON을 가져올 때마다 바뀐 항목만 새 버전으로 추가하고 이전 버전은 적용 종료일을 기록해 남긴다.
+특정 날짜 기준 매핑, 팀명별 변경 이력, 프로젝트 코드별 팀명을 인덱스로 조회하고,
+팀명 여러 개는 쿼리 한 번으로 조회한다. 파이프라인에서는 load_store 결과(MappingStore)를 그대로 쓴다.
+
+실행: python -m mappers.mapping_db import 한국렌탈 mapping/team_name_mapping.json [--date 2026-10-01]
+      python -m mappers.mapping_db export 한국렌탈 output/매핑_한국렌탈.json [--date 2026-10-01]
+      python -m mappers.mapping_db history 한국렌탈 [팀명]
+"""
+import argparse
+import json
+import os
+import re
+import sqlite3
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from core import config as cfg
+from mappers.mapping_store import MAPPING_FIELDS, MappingStore
+
+# 저장소 형식이 바뀌면 올림 (다른 버전의 저장소는 열지 않음 - 매핑 이력은 다시 만들 수 없으므로 삭제하지 않음)
+MAPPING_DB_FORMAT_VERSION = 1
+
+# 버전마다 보관하는 매핑 JSON 필드 (past 제외, 이 중 하나라도 바뀌면 새 버전)
+VALUE_FIELDS = MAPPING_FIELDS + ["name"]
+
+# 매핑 JSON으로 내보낼 때의 필드 순서 (기존 매핑 파일과 같은 순서)
+EXPORT_FIELDS = ["CD_ACCT", "past", "present", "CD_PJT", "name"]
+
+DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+
+class MappingRepository:
+    """
+    렌탈사별 팀명 매핑 버전 저장소 (SQLite 파일 하나, 처음 사용할 때 생성)
+
+    한 항목(렌탈사, 팀명)의 버전은 적용 기간 [valid_from, valid_to)가 겹치지 않으며,
+    현재 버전은 valid_to가 NULL이다. seq는 팀명이 처음 추가된 순서로 버전이 바뀌어도 유지되며,
+    매핑을 읽거나 내보낼 때 이 순서를 쓴다 (가져온 JSON의 항목 순서 유지). 값 컬럼은 자료형을 지정하지 않아 JSON 자료형(CD_PJT 정수,
+    CD_ACCT 문자열 등)을 그대로 보관한다.
+    """
+
+    def __init__(self, db_path: str = cfg.MAPPING_DB_PATH, timeout: float = cfg.SQLITE_TIMEOUT_SEC):
+        self.db_path = db_path
+        self.timeout = timeout
+
+    @contextmanager
+    def _open(self) -> Iterator[sqlite3.Connection]:
+        """
+        연결을 열고 끝나면 커밋(오류 시 롤백) 후 닫음
+        """
+        connection = self._connect()
+        try:
+            yield connection
+            connection.commit()
+        except BaseException:
+            connection.rollback()
+            raise
+        finally:
+            connection.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        # 기본 저널 모드 유지: 커밋하면 DB 파일 자체가 바뀌므로 파일 수정시각 기준 캐시(file_cache)가 바로 알아챔
+        connection = sqlite3.connect(self.db_path, timeout=self.timeout)
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, MAPPING_DB_FORMAT_VERSION):
+            connection.close()
+            raise ValueError(f"매핑 DB 형식 버전({version})이 프로그램({MAPPING_DB_FORMAT_VERSION})과 다릅니다: {self.db_path}")
+        connection.executescript(f"""
+            CREATE TABLE IF NOT EXISTS mappings (
+                id INTEGER PRIMARY KEY,
+                vendor TEXT NOT NULL,
+                past TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                present, CD_ACCT, CD_PJT, name,
+                valid_from TEXT NOT NULL,
+                valid_to TEXT,
+                source TEXT,
+                imported_at TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_mappings_past ON mappings (vendor, past, valid_from);
+            CREATE INDEX IF NOT EXISTS idx_mappings_project ON mappings (vendor, CD_PJT);
+            PRAGMA user_version = {MAPPING_DB_FORMAT_VERSION};
+        """)
+        return connection
+
+    def import_records(self, vendor: str, records: Iterable[Dict[str, Any]], effective_date: Optional[str] = None,
+                       source: Optional[str] = None) -> Dict[str, int]:
+        """
+        매핑 항목 목록을 effective_date부터 적용되는 현재 매핑으로 반영
+
+        - 새 팀명: 새 버전 추가
+        - 값이 바뀐 팀명: 현재 버전을 effective_date로 종료하고 새 버전 추가
+        - 목록에 없는 팀명: 현재 버전을 effective_date로 종료
+        같은 팀명이 여러 번 있으면 마지막 항목을 쓴다 (MappingStore.from_records와 동일).
+        JSON의 NaN 값은 빈 값(NULL)으로 저장한다.
+
+        Args:
+            vendor: 렌탈사 이름
+            records: 매핑 JSON 항목 목록 ({past, present, CD_ACCT, CD_PJT, name})
+            effective_date: 적용 시작일 (YYYY-MM-DD, 기본값: 오늘) - 현재 버전의 시작일보다 빠를 수 없음
+            source: 가져온 파일 경로 (안내용)
+
+        Returns:
+            {added, changed, removed, unchanged} 건수
+        """
+        effective_date = _check_date(effective_date or date.today().isoformat())
+        latest = {}
+        for item in records:
+            latest[item['past']] = tuple(_plain(item.get(field)) for field in VALUE_FIELDS)
+
+        counts = {"added": 0, "changed": 0, "removed": 0, "unchanged": 0}
+        with self._open() as connection:
+            current = {row[1]: row for row in connection.execute(
+                f"SELECT id, past, {_names(VALUE_FIELDS)}, valid_from FROM mappings WHERE vendor = ? AND valid_to IS NULL",
+                (vendor,))}
+            last_start = max((row[-1] for row in current.values()), default=None)
+            if last_start is not None and effective_date < last_start:
+                raise ValueError(f"적용 시작일({effective_date})이 현재 매핑의 적용 시작일({last_start})보다 빠릅니다. "
+                                 f"'{vendor}' 매핑은 {last_start} 이후 날짜로 가져와주세요.")
+
+            # 팀명별 순서 (종료되었다가 다시 추가된 팀명도 원래 순서 유지)
+            seqs = dict(connection.execute("SELECT past, MIN(seq) FROM mappings WHERE vendor = ? GROUP BY past", (vendor,)))
+            next_seq = max(seqs.values(), default=0) + 1
+            closing, inserting = [], []
+            imported_at = datetime.now().isoformat(timespec='seconds')
+            for past, values in latest.items():
+                row = current.pop(past, None)
+                if row is None:
+                    counts["added"] += 1
+                elif tuple(row[2:-1]) == values:
+                    counts["unchanged"] += 1
+                    continue
+                else:
+                    counts["changed"] += 1
+                    closing.append(row[0])
+                if past not in seqs:
+                    seqs[past], next_seq = next_seq, next_seq + 1
+                inserting.append((vendor, past, seqs[past], *values, effective_date, source, imported_at))
+            counts["removed"] = len(current)
+            closing.extend(row[0] for row in current.values())
+
+            connection.executemany("UPDATE mappings SET valid_to = ? WHERE id = ?", ((effective_date, row_id) for row_id in closing))
+            connection.executemany(
+                f"INSERT INTO mappings (vendor, past, seq, {_names(VALUE_FIELDS)}, valid_from, source, imported_at) "
+                f"VALUES ({', '.join('?' * (len(VALUE_FIELDS) + 6))})",
+                inserting)
+        return counts
+
+    def import_json(self, vendor: str, mapping_file: str, effective_date: Optional[str] = None) -> Dict[str, int]:
+        """
+        매핑 JSON 파일 가져오기 (import_records 참고)
+        """
+        with open(mapping_file, 'r', encoding='utf-8') as f:
+            records = json.load(f)
+        return self.import_records(vendor, records, effective_date, source=os.path.abspath(mapping_file))
+
+    def export_json(self, vendor: str, output_path: str, as_of: Optional[str] = None) -> int:
+        """
+        as_of 기준 매핑을 기존 매핑 JSON 형식으로 저장 (빈 값은 null)
+
+        Returns:
+            저장한 항목 수
+        """
+        frame = self._valid_rows(vendor, as_of, ["past", *VALUE_FIELDS])
+        records = [dict(zip(EXPORT_FIELDS, map(_plain, row))) for row in frame[EXPORT_FIELDS].itertuples(index=False)]
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(records, f, ensure_ascii=False, indent=2)
+        return len(records)
+
+    def load_store(self, vendor: str, as_of: Optional[str] = None) -> MappingStore:
+        """
+        as_of(기본값: 오늘) 기준 매핑 저장소 (load_mapping_file 결과와 같은 형식)
+        """
+        frame = self._valid_rows(vendor, as_of, ["past", *MAPPING_FIELDS])
+        return MappingStore(frame["past"].to_numpy(dtype=object),
+                            {field: frame[field].to_numpy(dtype=object) for field in MAPPING_FIELDS})
+
+    def lookup(self, vendor: str, team_names: Iterable[Any], as_of: Optional[str] = None) -> pd.DataFrame:
+        """
+        팀명 여러 개를 쿼리 한 번으로 조회 (고유 팀명만 임시 테이블에 넣고 팀명 인덱스로 조인)
+
+        Returns:
+            index=매핑에 있는 팀명, columns=[present, CD_ACCT, CD_PJT] (없는 팀명은 빠짐)
+        """
+        as_of = _check_date(as_of or date.today().isoformat())
+        names = [name for name in pd.unique(np.asarray(list(team_names), dtype=object)) if isinstance(name, str)]
+        with self._open() as connection:
+            connection.execute("CREATE TEMP TABLE lookup_names (past TEXT PRIMARY KEY)")
+            connection.executemany("INSERT INTO lookup_names VALUES (?)", ((name,) for name in names))
+            rows = connection.execute(
+                f"SELECT m.past, {_names(MAPPING_FIELDS, 'm')} FROM lookup_names n "
+                "JOIN mappings m ON m.vendor = ? AND m.past = n.past AND m.valid_from <= ? "
+                "AND (m.valid_to IS NULL OR m.valid_to > ?)",
+                (vendor, as_of, as_of)).fetchall()
+        return pd.DataFrame(rows, columns=["past", *MAPPING_FIELDS], dtype=object).set_index("past")
+
+    def teams_for_project(self, vendor: str, project_code: Any, as_of: Optional[str] = None) -> pd.DataFrame:
+        """
+        프로젝트 코드(CD_PJT)에 연결된 as_of 기준 팀명 목록
+
+        Returns:
+            columns=[past, present, CD_ACCT, CD_PJT, valid_from]
+        """
+        as_of = _check_date(as_of or date.today().isoformat())
+        with self._open() as connection:
+            return pd.read_sql_query(
+                f"SELECT past, {_names(MAPPING_FIELDS)}, valid_from FROM mappings WHERE vendor = ? AND CD_PJT = ? "
+                "AND valid_from <= ? AND (valid_to IS NULL OR valid_to > ?) ORDER BY past",
+                connection, params=(vendor, project_code, as_of, as_of))
+
+    def history(self, vendor: str, team_name: Optional[str] = None) -> pd.DataFrame:
+        """
+        매핑 변경 이력 (team_name이 없으면 렌탈사 전체, 팀명/적용 시작일 순서)
+
+        Returns:
+            columns=[past, present, CD_ACCT, CD_PJT, name, valid_from, valid_to, source, imported_at]
+        """
+        condition, params = ("AND past = ?", (vendor, team_name)) if team_name is not None else ("", (vendor,))
+        with self._open() as connection:
+            return pd.read_sql_query(
+                f"SELECT past, {_names(VALUE_FIELDS)}, valid_from, valid_to, source, imported_at FROM mappings "
+                f"WHERE vendor = ? {condition} ORDER BY past, valid_from, id",
+                connection, params=params)
+
+    def vendors(self) -> List[str]:
+        """
+        매핑이 있는 렌탈사 목록
+        """
+        with self._open() as connection:
+            return [row[0] for row in connection.execute("SELECT DISTINCT vendor FROM mappings ORDER BY vendor")]
+
+    def _valid_rows(self, vendor: str, as_of: Optional[str], columns: List[str]) -> pd.DataFrame:
+        as_of = _check_date(as_of or date.today().isoformat())
+        with self._open() as connection:
+            rows = connection.execute(
+                f"SELECT {_names(columns)} FROM mappings WHERE vendor = ? AND valid_from <= ? "
+                "AND (valid_to IS NULL OR valid_to > ?) ORDER BY seq",
+                (vendor, as_of, as_of)).fetchall()
+        # 저장된 파이썬 값(정수/문자열/None)을 그대로 유지 (read_sql_query는 결측값이 있으면 정수를 실수로 바꿈)
+        return pd.DataFrame(rows, columns=columns, dtype=object)
+
+
+def load_mapping_db(db_path: str, vendor: str, as_of: Optional[str] = None) -> MappingStore:
+    """
+    매핑 DB에서 렌탈사의 as_of 기준 매핑 저장소 로드 (렌탈사 매핑이 없으면 ValueError)
+    """
+    if not os.path.isfile(db_path):
+        raise ValueError(f"매핑 DB 파일이 없습니다. 먼저 매핑 JSON을 가져와주세요: {db_path}")
+    store = MappingRepository(db_path).load_store(vendor, as_of)
+    if not len(store):
+        raise ValueError(f"매핑 DB에 '{vendor}' 매핑이 없습니다. 먼저 매핑 JSON을 가져와주세요: {db_path}")
+    return store
+
+
+def _names(columns: Iterable[str], alias: Optional[str] = None) -> str:
+    prefix = f"{alias}." if alias else ""
+    return ", ".join(f'{prefix}"{col}"' for col in columns)
+
+
+def _plain(value: Any) -> Any:
+    """numpy 스칼라를 JSON으로 저장할 수 있는 파이썬 값으로 변환 (결측값은 None)"""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _check_date(value: str) -> str:
+    if not DATE_PATTERN.match(value or ""):
+        raise ValueError(f"날짜는 YYYY-MM-DD 형식으로 입력해주세요: {value}")
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description='팀명 매핑 DB 관리 (가져오기/내보내기/변경 이력)')
+    parser.add_argument('--db', type=str, default=cfg.MAPPING_DB_PATH, help=f'매핑 DB 경로 (기본값: {cfg.MAPPING_DB_PATH})')
+    commands = parser.add_subparsers(dest='command', required=True)
+    import_parser = commands.add_parser('import', help='매핑 JSON을 새 버전으로 가져오기')
+    import_parser.add_argument('vendor')
+    import_parser.add_argument('mapping_file')
+    import_parser.add_argument('--date', type=str, default=None, help='적용 시작일 (YYYY-MM-DD, 기본값: 오늘)')
+    export_parser = commands.add_parser('export', help='기준일 매핑을 매핑 JSON으로 저장')
+    export_parser.add_argument('vendor')
+    export_parser.add_argument('output_file')
+    export_parser.add_argument('--date', type=str, default=None, help='기준일 (YYYY-MM-DD, 기본값: 오늘)')
+    history_parser = commands.add_parser('history', help='매핑 변경 이력 출력')
+    history_parser.add_argument('vendor')
+    history_parser.add_argument('team', nargs='?', default=None)
+    args = parser.parse_args()
+
+    repository = MappingRepository(args.db)
+    try:
+        if args.command == 'import':
+            counts = repository.import_json(args.vendor, args.mapping_file, args.date)
+            print(f"'{args.vendor}' 매핑 가져오기 완료: 추가 {counts['added']}개, 변경 {counts['changed']}개, "
+                  f"종료 {counts['removed']}개, 유지 {counts['unchanged']}개")
+        elif args.command == 'export':
+            count = repository.export_json(args.vendor, args.output_file, args.date)
+            print(f"'{args.vendor}' 매핑 {count}개 항목 저장: {args.output_file}")
+        else:
+            history = repository.history(args.vendor, args.team)
+            print(history.to_string(index=False) if len(history) else f"'{args.vendor}' 매핑 이력이 없습니다.")
+    except (ValueError, OSError) as e:
+        print(f"오류: {e}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
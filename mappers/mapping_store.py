@@ -0,0 +1,198 @@
+"""
+컴파일된 팀명 매핑 저장소 (JSON을 한 번 변환해 두고 빠르게 로드)
+"""
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core import config as cfg
+from mappers.team_matcher import TeamNameMatcher
+
+# 매핑 결과 필드 (조회 테이블 컬럼 순서)
+MAPPING_FIELDS = ["present", "CD_ACCT", "CD_PJT"]
+
+# 컴파일 형식이 바뀌면 올려서 이전 컴파일 파일을 다시 만들게 함
+COMPILED_FORMAT_VERSION = 1
+
+
+class MappingStore(Mapping):
+    """
+    팀명(past)별 매핑 정보를 필드별 배열로 보관하는 읽기 전용 매핑
+
+    기존 매핑 딕셔너리({팀명: {present, CD_ACCT, CD_PJT}})처럼 조회/반복할 수 있고,
+    resolve_mapping에 쓰는 조회 테이블(table), 팀명 인덱스(index), 팀명 보정용 매처(matcher)는
+    처음 사용할 때 한 번만 만든다.
+    필드 값은 JSON의 자료형을 그대로 유지한다 (예: CD_PJT는 정수).
+    """
+
+    def __init__(self, past: np.ndarray, fields: Dict[str, np.ndarray]):
+        """
+        Args:
+            past: 원본 팀명 배열 (중복 없음)
+            fields: 필드명: past와 같은 길이의 값 배열
+        """
+        self.past = past
+        self.fields = fields
+        self._index: Optional[pd.Index] = None
+        self._table: Optional[pd.DataFrame] = None
+        self._matcher: Optional[TeamNameMatcher] = None
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]]) -> "MappingStore":
+        """
+        매핑 JSON 항목 목록으로 생성 (같은 팀명이 여러 번 있으면 마지막 항목 사용)
+        """
+        latest = {}
+        for item in records:
+            latest[item['past']] = item
+        past = np.empty(len(latest), dtype=object)
+        past[:] = list(latest.keys())
+        fields = {}
+        for field in MAPPING_FIELDS:
+            values = np.empty(len(latest), dtype=object)
+            values[:] = [item[field] for item in latest.values()]
+            fields[field] = values
+        return cls(past, fields)
+
+    @property
+    def index(self) -> pd.Index:
+        """팀명 인덱스 (조회용 해시 테이블은 pandas가 처음 조회할 때 생성)"""
+        if self._index is None:
+            self._index = pd.Index(self.past, dtype=object)
+        return self._index
+
+    @property
+    def table(self) -> pd.DataFrame:
+        """조회 테이블: index=원본 팀명, columns=[present, CD_ACCT, CD_PJT] (공유 객체이므로 수정하지 않음)"""
+        if self._table is None:
+            self._table = pd.DataFrame({field: self.fields[field] for field in MAPPING_FIELDS}, index=self.index, columns=MAPPING_FIELDS)
+        return self._table
+
+    @property
+    def matcher(self) -> TeamNameMatcher:
+        """표기 차이 보정/유사 팀명 후보 검색용 매처 (위치는 table 행 순서 기준)"""
+        if self._matcher is None:
+            self._matcher = TeamNameMatcher(self.past)
+        return self._matcher
+
+    def lookup(self, team_names: np.ndarray) -> np.ndarray:
+        """
+        팀명 배열의 매핑 위치를 한 번에 조회
+
+        Returns:
+            팀명별 위치 배열 (매핑에 없으면 -1)
+        """
+        return self.index.get_indexer(team_names)
+
+    def __getitem__(self, team_name: Any) -> Dict[str, Any]:
+        try:
+            position = self.index.get_loc(team_name)
+        except (KeyError, TypeError):
+            raise KeyError(team_name)
+        return {field: self.fields[field][position] for field in MAPPING_FIELDS}
+
+    def __contains__(self, team_name: Any) -> bool:
+        try:
+            return team_name in self.index
+        except TypeError:
+            return False
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.past)
+
+    def __len__(self) -> int:
+        return len(self.past)
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """
+        기존 형식의 매핑 딕셔너리로 변환
+        """
+        return {team: self[team] for team in self.past}
+
+
+def _source_signature(mapping_file: str) -> Tuple[int, int]:
+    stat = os.stat(mapping_file)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def compiled_path(mapping_file: str, compiled_dir: str = cfg.MAPPING_COMPILED_DIR) -> str:
+    """
+    매핑 JSON에 대응하는 컴파일 파일 경로 (같은 이름의 다른 폴더 파일과 겹치지 않도록 경로 해시 사용)
+    """
+    abs_path = os.path.abspath(mapping_file)
+    stem = os.path.splitext(os.path.basename(abs_path))[0]
+    path_hash = hashlib.sha1(abs_path.encode('utf-8')).hexdigest()[:12]
+    return os.path.join(compiled_dir, f"{stem}_{path_hash}.pkl")
+
+
+def compile_mapping(mapping_file: str, compiled_dir: str = cfg.MAPPING_COMPILED_DIR) -> MappingStore:
+    """
+    매핑 JSON을 파싱하여 컴파일 파일로 저장 (저장에 실패해도 파싱 결과는 반환)
+
+    Args:
+        mapping_file: 매핑 JSON 파일 경로
+        compiled_dir: 컴파일 파일 저장 폴더
+
+    Returns:
+        매핑 저장소
+    """
+    signature = _source_signature(mapping_file)
+    with open(mapping_file, 'r', encoding='utf-8') as f:
+        store = MappingStore.from_records(json.load(f))
+
+    payload = {
+        'version': COMPILED_FORMAT_VERSION,
+        'source': os.path.abspath(mapping_file),
+        'signature': signature,
+        'past': store.past,
+        'fields': store.fields,
+    }
+    try:
+        os.makedirs(compiled_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix='.tmp_', dir=compiled_dir)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, compiled_path(mapping_file, compiled_dir))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        print(f"매핑 파일을 컴파일했습니다: {len(store)}개 항목")
+    except Exception as e:
+        print(f"매핑 컴파일 파일 저장 실패 (JSON 파싱 결과로 진행): {e}")
+    return store
+
+
+def load_mapping_store(mapping_file: str, compiled_dir: str = cfg.MAPPING_COMPILED_DIR) -> MappingStore:
+    """
+    컴파일된 매핑 로드 (없거나 JSON이 바뀌었으면 다시 컴파일, 오류 시 예외 발생)
+
+    JSON 파일의 수정시각과 크기가 컴파일할 때와 같으면 JSON을 파싱하지 않고
+    필드별 배열만 읽는다.
+
+    Args:
+        mapping_file: 매핑 JSON 파일 경로
+        compiled_dir: 컴파일 파일 저장 폴더
+
+    Returns:
+        매핑 저장소
+    """
+    signature = _source_signature(mapping_file)
+    try:
+        with open(compiled_path(mapping_file, compiled_dir), 'rb') as f:
+            payload = pickle.load(f)
+        if payload.get('version') == COMPILED_FORMAT_VERSION and tuple(payload.get('signature', ())) == signature:
+            return MappingStore(payload['past'], payload['fields'])
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"매핑 컴파일 파일을 읽지 못해 다시 컴파일합니다: {e}")
+    return compile_mapping(mapping_file, compiled_dir)
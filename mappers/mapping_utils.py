@@ -1,33 +1,37 @@
 """
 팀명 매핑 관련 유틸리티 모듈
 """
-import json
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Any
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Set, Tuple
+from mappers.mapping_store import MAPPING_FIELDS, MappingStore, load_mapping_store
+from mappers.team_matcher import TeamNameMatcher
+from core import config as cfg
+from utils.cache_utils import file_cache
 
 
-def load_mapping_file(mapping_file: str) -> Dict[str, Dict[str, str]]:
+def load_mapping_file(mapping_file: str, use_cache: bool = True) -> MappingStore:
     """
-    매핑 파일을 로드하여 딕셔너리 형태로 반환
+    매핑 파일을 로드하여 딕셔너리처럼 조회할 수 있는 매핑 저장소로 반환
+    
+    JSON은 처음 한 번(또는 바뀌었을 때만) 파싱하여 컴파일 파일로 저장하고, 이후에는 컴파일 파일을 읽는다.
+    같은 프로세스에서는 파일이 바뀌지 않는 한 캐시된 저장소를 재사용한다.
+    반환된 저장소는 공유 객체이므로 수정하지 않는다.
     
     Args:
         mapping_file: 매핑 파일 경로
+        use_cache: 프로세스 공용 캐시 사용 여부
         
     Returns:
-        매핑 딕셔너리: {팀명: {present: 현재팀명, CD_ACCT: 계정코드, CD_PJT: 프로젝트코드}}
+        매핑 저장소: {팀명: {present: 현재팀명, CD_ACCT: 계정코드, CD_PJT: 프로젝트코드}} 형태로 조회 가능
+        (로드 실패 시 빈 딕셔너리)
     """
     try:
-        with open(mapping_file, 'r', encoding='utf-8') as f:
-            mapping_list = json.load(f)
-        
-        # 매핑 딕셔너리 생성
-        mapping_dict = {}
-        for item in mapping_list:
-            mapping_dict[item['past']] = {
-                'present': item['present'],
-                'CD_ACCT': item['CD_ACCT'],
-                'CD_PJT': item['CD_PJT']
-            }
+        if use_cache:
+            mapping_dict = file_cache.get(mapping_file, load_mapping_store, namespace='mapping')
+        else:
+            mapping_dict = load_mapping_store(mapping_file)
         
         print(f"매핑 정보 로드 완료: {len(mapping_dict)}개 항목")
         return mapping_dict
@@ -37,6 +41,38 @@ def load_mapping_file(mapping_file: str) -> Dict[str, Dict[str, str]]:
         return {}
 
 
+def load_company_mapping(company_config: Dict[str, Any], as_of: Optional[str] = None) -> MappingStore:
+    """
+    렌탈사 설정의 매핑 원본(mapping_backend)에서 매핑 저장소 로드
+    
+    'sqlite'이면 매핑 DB에서 mapping_vendor의 as_of(기본값: 오늘) 기준 매핑을, 아니면 매핑 JSON을 읽는다.
+    매핑 DB도 파일이 바뀌지 않는 한 같은 프로세스에서는 캐시된 저장소를 재사용한다.
+    
+    Args:
+        company_config: 렌탈사 설정 정보
+        as_of: 매핑 DB 기준일 (YYYY-MM-DD)
+        
+    Returns:
+        매핑 저장소 (로드 실패 시 빈 딕셔너리)
+    """
+    if company_config.get('mapping_backend') != 'sqlite':
+        return load_mapping_file(company_config['mapping_file'])
+    
+    from mappers.mapping_db import load_mapping_db
+    
+    vendor = company_config['mapping_vendor']
+    as_of = as_of or datetime.now().strftime('%Y-%m-%d')
+    try:
+        mapping_dict = file_cache.get(cfg.MAPPING_DB_PATH, lambda path: load_mapping_db(path, vendor, as_of),
+                                      namespace=f'mapping_db:{vendor}:{as_of}')
+        print(f"매핑 정보 로드 완료 (매핑 DB {as_of} 기준): {len(mapping_dict)}개 항목")
+        return mapping_dict
+    
+    except Exception as e:
+        print(f"매핑 DB 로드 중 오류 발생: {e}")
+        return {}
+
+
 def apply_mapping(team_name: str, mapping_dict: Dict[str, Dict[str, str]]) -> Dict[str, str]:
     """
     팀명에 매핑 정보 적용
@@ -58,6 +94,103 @@ def apply_mapping(team_name: str, mapping_dict: Dict[str, Dict[str, str]]) -> Di
     return {"present": team_name, "CD_ACCT": "", "CD_PJT": ""}
 
 
+def build_mapping_table(mapping_dict: Dict[str, Dict[str, str]]) -> pd.DataFrame:
+    """
+    매핑 딕셔너리를 팀명(past) 인덱스의 컬럼형 조회 테이블로 변환
+    
+    Args:
+        mapping_dict: 매핑 딕셔너리
+        
+    Returns:
+        조회 테이블: index=원본 팀명, columns=[present, CD_ACCT, CD_PJT]
+        (매핑 저장소면 저장소가 보관하는 공유 테이블)
+    """
+    if isinstance(mapping_dict, MappingStore):
+        return mapping_dict.table
+    rows = [[info.get(field, "") for field in MAPPING_FIELDS] for info in mapping_dict.values()]
+    table = pd.DataFrame(rows, index=pd.Index(list(mapping_dict.keys()), dtype=object), columns=MAPPING_FIELDS, dtype=object)
+    return table
+
+
+def get_mapping_codes(mapping_dict: Dict[str, Dict[str, str]]) -> Tuple[Set[str], Set[int]]:
+    """
+    매핑에 등록된 계정 코드와 프로젝트 코드 집합 (전표 검증용)
+
+    Args:
+        mapping_dict: 매핑 딕셔너리
+
+    Returns:
+        (계정 코드 문자열 집합, 프로젝트 코드 정수 집합) - 빈 값과 숫자가 아닌 프로젝트 코드는 제외
+    """
+    table = build_mapping_table(mapping_dict)
+    accounts = {str(code) for code in pd.unique(table["CD_ACCT"].to_numpy(dtype=object)) if not pd.isna(code) and str(code).strip()}
+    projects = pd.to_numeric(pd.Series(pd.unique(table["CD_PJT"].to_numpy(dtype=object))), errors='coerce').dropna()
+    return accounts, set(projects.astype("int64").tolist())
+
+
+def get_team_matcher(mapping_dict: Dict[str, Dict[str, str]]) -> TeamNameMatcher:
+    """
+    매핑 팀명 보정/후보 검색용 매처 반환 (위치는 build_mapping_table 결과의 행 순서 기준)
+    
+    매핑 저장소면 저장소가 보관하는 공유 매처를 반환하고, 일반 딕셔너리면 새로 만든다.
+    """
+    if isinstance(mapping_dict, MappingStore):
+        return mapping_dict.matcher
+    return TeamNameMatcher(list(mapping_dict.keys()))
+
+
+def resolve_mapping(team_names: pd.Series, mapping_table: pd.DataFrame, matcher: Optional[TeamNameMatcher] = None,
+                    corrections: Optional[Dict[Any, str]] = None) -> pd.DataFrame:
+    """
+    팀명 컬럼 전체에 매핑 정보를 한 번에 적용 (apply_mapping의 벡터화 버전)
+    
+    팀명을 범주 코드로 변환한 뒤 고유 팀명만 조회 테이블에서 찾고,
+    그 결과를 코드로 펼쳐서 세 컬럼을 동시에 만든다. 빈 팀명은 모두 빈 값,
+    매핑에 없는 팀명은 present에 원본 팀명을 유지한다 (apply_mapping과 동일).
+    matcher를 주면 매핑에 없는 팀명 중 표기 차이(공백, 전각 문자, '㈜' 등)만 있는 것은
+    해당 매핑 팀명으로 보정하여 매핑한다.
+    
+    Args:
+        team_names: 원본 팀명 시리즈
+        mapping_table: build_mapping_table로 만든 조회 테이블
+        matcher: 표기 차이 보정용 매처 (선택, get_team_matcher 결과)
+        corrections: 보정 내역을 기록할 딕셔너리 (선택, {원본 팀명: 매핑 팀명}이 채워짐)
+        
+    Returns:
+        team_names와 같은 인덱스의 데이터프레임: columns=[present, CD_ACCT, CD_PJT]
+    """
+    # 범주 코드화 (결측값은 -1 → 아래 배열의 마지막 칸인 빈 값으로 연결됨)
+    codes, uniques = pd.factorize(team_names)
+    uniques = np.asarray(uniques, dtype=object)
+    
+    positions = mapping_table.index.get_indexer(uniques)
+    blank = uniques == ""
+    positions[blank] = -1
+    
+    # 매핑에 없는 고유 팀명만 표기 차이 보정 (고유 팀명 수만큼만 계산)
+    if matcher is not None:
+        missing = np.flatnonzero((positions < 0) & ~blank)
+        resolved_positions = matcher.resolve(uniques[missing])
+        for i in missing:
+            position = resolved_positions.get(uniques[i])
+            if position is not None:
+                positions[i] = position
+                if corrections is not None:
+                    corrections[uniques[i]] = mapping_table.index[position]
+    found = positions >= 0
+    
+    resolved = {}
+    for field in MAPPING_FIELDS:
+        values = np.full(len(uniques) + 1, "", dtype=object)
+        if field == "present":
+            values[:-1] = uniques
+            values[:-1][blank] = ""
+        values[:-1][found] = mapping_table[field].to_numpy(dtype=object)[positions[found]]
+        resolved[field] = values[codes]
+    
+    return pd.DataFrame(resolved, index=team_names.index, columns=MAPPING_FIELDS)
+
+
 def get_unmapped_teams(df: pd.DataFrame) -> List[str]:
     """
     매핑되지 않은 팀명 목록 추출
@@ -72,20 +205,24 @@ def get_unmapped_teams(df: pd.DataFrame) -> List[str]:
     return unmapped_df["원본팀명"].unique().tolist()
 
 
-def get_mapping_summary(df_filtered: pd.DataFrame, mapping_dict: Dict[str, Dict[str, str]]) -> Dict[str, Any]:
+def get_mapping_summary(df_filtered: pd.DataFrame, mapping_dict: Dict[str, Dict[str, str]],
+                        corrections: Optional[Dict[Any, str]] = None) -> Dict[str, Any]:
     """
     매핑 결과 요약 정보 생성
     
     Args:
         df_filtered: 필터링된 데이터프레임
         mapping_dict: 매핑 딕셔너리
+        corrections: 표기 차이를 보정하여 매핑한 팀명 {원본 팀명: 매핑 팀명} (resolve_mapping 결과)
         
     Returns:
         매핑 요약 정보: {mapped_teams: 매핑된 팀명 목록, unmapped_teams: 매핑되지 않은 팀명 목록}
     """
+    corrections = corrections or {}
     mapped_teams = []
     for team in df_filtered["원본팀명"].unique():
-        mapped_info = mapping_dict.get(team, {})
+        # 보정 매핑된 팀은 매핑 단계에서 실제로 사용한 매핑 팀명으로 조회
+        mapped_info = mapping_dict.get(corrections.get(team, team), {})
         mapped_teams.append({
             'original': team,
             'mapped': mapped_info.get('present', team),
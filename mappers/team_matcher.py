@@ -0,0 +1,129 @@
+"""
+팀명 표기 차이 보정 및 유사 팀명 후보 검색
+"""
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core import config as cfg
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_team_name(name: Any) -> str:
+    """
+    비교용 팀명 정규화
+
+    NFKC 정규화로 전각 문자를 반각으로, '㈜'를 '(주)'로 바꾸고, 대소문자 구분과 모든 공백을 없앤다.
+    """
+    text = unicodedata.normalize('NFKC', str(name)).casefold()
+    return _WHITESPACE.sub('', text)
+
+
+def _is_blank(name: Any) -> bool:
+    """
+    비어 있는 팀명(None, NaN, 빈 문자열)인지 확인
+    """
+    if isinstance(name, str):
+        return name == ""
+    return name is None or bool(pd.isna(name))
+
+
+def _ngrams(text: str, n: int) -> List[str]:
+    """
+    앞뒤 경계 표시를 붙인 문자 n-gram 목록 (중복 제거, 짧은 팀명도 최소 1개)
+    """
+    padded = f"\x02{text}\x03"
+    return list(dict.fromkeys(padded[i:i + n] for i in range(max(len(padded) - n + 1, 1))))
+
+
+class TeamNameMatcher:
+    """
+    매핑 팀명(past) 목록에 대한 정규화 조회표와 문자 n-gram 역색인
+
+    - resolve: 정규화한 이름이 매핑 팀명 하나와 정확히 같으면 그 팀명으로 보정
+      (공백, 전각 문자, '㈜'/'(주)', 대소문자 차이만 있는 경우)
+    - suggest: 보정되지 않은 이름에 대해 n-gram Dice 유사도가 높은 매핑 팀명 후보 제시
+      (후보는 안내용이며 자동으로 적용하지 않음)
+    """
+
+    def __init__(self, keys: Sequence[Any], ngram: int = cfg.TEAM_MATCH_NGRAM):
+        """
+        Args:
+            keys: 매핑 팀명 목록 (조회 테이블 순서, resolve 결과 위치의 기준)
+            ngram: 유사도 계산에 쓰는 문자 n-gram 길이
+        """
+        self.keys = list(keys)
+        self.ngram = ngram
+
+        # 정규화 이름 → 위치 (정규화 결과가 같은 팀명이 여럿이면 모호하므로 보정하지 않음)
+        normalized_positions: Dict[str, List[int]] = defaultdict(list)
+        for position, key in enumerate(self.keys):
+            normalized_positions[normalize_team_name(key)].append(position)
+        self._exact = {name: positions[0] for name, positions in normalized_positions.items() if len(positions) == 1}
+
+        # n-gram → 그 n-gram을 가진 팀명 위치 배열
+        postings: Dict[str, List[int]] = defaultdict(list)
+        gram_counts = np.zeros(len(self.keys), dtype=np.int32)
+        for position, key in enumerate(self.keys):
+            grams = _ngrams(normalize_team_name(key), ngram)
+            gram_counts[position] = len(grams)
+            for gram in grams:
+                postings[gram].append(position)
+        self._postings = {gram: np.asarray(positions, dtype=np.int32) for gram, positions in postings.items()}
+        self._gram_counts = gram_counts
+
+    def resolve(self, names: Iterable[Any]) -> Dict[Any, int]:
+        """
+        표기 차이만 있는 이름을 매핑 팀명 위치로 보정
+
+        Args:
+            names: 매핑에서 찾지 못한 팀명 목록
+
+        Returns:
+            {이름: 매핑 팀명 위치} (보정할 수 있는 이름만)
+        """
+        resolved = {}
+        for name in names:
+            if _is_blank(name):
+                continue
+            position = self._exact.get(normalize_team_name(name))
+            if position is not None:
+                resolved[name] = position
+        return resolved
+
+    def suggest(self, names: Iterable[Any], limit: int = cfg.TEAM_MATCH_MAX_SUGGESTIONS,
+                min_score: float = cfg.TEAM_MATCH_MIN_SCORE) -> Dict[Any, List[Tuple[str, float]]]:
+        """
+        유사한 매핑 팀명 후보 검색
+
+        Args:
+            names: 후보를 찾을 팀명 목록
+            limit: 이름별 최대 후보 수
+            min_score: 최소 유사도 (0~1, n-gram Dice 계수)
+
+        Returns:
+            {이름: [(매핑 팀명, 유사도), ...]} (유사도 높은 순, 후보가 있는 이름만)
+        """
+        suggestions = {}
+        for name in names:
+            if _is_blank(name):
+                continue
+            grams = _ngrams(normalize_team_name(name), self.ngram)
+            lists = [self._postings[gram] for gram in grams if gram in self._postings]
+            if not lists:
+                continue
+            # 공통 n-gram 수를 한 번에 세고 Dice 계수 = 2 * 공통 / (양쪽 n-gram 수 합)
+            positions, shared = np.unique(np.concatenate(lists), return_counts=True)
+            scores = 2.0 * shared / (len(grams) + self._gram_counts[positions])
+            keep = scores >= min_score
+            if not keep.any():
+                continue
+            positions, scores = positions[keep], scores[keep]
+            order = np.lexsort((positions, -scores))[:limit]
+            suggestions[name] = [(self.keys[positions[i]], round(float(scores[i]), 3)) for i in order]
+        return suggestions
@@ -0,0 +1,197 @@
+"""
+렌탈료 파일 헤더 분석 (컬럼명 정리, 금액/팀 필드 인식)
+"""
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+from core import config as cfg
+
+# 전처리에 사용하는 기본 컬럼
+REQUIRED_COLUMNS = ["모델명", "영업분류", "관리부서", "거래처명", "관리지점"]
+
+# 금액/팀 필드 자동 인식 패턴 (컬럼명은 공백 제거 후 비교하지만 원래 규칙대로 공백 허용)
+MONTH_AMOUNT_PATTERN = re.compile(r'^\s*(?:[0-9]{1,2})월렌탈료\s*$')
+MONTH_CHANGED_PJT_PATTERN = re.compile(r'^\s*(?:[0-9]{1,2})월\s*변경PJT\s*$')
+AMOUNT_KEYWORD = '렌탈료'
+CURRENCY_MARKERS = ('원', '￦', '₩')
+
+
+@dataclass(frozen=True)
+class HeaderAnalysis:
+    """
+    헤더 분석 결과 (같은 헤더 구성이면 공유되므로 수정하지 않음)
+    """
+    columns: Tuple[str, ...]            # 공백 제거/중복 처리된 컬럼명 (원본 순서)
+    amount_field: str
+    team_fields: Tuple[str, ...]
+    available_columns: Tuple[str, ...]  # 기본 컬럼 중 있는 것 + 금액 필드 + 팀 필드 (+ 자산 키 필드)
+    messages: Tuple[str, ...]           # 인식 과정 안내 메시지 (캐시된 결과도 같은 내용 출력)
+
+
+class HeaderAnalyzer:
+    """
+    헤더를 한 번 정리하고 모든 컬럼을 한 번에 분류하여 금액/팀 필드를 고르는 분석기
+
+    분류 결과는 (원본 헤더, 설정의 금액/팀 필드명)을 키로 LRU 캐시에 보관하므로 같은
+    양식의 파일이 반복해서 들어오면 인식 과정을 건너뛴다.
+    필드 우선순위는 기존 규칙과 같다.
+    - 금액: 설정값과 같은 컬럼 > 'N월렌탈료' > '렌탈료' 포함 > 통화 표시('원', '￦', '₩') 포함
+    - 팀: 설정값과 같은 컬럼(설정 순서) > 'N월 변경PJT' 패턴 컬럼 전체
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[Any, ...], HeaderAnalysis]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def analyze(self, raw_columns: List[str], config: Dict[str, Any], verbose: bool = True) -> HeaderAnalysis:
+        """
+        헤더 분석 (캐시에 같은 헤더 구성이 있으면 재사용)
+
+        Args:
+            raw_columns: 파일의 원본 컬럼명 목록
+            config: 렌탈사 설정 (amount_field, team_fields 사용)
+            verbose: 인식 결과 메시지 출력 여부
+
+        Returns:
+            헤더 분석 결과 (금액/팀 필드를 찾지 못하면 ValueError)
+        """
+        key = (tuple(raw_columns), config['amount_field'].strip(), tuple(_configured_team_fields(config)))
+        with self._lock:
+            analysis = self._entries.get(key)
+            if analysis is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if analysis is None:
+            analysis = _classify(raw_columns, key[1], key[2])
+            with self._lock:
+                self._entries[key] = analysis
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        elif verbose:
+            print(f"이전과 같은 헤더 구성({len(raw_columns)}개 컬럼) - 필드 인식 결과를 재사용합니다.")
+
+        if verbose:
+            for message in analysis.messages:
+                print(message)
+        return analysis
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        캐시 사용 통계 반환
+
+        Returns:
+            {hits, misses, entries, max_entries}
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries), 'max_entries': self.max_entries}
+
+
+def _configured_team_fields(config: Dict[str, Any]) -> List[str]:
+    """
+    설정의 팀 필드명 목록 (문자열 하나도 허용, 앞뒤 공백 제거)
+    """
+    team_fields = config.get('team_fields', [])
+    if isinstance(team_fields, str):
+        team_fields = [team_fields]
+    return [field.strip() for field in team_fields]
+
+
+def _normalize_columns(raw_columns: List[str], messages: List[str]) -> List[str]:
+    """
+    컬럼명 양쪽 공백 제거 및 중복 컬럼명 처리 (바뀐 컬럼명만 메시지로 남김)
+    """
+    columns = []
+    duplicate_count: Dict[str, int] = {}
+    for raw in raw_columns:
+        col = raw.strip()
+        if col in duplicate_count:
+            if not any(message.startswith("중복 컬럼 처리") for message in messages):
+                messages.append("경고: 공백 제거 후 중복된 컬럼명이 있습니다.")
+            duplicate_count[col] += 1
+            new_col = f"{col}_{duplicate_count[col]}"
+            messages.append(f"중복 컬럼 처리: '{raw}' -> '{new_col}'")
+            col = new_col
+        else:
+            duplicate_count[col] = 0
+            if col != raw:
+                messages.append(f"컬럼명 공백 제거: '{raw}' -> '{col}'")
+        columns.append(col)
+    return columns
+
+
+def _classify(raw_columns: List[str], amount_setting: str, team_settings: Tuple[str, ...]) -> HeaderAnalysis:
+    """
+    컬럼을 한 번 훑어 규칙별 첫 후보를 모은 뒤 우선순위대로 금액/팀 필드 결정
+    """
+    messages: List[str] = []
+    columns = _normalize_columns(raw_columns, messages)
+
+    # 규칙별 후보 (금액은 규칙마다 첫 컬럼, 변경PJT는 전체)
+    first_index: Dict[str, int] = {}
+    month_amount = keyword_amount = currency_amount = None
+    changed_pjt_fields = []
+    for index, col in enumerate(columns):
+        first_index.setdefault(col, index)
+        if month_amount is None and MONTH_AMOUNT_PATTERN.match(col):
+            month_amount = col
+        if keyword_amount is None and AMOUNT_KEYWORD in col:
+            keyword_amount = col
+        if currency_amount is None and any(marker in col for marker in CURRENCY_MARKERS):
+            currency_amount = col
+        if MONTH_CHANGED_PJT_PATTERN.match(col):
+            changed_pjt_fields.append(col)
+
+    for col in REQUIRED_COLUMNS:
+        if col not in first_index:
+            messages.append(f"경고: '{col}' 컬럼이 파일에 없습니다.")
+
+    if amount_setting in first_index:
+        amount_field = amount_setting
+        messages.append(f"금액 필드로 '{amount_field}'를 설정값에서 찾았습니다.")
+    elif month_amount is not None:
+        amount_field = month_amount
+        messages.append(f"금액 필드로 '{amount_field}'를 자동 인식했습니다.")
+    elif keyword_amount is not None or currency_amount is not None:
+        amount_field = keyword_amount if keyword_amount is not None else currency_amount
+        messages.append(f"금액 필드로 '{amount_field}'를 사용합니다.")
+    else:
+        raise ValueError("금액 필드를 찾을 수 없습니다. 파일 형식을 확인해주세요.")
+    messages.append(f"사용할 금액 필드: '{amount_field}'")
+
+    team_fields = [field for field in team_settings if field in first_index]
+    for field in team_fields:
+        messages.append(f"팀 필드로 '{field}'를 설정값에서 찾았습니다.")
+    if not team_fields:
+        team_fields = changed_pjt_fields
+        for field in team_fields:
+            messages.append(f"팀 필드로 '{field}'를 자동 인식했습니다 (변경PJT 패턴).")
+    if not team_fields:
+        raise ValueError("팀 정보 필드를 찾을 수 없습니다. 파일 형식을 확인해주세요.")
+
+    # 월별 이력 비교에 쓰는 자산 키 (설정 순서대로 처음 있는 컬럼, 없으면 이력 저장 시 기본 컬럼 + 순번으로 대신)
+    asset_key_field = next((col for col in cfg.ASSET_KEY_FIELDS if col in first_index), None)
+    if asset_key_field is not None:
+        messages.append(f"자산 키 필드로 '{asset_key_field}'를 사용합니다.")
+
+    # 사용 가능한 컬럼만 선택 (중복 제거)
+    available_columns = [col for col in REQUIRED_COLUMNS if col in first_index]
+    available_columns.append(amount_field)
+    available_columns.extend(team_fields)
+    if asset_key_field is not None:
+        available_columns.append(asset_key_field)
+    available_columns = list(dict.fromkeys(available_columns))
+    messages.append(f"사용할 컬럼: {available_columns}")
+
+    return HeaderAnalysis(tuple(columns), amount_field, tuple(team_fields), tuple(available_columns), tuple(messages))
+
+
+# 렌탈료 파일 로더가 함께 사용하는 프로세스 공용 분석기
+header_analyzer = HeaderAnalyzer(max_entries=cfg.HEADER_CACHE_MAX_ENTRIES)
@@ -0,0 +1,278 @@
+"""
+월별 처리 이력 저장소 (SQLite, 원본 CSV를 다시 읽지 않고 월간 추가/삭제/변경 라인 비교)
+
+실행마다 전처리 결과(df_filtered)를 (렌탈사, 월) 단위로 저장하고, 같은 달을 다시 처리하면 덮어쓴다.
+라인 테이블은 (실행, 자산 키)가 기본 키라서 두 달 비교는 자산 키 인덱스 조인으로 처리한다.
+"""
+import os
+import re
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from core import config as cfg
+from processors.header_analyzer import REQUIRED_COLUMNS
+
+# 이력 저장 형식이 바뀌면 올려서 이전 형식의 저장소를 다시 만들게 함
+HISTORY_FORMAT_VERSION = 1
+
+# 라인 테이블 컬럼: SQLite 자료형 (자산키 다음 순서대로 저장)
+HISTORY_COLUMNS = {
+    "원본팀명": "TEXT", "이전팀명": "TEXT", "팀명": "TEXT", "CD_ACCT": "TEXT", "CD_PJT": "INTEGER", "금액": "INTEGER",
+    **{col: "TEXT" for col in REQUIRED_COLUMNS},
+}
+
+# 월간 비교에서 변경 여부를 보는 컬럼
+DIFF_COLUMNS = ["원본팀명", "팀명", "CD_ACCT", "CD_PJT", "금액"]
+
+MONTH_PATTERN = re.compile(r'^\d{4}-\d{2}$')
+AMOUNT_MONTH_PATTERN = re.compile(r'([0-9]{1,2})월')
+
+
+def history_month(amount_field: Optional[str], today: Optional[datetime] = None) -> str:
+    """
+    금액 필드명('10월렌탈료')으로 이력 월(YYYY-MM) 결정
+
+    처리일보다 뒤의 달이면 작년 자료로 본다 (예: 1월에 처리하는 12월렌탈료 → 작년 12월).
+    금액 필드에 월이 없으면 처리일의 달.
+    """
+    today = today or datetime.now()
+    match = AMOUNT_MONTH_PATTERN.search(amount_field or "")
+    month = int(match.group(1)) if match else 0
+    if not 1 <= month <= 12:
+        return today.strftime("%Y-%m")
+    year = today.year if month <= today.month else today.year - 1
+    return f"{year}-{month:02d}"
+
+
+def asset_keys(df_filtered: pd.DataFrame) -> np.ndarray:
+    """
+    행별 자산 키 (전처리 결과에 cfg.ASSET_KEY_FIELDS 컬럼이 있으면 그 값)
+
+    자산 키 컬럼이 없거나 값이 비어 있으면 기본 컬럼(모델명, 거래처명 등) 값을 이은 문자열로 대신한다.
+    같은 키가 여러 번 나오면 두 번째부터 '#2', '#3' ...을 붙여 월 안에서 겹치지 않게 한다
+    (기본 컬럼으로 대신한 키는 같은 조건의 자산끼리 파일 순서로 구분됨).
+    """
+    key_field = next((col for col in cfg.ASSET_KEY_FIELDS if col in df_filtered.columns), None)
+    if key_field is not None:
+        keys = df_filtered[key_field].astype(object).fillna("").astype(str).str.strip()
+    else:
+        keys = pd.Series("", index=df_filtered.index, dtype=object)
+    blank = (keys == "").to_numpy()
+    if blank.any():
+        fallback = pd.Series("", index=df_filtered.index[blank], dtype=object)
+        for col in REQUIRED_COLUMNS:
+            if col in df_filtered.columns:
+                fallback = fallback + "|" + df_filtered.loc[blank, col].astype(object).fillna("").astype(str)
+        keys[blank] = fallback
+    occurrence = keys.groupby(keys, sort=False).cumcount()
+    keys = keys.where(occurrence == 0, keys + "#" + (occurrence + 1).astype(str))
+    return keys.to_numpy(dtype=object)
+
+
+class HistoryStore:
+    """
+    렌탈사/월별 전처리 결과 이력 (SQLite 파일 하나, 처음 사용할 때 생성)
+
+    여러 프로세스(배치 작업, 웹 요청)가 동시에 저장해도 SQLite 잠금으로 차례로 기록된다.
+    """
+
+    def __init__(self, db_path: str = cfg.HISTORY_DB_PATH, timeout: float = cfg.SQLITE_TIMEOUT_SEC):
+        self.db_path = db_path
+        self.timeout = timeout
+
+    @contextmanager
+    def _open(self) -> Iterator[sqlite3.Connection]:
+        """
+        연결을 열고 끝나면 커밋(오류 시 롤백) 후 닫음
+        """
+        connection = self._connect()
+        try:
+            yield connection
+            connection.commit()
+        except BaseException:
+            connection.rollback()
+            raise
+        finally:
+            connection.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        connection = sqlite3.connect(self.db_path, timeout=self.timeout)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        if version != HISTORY_FORMAT_VERSION:
+            # 형식이 다른(이전 버전) 이력은 비교할 수 없으므로 다시 만듦
+            connection.executescript("DROP TABLE IF EXISTS lines; DROP TABLE IF EXISTS runs;")
+        line_columns = ", ".join(f'"{col}" {sql_type}' for col, sql_type in HISTORY_COLUMNS.items())
+        connection.executescript(f"""
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id INTEGER PRIMARY KEY,
+                company TEXT NOT NULL,
+                month TEXT NOT NULL,
+                source_file TEXT,
+                source_digest TEXT,
+                saved_at TEXT NOT NULL,
+                row_count INTEGER NOT NULL,
+                total_amount INTEGER NOT NULL,
+                UNIQUE (company, month)
+            );
+            CREATE TABLE IF NOT EXISTS lines (
+                run_id INTEGER NOT NULL,
+                "자산키" TEXT NOT NULL,
+                {line_columns},
+                PRIMARY KEY (run_id, "자산키")
+            ) WITHOUT ROWID;
+            PRAGMA user_version = {HISTORY_FORMAT_VERSION};
+        """)
+        return connection
+
+    def save(self, company: str, month: str, df_filtered: pd.DataFrame, team_fields: Sequence[str] = (),
+             source_file: Optional[str] = None, source_digest: Optional[str] = None) -> bool:
+        """
+        전처리 결과를 렌탈사/월 이력으로 저장 (같은 달이 이미 있으면 교체)
+
+        Args:
+            company: 렌탈사 이름
+            month: 이력 월 (YYYY-MM)
+            df_filtered: 전처리 결과 (매핑된 행)
+            team_fields: 팀 필드 목록 (우선순위 순, 마지막 필드 값은 이전팀명으로 저장 - 예: 'N-1월 PJT')
+            source_file: 입력 파일 경로 (안내용)
+            source_digest: 입력 내용 해시 (입력/매핑 파일과 설정, 같은 달에 같은 내용이 이미 저장되어 있으면 건너뜀)
+
+        Returns:
+            저장했으면 True, 같은 파일이라 건너뛰었으면 False
+        """
+        _check_month(month)
+        length = len(df_filtered)
+        previous_team = df_filtered[team_fields[-1]] if len(team_fields) > 1 and team_fields[-1] in df_filtered.columns else None
+        columns = {"자산키": asset_keys(df_filtered)}
+        for col, sql_type in HISTORY_COLUMNS.items():
+            if col == "이전팀명":
+                values = previous_team
+            else:
+                values = df_filtered[col] if col in df_filtered.columns else None
+            if values is None:
+                columns[col] = [None] * length
+            elif sql_type == "INTEGER":
+                columns[col] = values.astype("int64").tolist()
+            else:
+                values = values.astype(object)
+                columns[col] = values.where(values.notna(), None).tolist()
+
+        with self._open() as connection:
+            existing = connection.execute("SELECT run_id, source_digest FROM runs WHERE company = ? AND month = ?",
+                                          (company, month)).fetchone()
+            if existing is not None and source_digest is not None and existing[1] == source_digest:
+                return False
+            if existing is not None:
+                connection.execute("DELETE FROM lines WHERE run_id = ?", (existing[0],))
+                connection.execute("DELETE FROM runs WHERE run_id = ?", (existing[0],))
+            total_amount = int(df_filtered["금액"].sum()) if length else 0
+            run_id = connection.execute(
+                "INSERT INTO runs (company, month, source_file, source_digest, saved_at, row_count, total_amount) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (company, month, source_file, source_digest, datetime.now().isoformat(timespec='seconds'), length, total_amount),
+            ).lastrowid
+            names = ", ".join(f'"{col}"' for col in columns)
+            placeholders = ", ".join("?" * (len(columns) + 1))
+            # 기본 키 순서로 넣으면 B-트리 끝에 이어 붙이므로 무작위 순서보다 훨씬 빠름
+            order = np.argsort(columns["자산키"], kind="stable")
+            rows = zip([run_id] * length, *(np.asarray(values, dtype=object)[order] for values in columns.values()))
+            connection.executemany(f"INSERT INTO lines (run_id, {names}) VALUES ({placeholders})", rows)
+        return True
+
+    def months(self, company: str) -> pd.DataFrame:
+        """
+        저장된 월 목록 (월 순서)
+
+        Returns:
+            columns=[month, row_count, total_amount, saved_at, source_file]
+        """
+        with self._open() as connection:
+            return pd.read_sql_query(
+                "SELECT month, row_count, total_amount, saved_at, source_file FROM runs WHERE company = ? ORDER BY month",
+                connection, params=(company,))
+
+    def load(self, company: str, month: str) -> pd.DataFrame:
+        """
+        저장된 한 달 이력 (자산 키 순서)
+        """
+        with self._open() as connection:
+            run_id = _run_id(connection, company, month)
+            names = ", ".join(f'"{col}"' for col in ["자산키", *HISTORY_COLUMNS])
+            return pd.read_sql_query(f'SELECT {names} FROM lines WHERE run_id = ? ORDER BY "자산키"', connection, params=(run_id,))
+
+    def diff(self, company: str, month_from: str, month_to: str) -> pd.DataFrame:
+        """
+        두 달 사이 추가/삭제/변경된 라인 (자산 키 기준)
+
+        - 추가: month_to에만 있는 자산 (신규 렌탈)
+        - 삭제: month_from에만 있는 자산 (반납, 매핑 제외 등)
+        - 변경: 양쪽에 있고 DIFF_COLUMNS(팀, 계정, 프로젝트, 금액) 중 하나라도 다른 자산
+
+        Returns:
+            columns=[구분, 자산키, 변경항목, 기본 컬럼..., '<컬럼>(이전)', '<컬럼>(이후)' ...] (구분, 자산키 순서)
+        """
+        with self._open() as connection:
+            run_from = _run_id(connection, company, month_from)
+            run_to = _run_id(connection, company, month_to)
+            descriptors = ", ".join(f'COALESCE(b."{col}", a."{col}") AS "{col}"' for col in REQUIRED_COLUMNS)
+            compared = ", ".join(f'a."{col}" AS "{col}(이전)", b."{col}" AS "{col}(이후)"' for col in DIFF_COLUMNS)
+            changed = " OR ".join(f'a."{col}" IS NOT b."{col}"' for col in DIFF_COLUMNS)
+            select = f'SELECT ? AS "구분", COALESCE(b."자산키", a."자산키") AS "자산키", {descriptors}, {compared}'
+            query = f"""
+                {select} FROM lines b LEFT JOIN lines a ON a.run_id = ? AND a."자산키" = b."자산키"
+                    WHERE b.run_id = ? AND a."자산키" IS NULL
+                UNION ALL
+                {select} FROM lines a LEFT JOIN lines b ON b.run_id = ? AND b."자산키" = a."자산키"
+                    WHERE a.run_id = ? AND b."자산키" IS NULL
+                UNION ALL
+                {select} FROM lines a JOIN lines b ON b.run_id = ? AND b."자산키" = a."자산키"
+                    WHERE a.run_id = ? AND ({changed})
+            """
+            params = ("추가", run_from, run_to, "삭제", run_to, run_from, "변경", run_to, run_from)
+            diff = pd.read_sql_query(query, connection, params=params)
+
+        for col in DIFF_COLUMNS:
+            if HISTORY_COLUMNS[col] == "INTEGER":
+                # 추가/삭제 라인의 빈 쪽 때문에 실수로 읽힌 정수 컬럼을 정수(결측 허용)로 되돌림
+                diff[f"{col}(이전)"] = diff[f"{col}(이전)"].astype("Int64")
+                diff[f"{col}(이후)"] = diff[f"{col}(이후)"].astype("Int64")
+        diff.insert(2, "변경항목", _changed_columns(diff))
+        return diff
+
+
+def _changed_columns(diff: pd.DataFrame) -> pd.Series:
+    """
+    변경 라인별로 값이 달라진 컬럼 이름 (쉼표로 연결, 추가/삭제 라인은 빈 문자열)
+    """
+    labels = pd.Series("", index=diff.index, dtype=object)
+    is_changed = diff["구분"] == "변경"
+    for col in DIFF_COLUMNS:
+        before, after = diff[f"{col}(이전)"], diff[f"{col}(이후)"]
+        differs = is_changed & ~((before == after) | (before.isna() & after.isna()))
+        labels = labels.mask(differs, labels + np.where(labels == "", "", ", ") + col)
+    return labels
+
+
+def _run_id(connection: sqlite3.Connection, company: str, month: str) -> int:
+    _check_month(month)
+    row = connection.execute("SELECT run_id FROM runs WHERE company = ? AND month = ?", (company, month)).fetchone()
+    if row is None:
+        raise ValueError(f"'{company}' {month} 이력이 없습니다. 해당 월 파일을 먼저 처리해주세요.")
+    return row[0]
+
+
+def _check_month(month: str) -> None:
+    if not MONTH_PATTERN.match(month or ""):
+        raise ValueError(f"월은 YYYY-MM 형식으로 입력해주세요: {month}")
+
+
+# 프로세스 공용 이력 저장소 (파일은 처음 저장/조회할 때 생성)
+history_store = HistoryStore()
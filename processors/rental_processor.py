@@ -1,191 +1,338 @@
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Tuple, Optional, Callable, Union
+from core import config as cfg
 from mappers import mapping_utils
+from core.result import format_suggestions
+from mappers.team_matcher import TeamNameMatcher
+from processors.header_analyzer import REQUIRED_COLUMNS, HeaderAnalysis, header_analyzer
+from pandas.api.types import union_categoricals
+from utils.file_utils import detect_encoding
 
 
-def load_and_preprocess_data(input_file: str, config: Dict[str, Any], mapping_dict: Dict[str, Dict[str, str]]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+# openpyxl로 직접 읽는 엑셀 확장자
+EXCEL_EXTENSIONS = ('.xlsx', '.xlsm')
+
+# 값 종류가 적고 행마다 반복되는 문자열 컬럼의 자료형 (기본 컬럼/팀 필드, 전처리에서 만드는 컬럼)
+# 행마다 문자열 객체를 두는 대신 범주 코드(1~2바이트)와 고유 값 목록만 보관한다.
+CATEGORY_DTYPE = "category"
+
+# 행마다 값이 다른 자산 키(시리얼번호 등) 컬럼의 자료형 - 범주형이면 행마다 범주가 하나씩 생겨 오히려 메모리를 더 씀
+# (자동 추론에 맡기면 숫자 일련번호의 앞자리 0이 사라지므로 문자열 그대로 읽음)
+ASSET_KEY_DTYPE = "object"
+
+
+def load_and_preprocess_data(input_file: Union[str, pd.DataFrame], config: Dict[str, Any], mapping_dict: Dict[str, Dict[str, str]], run_info: Optional[Dict[str, Any]] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
     데이터 로드 및 전처리
     
     Args:
-        input_file: 입력 파일 경로
+        input_file: 입력 파일 경로 (CSV 또는 .xlsx) 또는 이미 읽은 데이터프레임
         config: 렌탈사 설정 정보
         mapping_dict: 매핑 딕셔너리
+        run_info: 실행 정보를 기록할 딕셔너리 (선택, 인코딩/인식 필드/행 수/미매핑 팀명이 채워짐)
         
     Returns:
         전처리된 데이터프레임, 필터링된 데이터프레임
     """
-    # CSV 파일 로드 - 다양한 인코딩 시도
-    print(f"'{input_file}' 파일 로딩 중...")
-    try:
-        rental_df = pd.read_csv(input_file, encoding='utf-8')
-    except UnicodeDecodeError:
-        try:
-            # UTF-8 실패 시 CP949 시도
-            rental_df = pd.read_csv(input_file, encoding='cp949')
-            print("CP949 인코딩으로 파일 로드 성공")
-        except UnicodeDecodeError:
-            try:
-                # EUC-KR 시도
-                rental_df = pd.read_csv(input_file, encoding='euc-kr') 
-                print("EUC-KR 인코딩으로 파일 로드 성공")
-            except Exception as e:
-                print(f"파일 로드 실패: {e}")
-                raise
-    
-    print(f"로딩 완료: {len(rental_df)}개 행 발견")
+    rental_df, amount_field, team_fields, available_columns = _load_rental_frame(input_file, config, run_info)
     
-    # 컬럼명 양쪽 공백 제거 (더 엄격한 처리)
-    original_columns = rental_df.columns.tolist()
-    print("원본 컬럼명:")
-    for col in original_columns:
-        print(f"- '{col}'")
-
-    # 컬럼명에서 공백 제거 및 처리
-    rental_df.columns = [col.strip() for col in rental_df.columns]
-
-    # 처리된 컬럼명 출력
-    processed_columns = rental_df.columns.tolist()
-    print("처리 후 컬럼명:")
-    for i, col in enumerate(processed_columns):
-        orig = original_columns[i] if i < len(original_columns) else "?"
-        print(f"- '{orig}' -> '{col}'")
-
-    # 컬럼명 중복 체크 및 처리
-    if len(set(rental_df.columns)) != len(rental_df.columns):
-        print("경고: 공백 제거 후 중복된 컬럼명이 있습니다.")
-        duplicate_count = {}
-        new_columns = []
-        
-        for col in rental_df.columns:
-            if col in duplicate_count:
-                duplicate_count[col] += 1
-                new_col = f"{col}_{duplicate_count[col]}"
-                new_columns.append(new_col)
-                print(f"  중복 컬럼 처리: '{col}' -> '{new_col}'")
-            else:
-                duplicate_count[col] = 0
-                new_columns.append(col)
-        
-        rental_df.columns = new_columns
-    
-    # 필요한 필드 확인 및 조정
-    # 필요한 컬럼이 있는지 확인
-    column_exists = {}
-    required_columns = ["모델명", "영업분류", "관리부서", "거래처명", "관리지점"]
-    
-    for col in required_columns:
-        if col in rental_df.columns:
-            column_exists[col] = True
-        else:
-            column_exists[col] = False
-            print(f"경고: '{col}' 컬럼이 파일에 없습니다.")
-    
-    # 금액 필드 찾기 - 월별 자동 인식 패턴
-    amount_field = None
-    
-    # 1. 먼저 config에 설정된 필드 시도 (앞뒤 공백 제거 후 비교)
-    clean_amount_field = config['amount_field'].strip()
-    for col in rental_df.columns:
-        if col.strip() == clean_amount_field:
-            amount_field = col
-            print(f"금액 필드로 '{amount_field}'를 설정값에서 찾았습니다.")
-            break
-    
-    if not amount_field:
-        # 2. 'N월렌탈료' 패턴 찾기 - 공백 고려
-        import re
-        month_pattern = re.compile(r'^\s*(?:[0-9]{1,2})월렌탈료\s*$')
-        
-        for col in rental_df.columns:
-            if month_pattern.match(col):
-                amount_field = col
-                print(f"금액 필드로 '{amount_field}'를 자동 인식했습니다.")
-                break
-                
-        # 3. 렌탈료 포함 필드 찾기
-        if not amount_field:
-            for col in rental_df.columns:
-                if '렌탈료' in col:
-                    amount_field = col
-                    print(f"금액 필드로 '{amount_field}'를 사용합니다.")
-                    break
-    
-    if not amount_field:
-        # 4. 컬럼명에 '원'이나 '￦' 또는 '₩'가 포함된 것을 amount_field로 사용
-        for col in rental_df.columns:
-            if '원' in col or '￦' in col or '₩' in col:
-                amount_field = col
-                print(f"금액 필드로 '{amount_field}'를 사용합니다.")
-                break
-    
-    # 금액 필드를 찾을 수 없으면 오류 발생
-    if not amount_field:
-        raise ValueError("금액 필드를 찾을 수 없습니다. 파일 형식을 확인해주세요.")
-    
-    # 금액 필드 확인 출력
-    print(f"사용할 금액 필드: '{amount_field}'")
     print(f"금액 필드 샘플 값: {rental_df[amount_field].head().tolist()}")
     
-    # 팀 필드 찾기 - 월별 자동 인식 패턴
-    team_fields = []
-    
-    # 1. 먼저 config에 설정된 필드 시도
-    configured_team_fields = config.get('team_fields', [])
-    if isinstance(configured_team_fields, str):
-        configured_team_fields = [configured_team_fields]
-    
-    for field in configured_team_fields:
-        clean_field = field.strip()
-        for col in rental_df.columns:
-            if col.strip() == clean_field:
-                team_fields.append(col)
-                print(f"팀 필드로 '{col}'를 설정값에서 찾았습니다.")
-                break
-    
-    if not team_fields:
-        # 2. '[0-9]월 변경PJT' 패턴만 찾기 - 공백 허용
-        import re
-        # 공백 허용하고 '변경PJT'만 찾는 패턴
-        month_pjt_pattern = re.compile(r'^\s*(?:[0-9]{1,2})월\s*변경PJT\s*$')
+    # 필요한 필드만 선택 (존재하는 컬럼만) - CSV는 읽을 때 이미 적용된 자료형 계획을 엑셀/데이터프레임에도 적용
+    df = rental_df[available_columns].astype(_dtype_plan(available_columns, amount_field))
+    
+    matcher = mapping_utils.get_team_matcher(mapping_dict)
+    corrections = {}
+    df, df_filtered, invalid_rows = _preprocess_frame(df, amount_field, team_fields, config, mapping_utils.build_mapping_table(mapping_dict),
+                                                      matcher=matcher, corrections=corrections)
+    
+    unmapped_teams = df[~df.index.isin(df_filtered.index)]["원본팀명"].unique().tolist()
+    suggestions = matcher.suggest(unmapped_teams)
+    _record(run_info, amount_field=amount_field, team_fields=team_fields, excluded_rows=invalid_rows,
+            total_rows=len(df), mapped_rows=len(df_filtered), unmapped_teams=unmapped_teams,
+            corrected_teams=corrections, team_suggestions=suggestions)
+    
+    _report_corrected_teams(corrections)
+    
+    # 매핑되지 않은 팀명 정보 출력
+    if len(df_filtered) < len(df):
+        _report_unmapped_teams(unmapped_teams, len(df_filtered), suggestions)
+    
+    print(f"매핑된 항목: {len(df_filtered)}개 / 전체 {len(df)}개")
+    
+    return df, df_filtered
+
+
+def load_and_preprocess_data_chunked(input_file: Union[str, pd.DataFrame], config: Dict[str, Any], mapping_dict: Dict[str, Dict[str, str]], chunksize: int = cfg.CSV_CHUNK_SIZE, run_info: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+    """
+    대용량 CSV를 청크 단위로 읽어 전처리 (스트리밍 모드)
+    
+    헤더만 먼저 읽어 금액/팀 필드를 찾은 뒤, 필요한 컬럼만(usecols) 청크로 읽어
+    매핑과 필터링을 청크마다 수행하고 매핑된 차변 행과 대변 합계만 누적한다.
+    최대 메모리는 파일 크기가 아니라 청크 크기에 비례하며,
+    결과는 load_and_preprocess_data의 필터링된 데이터프레임과 같다.
+    
+    Args:
+        input_file: 입력 파일 경로
+        config: 렌탈사 설정 정보
+        mapping_dict: 매핑 딕셔너리
+        chunksize: 한 번에 읽을 행 수
+        run_info: 실행 정보를 기록할 딕셔너리 (선택, 인코딩/인식 필드/행 수/미매핑 팀명이 채워짐)
         
-        for col in rental_df.columns:
-            if month_pjt_pattern.match(col):
-                team_fields.append(col)
-                print(f"팀 필드로 '{col}'를 자동 인식했습니다 (변경PJT 패턴).")
+    Returns:
+        필터링된 데이터프레임
+    """
+    if isinstance(input_file, pd.DataFrame) or _is_excel_file(input_file):
+        # 엑셀/데이터프레임 입력은 이미 필요한 컬럼만 메모리에 있으므로 일반 경로로 처리
+        _, df_filtered = load_and_preprocess_data(input_file, config, mapping_dict, run_info)
+        return df_filtered
+    
+    print(f"'{input_file}' 파일 스트리밍 로딩 중 (청크 크기: {chunksize}행)...")
+    mapping_table = mapping_utils.build_mapping_table(mapping_dict)
+    matcher = mapping_utils.get_team_matcher(mapping_dict)
+    corrections = {}
+    
+    result = _read_with_detected_encoding(input_file, lambda encoding: _stream_csv(input_file, encoding, chunksize, config, mapping_table, matcher, corrections), run_info)
+    
+    filtered_chunks, total_rows, invalid_rows, credit_total, unmapped_teams, amount_field, team_fields, columns = result
+    
+    print(f"로딩 완료: {total_rows + invalid_rows}개 행 발견")
+    if invalid_rows > 0:
+        print(f"금액이 없거나 숫자가 아닌 행(반납 항목) {invalid_rows}개를 제외합니다.")
+    
+    if filtered_chunks:
+        df_filtered = _concat_frames(filtered_chunks)
+    else:
+        df_filtered = pd.DataFrame(columns=columns)
+    
+    unmapped_teams = list(dict.fromkeys(unmapped_teams))
+    suggestions = matcher.suggest(unmapped_teams)
+    _record(run_info, amount_field=amount_field, team_fields=team_fields, excluded_rows=invalid_rows,
+            total_rows=total_rows, mapped_rows=len(df_filtered), unmapped_teams=unmapped_teams,
+            corrected_teams=corrections, team_suggestions=suggestions)
+    
+    _report_corrected_teams(corrections)
+    
+    if len(df_filtered) < total_rows:
+        _report_unmapped_teams(unmapped_teams, len(df_filtered), suggestions)
+    
+    print(f"매핑된 항목: {len(df_filtered)}개 / 전체 {total_rows}개")
+    print(f"대변 금액 누적 합계: {credit_total}")
+    
+    return df_filtered
+
+
+def _is_excel_file(input_file: Any) -> bool:
+    """
+    openpyxl로 직접 읽을 엑셀 파일인지 확인
+    """
+    return isinstance(input_file, str) and input_file.lower().endswith(EXCEL_EXTENSIONS)
+
+
+def _load_rental_frame(input_file: Union[str, pd.DataFrame], config: Dict[str, Any], run_info: Optional[Dict[str, Any]]) -> Tuple[pd.DataFrame, str, List[str], List[str]]:
+    """
+    입력(CSV/엑셀 경로 또는 데이터프레임)을 읽고 컬럼 정리 및 필드 인식까지 수행
+    
+    Returns:
+        렌탈 데이터프레임, 금액 필드, 팀 필드 목록, 사용할 컬럼 목록
+    """
+    if isinstance(input_file, pd.DataFrame):
+        print("데이터프레임 입력 처리 중...")
+        rental_df = input_file.copy(deep=False)  # 컬럼명 변경이 원본에 영향을 주지 않도록
+        _record(run_info, source_format='dataframe')
+    elif _is_excel_file(input_file):
+        _record(run_info, source_format='xlsx')
+        return _read_excel_columns(input_file, config)
+    else:
+        # CSV 파일 로드 - 인코딩을 먼저 판별하고 한 번만 파싱
+        print(f"'{input_file}' 파일 로딩 중...")
+        rental_df, analysis = _read_with_detected_encoding(input_file, lambda encoding: _read_csv_columns(input_file, encoding, config), run_info)
+        _record(run_info, source_format='csv')
+        print(f"로딩 완료: {len(rental_df)}개 행 발견")
+        return rental_df, analysis.amount_field, list(analysis.team_fields), list(analysis.available_columns)
+    
+    print(f"로딩 완료: {len(rental_df)}개 행 발견")
+    
+    analysis = header_analyzer.analyze([str(col) for col in rental_df.columns], config)
+    rental_df.columns = list(analysis.columns)
+    return rental_df, analysis.amount_field, list(analysis.team_fields), list(analysis.available_columns)
+
+
+def _read_csv_columns(input_file: str, encoding: str, config: Dict[str, Any]) -> Tuple[pd.DataFrame, HeaderAnalysis]:
+    """
+    헤더만 먼저 읽어 필드를 인식한 뒤 필요한 컬럼만 자료형 계획대로 읽기 (디코딩 실패 시 UnicodeDecodeError)
+    
+    Returns:
+        필요한 컬럼만 있는 데이터프레임 (정리된 컬럼명, 파일 순서), 헤더 분석 결과
+    """
+    header = pd.read_csv(input_file, encoding=encoding, nrows=0).columns.tolist()
+    analysis = header_analyzer.analyze([str(col) for col in header], config)
+    positions, dtypes = _column_plan(header, analysis)
+    
+    # 빈 줄도 행으로 읽은 뒤 제외하여 인덱스가 원본 행 위치를 유지하도록 함 (상세 내역의 원본행번호)
+    rental_df = pd.read_csv(input_file, encoding=encoding, usecols=positions, dtype=dtypes, skip_blank_lines=False)
+    rental_df.columns = [analysis.columns[i] for i in positions]
+    return _drop_blank_rows(rental_df), analysis
+
+
+def _drop_blank_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    값이 하나도 없는 행 제외 (인덱스는 원본 행 위치 그대로 유지)
+    """
+    has_value = df.notna().any(axis=1)
+    return df if has_value.all() else df[has_value]
+
+
+def _dtype_plan(available_columns: List[str], amount_field: str) -> Dict[str, str]:
+    """
+    사용할 컬럼별 자료형 계획
     
-    # 팀 필드를 찾을 수 없음 - 오류 발생
-    if not team_fields:
-        raise ValueError("팀 정보 필드를 찾을 수 없습니다. 파일 형식을 확인해주세요.")
+    금액 필드는 숫자가 아닌 값(반납 항목)을 걸러야 하므로 자동 추론에 맡기고 전처리에서 int64로 변환하며,
+    자산 키(cfg.ASSET_KEY_FIELDS)는 문자열로, 나머지(기본 컬럼, 팀 필드)는 범주형으로 읽는다.
+    """
+    return {col: ASSET_KEY_DTYPE if col in cfg.ASSET_KEY_FIELDS else CATEGORY_DTYPE
+            for col in available_columns if col != amount_field}
+
+
+def _column_plan(header: List[Any], analysis: HeaderAnalysis) -> Tuple[List[int], Dict[Any, str]]:
+    """
+    read_csv에 넘길 읽을 컬럼 위치와 원본 컬럼명 기준 자료형
     
-    # 사용 가능한 컬럼만 선택
-    available_columns = []
-    for col in required_columns:
-        if column_exists.get(col, False):
-            available_columns.append(col)
+    Returns:
+        파일 내 위치 목록 (usecols는 파일 순서대로 반환됨), {원본 컬럼명: 자료형}
+    """
+    columns = analysis.columns
+    positions = sorted(columns.index(col) for col in analysis.available_columns)
+    plan = _dtype_plan(list(analysis.available_columns), analysis.amount_field)
+    dtypes = {header[i]: plan[columns[i]] for i in positions if columns[i] in plan}
+    return positions, dtypes
+
+
+def _concat_frames(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    청크별 전처리 결과 합치기 (범주형 컬럼은 범주를 합쳐 범주형 유지)
     
-    if amount_field:
-        available_columns.append(amount_field)
+    pd.concat은 범주 목록이 다른 범주형 컬럼을 object로 바꾸므로 범주형 컬럼만 따로 합친다.
+    """
+    if len(frames) == 1:
+        return frames[0]
+    category_columns = [col for col, dtype in frames[0].dtypes.items() if isinstance(dtype, pd.CategoricalDtype)]
+    combined = pd.concat([frame.drop(columns=category_columns) for frame in frames])
+    for col in category_columns:
+        combined[col] = pd.Series(union_categoricals([frame[col] for frame in frames]), index=combined.index)
+    return combined[frames[0].columns]
+
+
+def _read_excel_columns(input_file: str, config: Dict[str, Any]) -> Tuple[pd.DataFrame, str, List[str], List[str]]:
+    """
+    openpyxl 읽기 전용 모드로 엑셀 파일의 필요한 컬럼만 읽기 (중간 CSV 변환 없음)
     
-    available_columns.extend(team_fields)
+    첫 시트의 첫 행을 헤더로 보고 금액/팀 필드를 찾은 뒤 해당 컬럼 값만 수집한다.
+    값이 하나도 없는 행은 건너뛰되, 인덱스는 건너뛴 행까지 센 원본 행 위치(헤더 다음 행이 0)로 둔다.
+    """
+    from openpyxl import load_workbook
     
-    # 중복 제거
-    available_columns = list(dict.fromkeys(available_columns))
+    print(f"'{input_file}' 엑셀 파일 로딩 중 (필요한 컬럼만 읽기)...")
+    workbook = load_workbook(input_file, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, ())
+        analysis = header_analyzer.analyze([f"Unnamed: {i}" if col is None else str(col) for i, col in enumerate(header)], config)
+        amount_field, team_fields, available_columns = analysis.amount_field, list(analysis.team_fields), list(analysis.available_columns)
+        
+        positions = [analysis.columns.index(col) for col in available_columns]
+        index, data = [], []
+        for position, row in enumerate(rows):
+            if any(value is not None for value in row):
+                index.append(position)
+                data.append([row[i] if i < len(row) else None for i in positions])
+    finally:
+        workbook.close()
+    
+    rental_df = pd.DataFrame(data, columns=available_columns, index=index)
+    print(f"로딩 완료: {len(rental_df)}개 행 발견")
+    return rental_df, amount_field, team_fields, available_columns
+
+
+def _read_with_detected_encoding(input_file: str, read: Callable[[str], Any], run_info: Optional[Dict[str, Any]]) -> Any:
+    """
+    파일 앞부분으로 인코딩을 판별한 뒤 read(encoding)를 한 번 실행
     
-    print(f"사용할 컬럼: {available_columns}")
+    앞부분은 UTF-8이었지만 뒤쪽에서 디코딩에 실패한 경우에만 CP949로 한 번 더 읽는다.
+    """
+    encoding = detect_encoding(input_file)
+    try:
+        result = read(encoding)
+    except UnicodeDecodeError as e:
+        if encoding == cfg.INPUT_FALLBACK_ENCODING:
+            print(f"파일 로드 실패: {e}")
+            raise
+        print(f"{encoding.upper()} 디코딩 실패 - {cfg.INPUT_FALLBACK_ENCODING.upper()} 인코딩으로 다시 읽습니다.")
+        encoding = cfg.INPUT_FALLBACK_ENCODING
+        result = read(encoding)
+    
+    print(f"{encoding.upper()} 인코딩으로 파일 로드 성공")
+    _record(run_info, encoding=encoding)
+    return result
+
+
+def _stream_csv(input_file: str, encoding: str, chunksize: int, config: Dict[str, Any], mapping_table: pd.DataFrame,
+                matcher: Optional[TeamNameMatcher] = None, corrections: Optional[Dict[Any, str]] = None) -> Tuple[List[pd.DataFrame], int, int, int, List[Any], str, List[str], List[str]]:
+    """
+    지정한 인코딩으로 CSV를 청크 단위로 읽어 전처리 결과 누적 (디코딩 실패 시 UnicodeDecodeError)
+    """
+    header = pd.read_csv(input_file, encoding=encoding, nrows=0).columns.tolist()
+    analysis = header_analyzer.analyze([str(col) for col in header], config)
+    columns = analysis.columns
+    amount_field, team_fields, available_columns = analysis.amount_field, list(analysis.team_fields), list(analysis.available_columns)
+    
+    # 필요한 컬럼의 파일 내 위치만 자료형 계획대로 읽음
+    positions, dtypes = _column_plan(header, analysis)
+    
+    filtered_chunks = []
+    unmapped_teams = []
+    total_rows = 0
+    invalid_rows = 0
+    credit_total = 0
+    
+    reader = pd.read_csv(input_file, encoding=encoding, usecols=positions, dtype=dtypes, chunksize=chunksize, skip_blank_lines=False)
+    for chunk in reader:
+        chunk.columns = [columns[i] for i in positions]
+        chunk = _drop_blank_rows(chunk)
+        df, df_filtered, chunk_invalid = _preprocess_frame(chunk[available_columns].copy(), amount_field, team_fields, config, mapping_table,
+                                                           verbose=False, matcher=matcher, corrections=corrections)
+        
+        invalid_rows += chunk_invalid
+        total_rows += len(df)
+        credit_total += int(df_filtered["금액"].sum())
+        if len(df_filtered) < len(df):
+            unmapped_teams.extend(df[~df.index.isin(df_filtered.index)]["원본팀명"].unique())
+        filtered_chunks.append(df_filtered)
+    
+    return filtered_chunks, total_rows, invalid_rows, credit_total, unmapped_teams, amount_field, team_fields, available_columns
+
+
+def _preprocess_frame(df: pd.DataFrame, amount_field: str, team_fields: List[str], config: Dict[str, Any], mapping_table: pd.DataFrame, verbose: bool = True,
+                      matcher: Optional[TeamNameMatcher] = None, corrections: Optional[Dict[Any, str]] = None) -> Tuple[pd.DataFrame, pd.DataFrame, int]:
+    """
+    금액 변환, 팀명 매핑, 적요/관리항목 생성 후 매핑된 행만 필터링
     
-    # 필요한 필드만 선택 (존재하는 컬럼만)
-    df = rental_df[available_columns].copy()
+    matcher를 주면 표기 차이만 있는 팀명은 보정하여 매핑하고 corrections에 기록한다.
     
+    Returns:
+        전처리된 데이터프레임, 필터링된 데이터프레임, 제외된(금액 없는) 행 수
+    """
     # 금액 필드 처리 - 간단한 방법으로 숫자만 추출
-    print(f"금액 필드 '{amount_field}' 데이터 처리 중...")
+    if verbose:
+        print(f"금액 필드 '{amount_field}' 데이터 처리 중...")
     
     # 숫자로 변환 가능한 값만 유효한 것으로 간주 (한 줄로 처리)
     valid_amount_mask = pd.to_numeric(df[amount_field], errors='coerce').notna()
     
     # 유효하지 않은 행 수 출력
-    invalid_rows = (~valid_amount_mask).sum()
-    if invalid_rows > 0:
+    invalid_rows = int((~valid_amount_mask).sum())
+    if invalid_rows > 0 and verbose:
         print(f"금액이 없거나 숫자가 아닌 행(반납 항목) {invalid_rows}개를 제외합니다.")
     
     # 유효한 행만 선택
@@ -193,60 +340,141 @@ def load_and_preprocess_data(input_file: str, config: Dict[str, Any], mapping_di
     
     # 금액 변환 - 단순화된 방법
     df["금액"] = pd.to_numeric(df[amount_field], errors='coerce')
-    df["금액"] = df["금액"].astype(int)
-    print(f"금액 변환 성공: 샘플 값 = {df['금액'].head().tolist()}")
+    df["금액"] = df["금액"].astype("int64")
+    if verbose:
+        print(f"금액 변환 성공: 샘플 값 = {df['금액'].head().tolist()}")
     
-    # 팀명 처리 (우선순위에 따라)
+    # 팀명 처리 (우선순위에 따라) - 범주가 서로 다른 팀 필드는 값으로 합친 뒤 다시 범주형으로
     if team_fields:
-        df["원본팀명"] = df[team_fields[0]].copy()
+        team_names = df[team_fields[0]]
         for field in team_fields[1:]:
-            df["원본팀명"] = df["원본팀명"].combine_first(df[field])
+            team_names = team_names.astype(object).combine_first(df[field].astype(object))
+        df["원본팀명"] = team_names.astype(CATEGORY_DTYPE)
     
-    # 매핑 적용
-    df["매핑정보"] = df["원본팀명"].apply(lambda x: mapping_utils.apply_mapping(x, mapping_dict))
+    # 매핑 적용 - 조회 테이블과 한 번에 조인하여 세 필드를 동시에 생성
+    mapped = mapping_utils.resolve_mapping(df["원본팀명"], mapping_table, matcher, corrections)
     
-    # 매핑 정보에서 필드 추출
-    df["팀명"] = df["매핑정보"].apply(lambda x: x["present"])
-    df["CD_ACCT"] = df["매핑정보"].apply(lambda x: x["CD_ACCT"])
+    df["팀명"] = mapped["present"].astype(CATEGORY_DTYPE)
+    df["CD_ACCT"] = mapped["CD_ACCT"].astype(CATEGORY_DTYPE)
     
-    # CD_PJT를 정수형으로 변환하는 부분
-    df["CD_PJT"] = df["매핑정보"].apply(lambda x: x["CD_PJT"])
-    # 문자열이나 NaN 값 처리 후 정수형으로 변환
-    df["CD_PJT"] = pd.to_numeric(df["CD_PJT"], errors='coerce').fillna(1000).astype(int)
+    # CD_PJT: 문자열이나 빈 값 처리 후 정수형으로 변환
+    df["CD_PJT"] = pd.to_numeric(mapped["CD_PJT"], errors='coerce').fillna(cfg.DEFAULT_PROJECT_CODE).astype("int64")
     
-    # 적요 생성
-    df["적요"] = f"{config['note_prefix']}(" + df["팀명"] + ")"
+    # 적요 생성 - 고유 팀명마다 한 번만 만들고 팀명의 범주 코드를 그대로 사용
+    team = df["팀명"].cat
+    df["적요"] = pd.Categorical.from_codes(team.codes, f"{config['note_prefix']}(" + team.categories.astype(object) + ")")
     
     # MNG 코드 설정
-    df["CD_MNG1"] = config['cost_center']  # 코스트센터
-    df["CD_MNG3"] = config['partner_code']  # 거래처 코드
+    df["CD_MNG1"] = _constant_category(config['cost_center'], len(df))  # 코스트센터
+    df["CD_MNG3"] = _constant_category(config['partner_code'], len(df))  # 거래처 코드
     
     # 매핑된 항목만 선택 (CD_ACCT와 CD_PJT가 있는 항목만)
     df_filtered = df[(df["CD_ACCT"] != "") & (df["CD_PJT"] != "")].copy()
     
-    # 매핑되지 않은 팀명 정보 출력
-    if len(df_filtered) < len(df):
-        unmapped_teams = df[~df.index.isin(df_filtered.index)]["원본팀명"].unique()
-        print(f"매핑되지 않은 팀명 {len(unmapped_teams)}개:")
-        for team in unmapped_teams:
-            print(f"- '{team}'")
+    return df, df_filtered, invalid_rows
+
+
+def _constant_category(value: Any, length: int) -> pd.Categorical:
+    """
+    모든 행이 같은 값인 범주형 컬럼 값
+    """
+    return pd.Categorical.from_codes(np.zeros(length, dtype=np.int8), [value])
+
+
+def _record(run_info: Optional[Dict[str, Any]], **values: Any) -> None:
+    """
+    run_info 딕셔너리가 주어진 경우에만 실행 정보 기록
+    """
+    if run_info is not None:
+        run_info.update(values)
+
+
+def _report_corrected_teams(corrections: Dict[Any, str]) -> None:
+    """
+    표기 차이를 보정하여 매핑한 팀명 출력
+    """
+    if not corrections:
+        return
+    print(f"표기 차이를 보정하여 매핑한 팀명 {len(corrections)}개:")
+    for team, key in corrections.items():
+        print(f"- '{team}' -> '{key}'")
+
+
+def _report_unmapped_teams(unmapped_teams: List[Any], mapped_count: int, suggestions: Optional[Dict[Any, Any]] = None) -> None:
+    """
+    매핑되지 않은 팀명 출력 (유사한 매핑 팀명 후보 포함, 전체가 매핑되지 않은 경우 오류 발생)
+    """
+    suggestions = suggestions or {}
+    print(f"매핑되지 않은 팀명 {len(unmapped_teams)}개:")
+    for team in unmapped_teams:
+        print(f"- '{team}'{format_suggestions(suggestions.get(team))}")
+    
+    # 매핑되지 않은 항목이 있으면 경고 (전체 다 매핑 안 되는 경우만 오류)
+    if mapped_count == 0:
+        raise ValueError("모든 팀명이 매핑되지 않았습니다. 매핑 파일을 확인해주세요.")
+
+
+def aggregate_lines(df_filtered: pd.DataFrame) -> Tuple[pd.DataFrame, np.ndarray]:
+    """
+    차변 라인 집계 (cfg.VOUCHER_AGGREGATE_KEYS 값이 같은 행을 금액 합계 한 라인으로)
+    
+    그룹은 처음 나온 순서대로 라인이 되며, 결과는 df_filtered 대신 build_compact_voucher에 그대로 넘길 수 있다.
+    
+    Args:
+        df_filtered: 필터링된 데이터프레임
         
-        # 매핑되지 않은 항목이 있으면 경고 (전체 다 매핑 안 되는 경우만 오류)
-        if len(df_filtered) == 0:
-            raise ValueError("모든 팀명이 매핑되지 않았습니다. 매핑 파일을 확인해주세요.")
+    Returns:
+        집계된 데이터프레임 (columns=[CD_ACCT, CD_PJT, 적요, 금액, 건수]),
+        df_filtered 행별 전표 라인 번호 배열 (1부터, 전표의 NO_DOLINE과 같음)
+    """
+    grouped = df_filtered.groupby(cfg.VOUCHER_AGGREGATE_KEYS, sort=False, observed=True, dropna=False)
+    lines = grouped["금액"].agg(["sum", "size"]).reset_index().rename(columns={"sum": "금액", "size": "건수"})
+    line_numbers = grouped.ngroup().to_numpy() + 1
+    print(f"차변 라인 집계: {len(df_filtered)}개 행 → {len(lines)}개 라인")
+    return lines, line_numbers
+
+
+def build_drilldown(df_filtered: pd.DataFrame, line_numbers: np.ndarray, document_numbers: Optional[List[str]] = None,
+                    part_sizes: Optional[List[int]] = None) -> pd.DataFrame:
+    """
+    집계 전표의 라인별 원본 행 내역 (상세 내역 파일용)
     
-    print(f"매핑된 항목: {len(df_filtered)}개 / 전체 {len(df)}개")
+    전표를 나눈 경우(document_numbers, part_sizes) 전표번호 컬럼을 붙이고 라인 번호를 전표별 번호로 바꾼다.
     
-    return df, df_filtered
+    Args:
+        df_filtered: 필터링된 데이터프레임
+        line_numbers: aggregate_lines가 반환한 행별 전표 라인 번호
+        document_numbers: 전표번호 목록 (선택, build_split_vouchers 결과)
+        part_sizes: 전표별 차변 라인 수 (document_numbers와 같은 길이)
+        
+    Returns:
+        [전표번호,] 전표라인, 원본행번호(헤더가 1행인 입력 파일 기준, 로더가 인덱스에 남긴 원본 행 위치 + 2), 기본 컬럼과 매핑 결과 컬럼
+        (전표라인 순, 같은 라인은 원본 순서)
+    """
+    columns = [col for col in REQUIRED_COLUMNS + ["원본팀명", "팀명", "CD_ACCT", "CD_PJT", "적요", "금액"] if col in df_filtered.columns]
+    drilldown = df_filtered[columns].copy()
+    drilldown.insert(0, "원본행번호", df_filtered.index + 2)
+    drilldown.insert(0, "전표라인", line_numbers)
+    drilldown = drilldown.sort_values("전표라인", kind="stable")
+    
+    if document_numbers is not None:
+        # 전체 라인 번호 → (전표, 전표 안의 라인 번호)
+        starts = np.concatenate([[0], np.cumsum(part_sizes)[:-1]])
+        parts = np.searchsorted(starts, drilldown["전표라인"].to_numpy() - 1, side="right") - 1
+        drilldown["전표라인"] = drilldown["전표라인"].to_numpy() - starts[parts]
+        drilldown.insert(0, "전표번호", np.asarray(document_numbers, dtype=object)[parts])
+    return drilldown
 
 
-def summarize_data(df_filtered: pd.DataFrame, mapping_dict: Dict[str, Dict[str, str]]) -> Dict[str, Any]:
+def summarize_data(df_filtered: pd.DataFrame, mapping_dict: Dict[str, Dict[str, str]],
+                   corrections: Optional[Dict[Any, str]] = None) -> Dict[str, Any]:
     """
     데이터 요약 정보 생성
     
     Args:
         df_filtered: 필터링된 데이터프레임
         mapping_dict: 매핑 딕셔너리
+        corrections: 표기 차이를 보정하여 매핑한 팀명 {원본 팀명: 매핑 팀명}
         
     Returns:
         데이터 요약 정보
@@ -254,10 +482,10 @@ def summarize_data(df_filtered: pd.DataFrame, mapping_dict: Dict[str, Dict[str,
     total_amount = df_filtered["금액"].sum()
     
     # 매핑 결과 요약
-    mapping_summary = mapping_utils.get_mapping_summary(df_filtered, mapping_dict)
+    mapping_summary = mapping_utils.get_mapping_summary(df_filtered, mapping_dict, corrections)
     
-    # 계정 사용 현황
-    account_counts = df_filtered['CD_ACCT'].value_counts().to_dict()
+    # 계정 사용 현황 (범주형이면 사용되지 않은 범주까지 세므로 값 기준으로 집계)
+    account_counts = df_filtered['CD_ACCT'].astype(object).value_counts().to_dict()
     
     return {
         'total_count': len(df_filtered),
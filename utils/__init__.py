@@ -1,4 +1,53 @@
-from utils.file_utils import ensure_directory_exists
-from utils.excel_utils import save_to_files, save_to_csv, save_to_excel
-from utils.template_utils import load_erp_form_template, prepare_file_with_template
-from utils.reporting_utils import print_data_summary, generate_report_file
\ No newline at end of file
+"""
+공용 유틸리티 (하위 모듈은 처음 사용할 때 로드)
+
+from utils import save_to_files 처럼 사용하면 해당 모듈만 그때 import되므로
+utils.job_utils 등 가벼운 모듈만 쓰는 곳에서 pandas/xlwt를 함께 로드하지 않는다.
+"""
+import importlib
+
+# 이름: 정의된 하위 모듈
+_EXPORTS = {
+    'ensure_directory_exists': 'utils.file_utils',
+    'zip_files': 'utils.file_utils',
+    'FileCache': 'utils.cache_utils',
+    'file_cache': 'utils.cache_utils',
+    'ResultCache': 'utils.cache_utils',
+    'result_cache': 'utils.cache_utils',
+    'file_digest': 'utils.cache_utils',
+    'save_to_files': 'utils.excel_utils',
+    'save_to_csv': 'utils.excel_utils',
+    'save_to_excel': 'utils.excel_utils',
+    'write_excel_file': 'utils.excel_utils',
+    'write_voucher_csv': 'utils.excel_utils',
+    'drilldown_path': 'utils.excel_utils',
+    'part_path': 'utils.excel_utils',
+    'save_parts_to_files': 'utils.excel_utils',
+    'write_excel_parts': 'utils.excel_utils',
+    'save_drilldown_file': 'utils.excel_utils',
+    'frame_to_rows': 'utils.excel_utils',
+    'load_erp_form_template': 'utils.template_utils',
+    'prepare_file_with_template': 'utils.template_utils',
+    'print_data_summary': 'utils.reporting_utils',
+    'generate_report_file': 'utils.reporting_utils',
+    'StageProfiler': 'utils.profile_utils',
+    'write_profile': 'utils.profile_utils',
+    'format_profile': 'utils.profile_utils',
+    'run_batch': 'utils.batch_utils',
+    'parallel_map': 'utils.batch_utils',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module 'utils' has no attribute '{name}'")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value  # 다음 조회부터는 모듈 속성으로 바로 찾음
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
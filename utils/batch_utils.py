@@ -0,0 +1,121 @@
+"""
+여러 변환 작업을 프로세스 풀에서 병렬 실행하는 배치 유틸리티
+"""
+import os
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+def run_batch(jobs: List[Dict[str, Any]], worker: Callable[[Dict[str, Any]], Dict[str, Any]], max_workers: int = 1,
+              manifest_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    작업 목록을 병렬 실행하고 작업별 상태/시간을 모은 실행 목록(manifest) 반환
+
+    각 작업은 별도 프로세스에서 실행되므로 한 작업이 실패하거나 프로세스가 죽어도
+    나머지 작업은 계속 진행된다. max_workers가 1이면 프로세스 풀 없이 현재 프로세스에서
+    순서대로 실행한다.
+
+    Args:
+        jobs: 작업 정보 딕셔너리 목록 (각각 고유한 'job_id' 포함, 프로세스 간 전달 가능해야 함)
+        worker: 작업 정보를 받아 결과 딕셔너리를 반환하는 모듈 수준 함수 ('status' 포함)
+        max_workers: 동시에 실행할 최대 프로세스 수
+        manifest_path: 실행 목록을 저장할 JSON 경로 (선택)
+
+    Returns:
+        {started_at, wall_sec, max_workers, job_count, succeeded, failed, sum_job_sec, jobs}
+    """
+    started_at = datetime.now()
+    start = time.perf_counter()
+    records: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+    done = 0
+    max_workers = max(1, min(max_workers, len(jobs))) if jobs else 1
+
+    print(f"배치 작업 {len(jobs)}개 시작 (동시 실행 {max_workers}개)")
+    if max_workers == 1:
+        for index, job in enumerate(jobs):
+            records[index] = _run_job(worker, job)
+            _print_progress(records[index], index + 1, len(jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(_run_job, worker, job): index for index, job in enumerate(jobs)}
+            for future in as_completed(futures):
+                index = futures[future]
+                job = jobs[index]
+                try:
+                    record = future.result()
+                except Exception as e:
+                    # 작업 프로세스가 비정상 종료된 경우 (메모리 부족 등)
+                    record = {**job, 'status': 'failed', 'error': f"작업 프로세스 오류: {e}"}
+                records[index] = record
+                done += 1
+                _print_progress(record, done, len(jobs))
+
+    # 결과는 등록 순서대로 (작업 위치 기준)
+    ordered = records
+    manifest = {
+        'started_at': started_at.isoformat(timespec='seconds'),
+        'wall_sec': round(time.perf_counter() - start, 3),
+        'max_workers': max_workers,
+        'job_count': len(jobs),
+        'succeeded': sum(1 for record in ordered if record.get('status') == 'ok'),
+        'failed': sum(1 for record in ordered if record.get('status') != 'ok'),
+        'sum_job_sec': round(sum(record.get('wall_sec', 0.0) for record in ordered), 3),
+        'jobs': ordered,
+    }
+
+    if manifest_path:
+        manifest_dir = os.path.dirname(manifest_path)
+        if manifest_dir:
+            os.makedirs(manifest_dir, exist_ok=True)
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        manifest['manifest_path'] = manifest_path
+
+    print(f"배치 완료: 성공 {manifest['succeeded']}개, 실패 {manifest['failed']}개, "
+          f"전체 {manifest['wall_sec']:.1f}초 (작업 시간 합계 {manifest['sum_job_sec']:.1f}초)")
+    return manifest
+
+
+def parallel_map(func: Callable[..., Any], arg_list: List[Tuple[Any, ...]], max_workers: int = 1) -> List[Any]:
+    """
+    인자 묶음마다 func를 프로세스 풀에서 실행하고 결과를 입력 순서대로 반환
+
+    작업이 하나뿐이거나 max_workers가 1이면 프로세스 풀 없이 현재 프로세스에서 순서대로 실행한다.
+    예외는 그대로 전달된다.
+
+    Args:
+        func: 모듈 수준 함수 (프로세스 간 전달 가능해야 함)
+        arg_list: func에 넘길 위치 인자 튜플 목록
+        max_workers: 동시에 실행할 최대 프로세스 수
+
+    Returns:
+        결과 목록 (arg_list 순서)
+    """
+    max_workers = max(1, min(max_workers, len(arg_list)))
+    if max_workers == 1:
+        return [func(*args) for args in arg_list]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(func, *args) for args in arg_list]
+        return [future.result() for future in futures]
+
+
+def _run_job(worker: Callable[[Dict[str, Any]], Dict[str, Any]], job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    작업 하나를 실행하고 예외를 실패 결과로 변환 (작업 프로세스에서 실행)
+    """
+    start = time.perf_counter()
+    try:
+        record = {**job, 'status': 'ok', **worker(job)}
+    except Exception as e:
+        record = {**job, 'status': 'failed', 'error': str(e)}
+    record['wall_sec'] = round(time.perf_counter() - start, 3)
+    record['pid'] = os.getpid()
+    return record
+
+
+def _print_progress(record: Dict[str, Any], done: int, total: int) -> None:
+    status = "성공" if record.get('status') == 'ok' else f"실패 - {record.get('error')}"
+    print(f"[{done}/{total}] {record['job_id']}: {status} ({record.get('wall_sec', 0.0):.1f}초)")
@@ -0,0 +1,304 @@
+"""
+파일 로드 결과 캐시 유틸리티
+"""
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from core import config as cfg
+
+
+class FileCache:
+    """
+    파싱된 파일 내용을 프로세스 메모리에 보관하는 LRU 캐시
+
+    파일의 수정시각(mtime)과 크기가 그대로면 저장된 객체를 그대로 돌려주고,
+    바뀌었을 때만 다시 로드한다. 항목 수가 max_entries를 넘으면 가장 오래
+    사용하지 않은 항목부터 제거한다. 반환 객체는 호출자 간에 공유되므로 수정하지 않는다.
+    """
+
+    def __init__(self, max_entries: int = 16):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Tuple[int, int], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, file_path: str, loader: Callable[[str], Any], namespace: str = "default") -> Any:
+        """
+        캐시된 객체 반환 (없거나 파일이 바뀌었으면 loader로 로드 후 저장)
+
+        Args:
+            file_path: 파일 경로
+            loader: 파일 경로를 받아 파싱된 객체를 반환하는 함수 (실패 시 예외 발생)
+            namespace: 같은 파일을 다른 방식으로 로드할 때 구분하는 이름
+
+        Returns:
+            파싱된 객체
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            # 파일이 없으면 캐시하지 않고 loader가 오류를 처리하도록 넘김
+            with self._lock:
+                self.misses += 1
+            return loader(file_path)
+
+        key = (namespace, os.path.abspath(file_path))
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        value = loader(file_path)
+
+        with self._lock:
+            self._entries[key] = (signature, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+        return value
+
+    def invalidate(self, file_path: Optional[str] = None) -> None:
+        """
+        캐시 항목 제거 (file_path가 없으면 전체 제거)
+        """
+        with self._lock:
+            if file_path is None:
+                self._entries.clear()
+                return
+            abs_path = os.path.abspath(file_path)
+            for key in [key for key in self._entries if key[1] == abs_path]:
+                del self._entries[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        캐시 사용 통계 반환
+
+        Returns:
+            {hits, misses, evictions, entries, max_entries, hit_rate}
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hit_rate': self.hits / total if total else 0.0,
+            }
+
+
+# 매핑 파일, ERP 양식 등이 함께 사용하는 프로세스 공용 캐시
+file_cache = FileCache(max_entries=cfg.FILE_CACHE_MAX_ENTRIES)
+
+
+def file_digest(file_path: str, block_size: int = 1024 * 1024) -> str:
+    """
+    파일 내용의 SHA-256 해시 (경로나 수정시각이 달라도 내용이 같으면 같은 값)
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    처리 결과를 디스크에 pickle로 보관하는 캐시
+
+    키는 입력 파일 내용 해시 등으로 만들므로 웹 업로드처럼 같은 파일이 매번 다른 임시 경로로
+    들어와도 재사용된다. 전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터
+    삭제하고, max_age_sec보다 오래 사용하지 않은 항목은 조회/저장 시 삭제한다. 파일은 임시 파일에
+    쓴 뒤 이름을 바꿔 저장하므로 여러 프로세스가 같은 폴더를 함께 써도 깨진 항목을 읽지 않는다.
+    """
+
+    SUFFIX = '.pkl'
+
+    def __init__(self, cache_dir: str, max_bytes: int, max_age_sec: float, version: Any = 1):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age_sec = max_age_sec
+        self.version = version
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def make_key(self, files: Iterable[str], params: Dict[str, Any]) -> str:
+        """
+        파일 내용과 설정값으로 캐시 키 생성
+
+        Args:
+            files: 결과에 영향을 주는 파일 경로 목록 (내용 해시 사용)
+            params: 결과에 영향을 주는 설정값 (JSON으로 직렬화 가능한 값)
+
+        Returns:
+            16진수 키 문자열
+        """
+        digest = hashlib.sha256()
+        digest.update(f"v{self.version}".encode())
+        for file_path in files:
+            digest.update(file_digest(file_path).encode())
+        digest.update(json.dumps(params, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8'))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + self.SUFFIX)
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        저장된 결과 반환 (없거나 만료/손상되었으면 None)
+        """
+        path = self._path(key)
+        expired = False
+        try:
+            stat = os.stat(path)
+            if time.time() - stat.st_mtime > self.max_age_sec:
+                expired = True
+                self._remove(path)
+                raise FileNotFoundError(path)
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+            # 사용 시각 갱신 (크기 초과 시 오래 안 쓴 항목부터 삭제하는 기준)
+            os.utime(path)
+        except FileNotFoundError:
+            value = None
+        except Exception as e:
+            print(f"결과 캐시 읽기 실패 ({e}) - 항목을 삭제하고 다시 처리합니다.")
+            self._remove(path)
+            value = None
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            if expired:
+                self.evictions += 1
+        return value
+
+    def put(self, key: str, value: Any) -> bool:
+        """
+        결과 저장 후 크기/기간 제한에 맞게 정리
+
+        Returns:
+            저장 여부 (저장 실패 또는 한 항목이 최대 크기를 넘으면 False)
+        """
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix='.tmp_', dir=self.cache_dir)
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+                if os.path.getsize(tmp_path) > self.max_bytes:
+                    os.remove(tmp_path)
+                    return False
+                os.replace(tmp_path, self._path(key))
+            except BaseException:
+                self._remove(tmp_path)
+                raise
+        except Exception as e:
+            print(f"결과 캐시 저장 실패: {e}")
+            return False
+
+        with self._lock:
+            self.stores += 1
+        self.evict()
+        return True
+
+    def _entries(self) -> List[Tuple[str, float, int]]:
+        """
+        (경로, 마지막 사용 시각, 크기) 목록
+        """
+        entries = []
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return entries
+        for name in names:
+            if not name.endswith(self.SUFFIX):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((path, stat.st_mtime, stat.st_size))
+        return entries
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def evict(self) -> int:
+        """
+        기간이 지난 항목과 크기 제한을 넘는 오래된 항목 삭제
+
+        Returns:
+            삭제한 항목 수
+        """
+        now = time.time()
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+        removed = 0
+        for path, used_at, size in entries:
+            if now - used_at <= self.max_age_sec and total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+            removed += 1
+        with self._lock:
+            self.evictions += removed
+        return removed
+
+    def clear(self) -> None:
+        """
+        모든 항목 삭제
+        """
+        for path, _, _ in self._entries():
+            self._remove(path)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        캐시 사용 통계 반환 (적중/미스 등은 이 프로세스 기준, 항목 수/크기는 디스크 기준)
+
+        Returns:
+            {hits, misses, stores, evictions, entries, bytes, max_bytes, hit_rate}
+        """
+        entries = self._entries()
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'stores': self.stores,
+                'evictions': self.evictions,
+                'entries': len(entries),
+                'bytes': sum(size for _, _, size in entries),
+                'max_bytes': self.max_bytes,
+                'hit_rate': self.hits / total if total else 0.0,
+            }
+
+
+# 입력 파일별 전처리 결과(df_filtered)를 보관하는 디스크 캐시
+result_cache = ResultCache(cfg.RESULT_CACHE_DIR, cfg.RESULT_CACHE_MAX_BYTES, cfg.RESULT_CACHE_MAX_AGE_SEC,
+                           version=cfg.RESULT_CACHE_VERSION)
@@ -1,16 +1,21 @@
 """
 Excel 파일 처리 유틸리티
 """
+import csv
 import os
+import itertools
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, List, Union
 from core import config as cfg
-from pyexcel_xls import save_data
-from collections import OrderedDict
+from core.voucher import CompactVoucher
+import xlwt
 
-def save_to_csv(df: pd.DataFrame, output_path: str, data_count: int = 0) -> bool:
+def save_to_csv(df: Union[pd.DataFrame, CompactVoucher], output_path: str, data_count: int = 0) -> bool:
     try:
-        df.to_csv(output_path, index=False, encoding=cfg.CSV_OUTPUT_ENCODING)
+        if isinstance(df, CompactVoucher):
+            write_voucher_csv(df, output_path)
+        else:
+            df.to_csv(output_path, index=False, encoding=cfg.CSV_OUTPUT_ENCODING)
         print(f"처리 완료: {data_count}개 행이 '{output_path}'에 저장됨 ({cfg.CSV_OUTPUT_ENCODING} 인코딩)")
         print(f"데이터는 {cfg.ERP_DATA_ROW_START}행부터 시작합니다.")
         return True
@@ -18,43 +23,190 @@ def save_to_csv(df: pd.DataFrame, output_path: str, data_count: int = 0) -> bool
         print(f"CSV 파일 저장 중 오류 발생: {e}")
         return False
 
-def save_to_excel(df: pd.DataFrame, output_path: str, data_count: int = 0) -> bool:
-    try:
-        # Excel 97-2003 형식(.xls)으로 저장
-        xls_path = output_path.replace('.xlsx', '.xls')
-        
-        # 데이터프레임을 리스트로 변환
-        headers = df.columns.tolist()
-        data = [headers]  # 헤더를 첫 번째 행으로 추가
+def write_voucher_csv(voucher: CompactVoucher, output_path: str, chunk_rows: int = cfg.VOUCHER_WRITE_CHUNK_ROWS) -> None:
+    """
+    압축 전표를 CSV로 스트리밍 저장 (전체 데이터프레임을 만들지 않음)
+    
+    헤더와 양식 행을 먼저 쓰고, 전표 라인은 chunk_rows 라인씩 컬럼 값 배열을 만들어
+    csv 모듈로 바로 기록한다. 최대 메모리는 전표 크기와 관계없이 한 조각 분량이며,
+    결과 파일은 데이터프레임을 to_csv로 저장한 것과 같다 (결측값은 빈 칸).
+    
+    Args:
+        voucher: 저장할 압축 전표
+        output_path: 출력 CSV 경로
+        chunk_rows: 한 번에 만들 전표 라인 수
+    """
+    nullable = set(voucher.nullable_columns())
+    with open(output_path, 'w', encoding=cfg.CSV_OUTPUT_ENCODING, newline='') as f:
+        # to_csv 기본값과 같은 줄바꿈(os.linesep)을 헤더/양식 행과 전표 라인에 함께 사용
+        writer = csv.writer(f, lineterminator=os.linesep)
+        if voucher.prelude is not None:
+            voucher.prelude.to_csv(f, index=False, lineterminator=os.linesep)
+        else:
+            writer.writerow(voucher.columns)
         
-        # 데이터프레임의 각 행을 리스트로 변환하여 data에 추가
-        for _, row in df.iterrows():
-            data.append(row.tolist())
+        for start in range(0, voucher.line_count, chunk_rows):
+            stop = min(start + chunk_rows, voucher.line_count)
+            columns = []
+            for col in voucher.columns:
+                values = voucher.column_values(col, start, stop)
+                if col in nullable:
+                    values[pd.isna(values)] = ""
+                columns.append(values)
+            writer.writerows(zip(*columns))
+
+def part_path(output_path: str, index: int, count: int) -> str:
+    """
+    분할 전표 파일 경로 (전표가 하나면 원래 경로, 여러 개면 파일명 뒤에 _01, _02 ...)
+    """
+    if count == 1:
+        return output_path
+    base, extension = os.path.splitext(output_path)
+    return f"{base}_{index + 1:02d}{extension}"
+
+def drilldown_path(output_path: str) -> str:
+    """
+    출력 파일에 대응하는 상세 내역 파일 경로 (같은 폴더, 파일명 뒤에 cfg.DRILLDOWN_FILE_SUFFIX, CSV)
+    """
+    return os.path.splitext(output_path)[0] + cfg.DRILLDOWN_FILE_SUFFIX + '.csv'
+
+def save_drilldown_file(drilldown: pd.DataFrame, output_path: str) -> str:
+    """
+    집계 전표의 라인별 원본 행 내역 저장
+    
+    Args:
+        drilldown: build_drilldown으로 만든 상세 내역 데이터프레임
+        output_path: 전표 출력 파일 경로 (상세 내역 파일은 drilldown_path 경로에 저장)
         
-        # OrderedDict 생성 (Sheet1이라는 이름의 시트에 데이터 저장)
-        data_dict = OrderedDict()
-        data_dict["Sheet1"] = data
+    Returns:
+        저장된 상세 내역 파일 경로
+    """
+    path = drilldown_path(output_path)
+    drilldown.to_csv(path, index=False, encoding=cfg.CSV_OUTPUT_ENCODING)
+    print(f"상세 내역 저장: {len(drilldown)}개 행이 '{path}'에 저장됨 (전표라인별 원본 행)")
+    return path
+
+def frame_to_rows(df: Union[pd.DataFrame, CompactVoucher]) -> Iterable[List[Any]]:
+    """
+    데이터프레임을 [헤더, 행1, 행2, ...] 형태의 리스트로 한 번에 변환
+    
+    압축 전표는 전체를 한 번에 만들지 않고 행을 차례로 만들어 내는 이터레이터를 반환한다.
+    
+    Args:
+        df: 변환할 데이터프레임 또는 압축 전표
         
-        # xls 파일로 저장
-        save_data(xls_path, data_dict)
+    Returns:
+        헤더를 첫 행으로 하는 2차원 리스트 (압축 전표면 같은 순서의 이터레이터)
+    """
+    if isinstance(df, CompactVoucher):
+        return itertools.chain([list(df.columns)], df.iter_rows())
+    return [df.columns.tolist()] + df.values.tolist()
+
+def _write_xls(rows: Iterable[List[Any]], xls_path: str) -> None:
+    """
+    xlwt로 xls 파일 직접 저장
+    
+    빈 문자열/None 셀은 기록하지 않는다 (Excel과 xlrd 모두 빈 셀로 읽으므로 값은 같고,
+    140여 개 컬럼 대부분이 비어 있는 ERP 양식에서 셀 기록 수가 크게 줄어든다).
+    """
+    workbook = xlwt.Workbook(style_compression=2)
+    sheet = workbook.add_sheet("Sheet1")
+    for row_index, row in enumerate(rows):
+        sheet_row = sheet.row(row_index)
+        for col_index, value in enumerate(row):
+            if value is None or (isinstance(value, str) and not value):
+                continue
+            sheet_row.write(col_index, value)
+    workbook.save(xls_path)
+
+def _write_xlsx(rows: Iterable[List[Any]], xlsx_path: str) -> None:
+    """
+    openpyxl 쓰기 전용 모드로 xlsx 파일 저장 (행 단위 스트리밍)
+    
+    빈 문자열과 NaN은 빈 셀(None)로 기록한다.
+    """
+    from openpyxl import Workbook
+    
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Sheet1")
+    for row in rows:
+        sheet.append([None if (value == "" or value != value) else value for value in row])
+    workbook.save(xlsx_path)
+
+def write_excel_file(df: Union[pd.DataFrame, CompactVoucher], output_path: str) -> str:
+    """
+    Excel 97-2003 형식(.xls)으로 저장, 불가능하면 .xlsx로 저장
+    
+    .xls는 시트당 행 수 제한(cfg.XLS_MAX_ROWS)이 있으므로 이를 넘으면 바로 .xlsx로 저장한다.
+    
+    Args:
+        df: 저장할 데이터프레임 또는 압축 전표
+        output_path: 출력 파일 경로 (확장자는 저장 형식에 맞게 바뀜)
         
-        print(f"처리 완료: {data_count}개 행이 '{xls_path}'에 저장됨")
-        print(f"엑셀 파일이 성공적으로 생성되었습니다: {os.path.abspath(xls_path)}")
+    Returns:
+        실제로 저장된 파일 경로
+    """
+    base_path = os.path.splitext(output_path)[0]
+    
+    if len(df) + 1 <= cfg.XLS_MAX_ROWS:
+        xls_path = base_path + '.xls'
+        try:
+            _write_xls(frame_to_rows(df), xls_path)
+            print(f"Excel 97-2003 형식(.xls)으로 파일 저장 완료: {xls_path}")
+            return xls_path
+        except Exception as e:
+            print(f"Excel 97-2003 형식 저장 중 오류 발생: {e}")
+    else:
+        print(f"행 수({len(df) + 1}행)가 .xls 한도({cfg.XLS_MAX_ROWS}행)를 넘어 .xlsx 형식으로 저장합니다.")
+    
+    # 대체 저장 (일반 Excel 형식)
+    xlsx_path = base_path + '.xlsx'
+    _write_xlsx(frame_to_rows(df), xlsx_path)
+    print(f"대체 형식(.xlsx)으로 파일 저장 완료: {xlsx_path}")
+    return xlsx_path
+
+def save_to_excel(df: Union[pd.DataFrame, CompactVoucher], output_path: str, data_count: int = 0) -> bool:
+    try:
+        saved_path = write_excel_file(df, output_path)
+        print(f"처리 완료: {data_count}개 행이 '{saved_path}'에 저장됨")
+        print(f"엑셀 파일이 성공적으로 생성되었습니다: {os.path.abspath(saved_path)}")
         return True
     except Exception as e:
         print(f"엑셀 파일 저장 중 오류 발생: {e}")
+        return False
+
+def save_parts_to_files(parts: List[CompactVoucher], output_csv: str, output_excel: str, max_workers: int = 1) -> List[str]:
+    """
+    분할 전표를 전표별 CSV/엑셀 파일로 저장 (max_workers가 2 이상이고 여러 개면 프로세스 풀에서 동시에 저장)
+    
+    Args:
+        parts: 양식이 적용된 압축 전표 목록
+        output_csv: CSV 출력 경로 (전표가 여러 개면 part_path 규칙으로 번호를 붙임)
+        output_excel: 엑셀 출력 경로 (같은 규칙)
+        max_workers: 동시에 저장할 최대 프로세스 수 (1이면 차례로 저장)
         
-        # 대체 저장 시도 (일반 Excel 형식)
-        try:
-            backup_path = output_path
-            df.to_excel(backup_path, index=False, engine='openpyxl')
-            print(f"대체 형식(.xlsx)으로 파일 저장 완료: {backup_path}")
-            return True
-        except Exception as ex:
-            print(f"대체 저장도 실패: {ex}")
-            return False
+    Returns:
+        전표별 CSV 경로 목록
+    """
+    from utils.batch_utils import parallel_map
+    
+    count = len(parts)
+    arg_list = [(part, part_path(output_csv, i, count), part_path(output_excel, i, count), part.line_count)
+                for i, part in enumerate(parts)]
+    parallel_map(save_to_files, arg_list, max_workers)
+    return [args[1] for args in arg_list]
+
+def write_excel_parts(parts: List[CompactVoucher], output_path: str) -> List[str]:
+    """
+    분할 전표를 전표별 엑셀 파일로 차례로 저장
+    
+    Returns:
+        실제로 저장된 파일 경로 목록 (전표 순서)
+    """
+    count = len(parts)
+    return [write_excel_file(part, part_path(output_path, i, count)) for i, part in enumerate(parts)]
 
-def save_to_files(result_df: pd.DataFrame, output_csv: str, output_excel: str, erp_data_count: int) -> None:
+def save_to_files(result_df: Union[pd.DataFrame, CompactVoucher], output_csv: str, output_excel: str, erp_data_count: int) -> None:
     # CSV 파일 저장
     print(f"'{output_csv}'로 CSV 저장 중...")
     csv_saved = save_to_csv(result_df, output_csv, erp_data_count)
@@ -2,7 +2,10 @@
 파일 기본 처리 유틸리티
 """
 import os
-from typing import Dict, Any
+import codecs
+import zipfile
+from typing import Dict, Any, List
+from core import config as cfg
 
 def ensure_directory_exists(dir_path: str) -> None:
     """
@@ -13,4 +16,56 @@ def ensure_directory_exists(dir_path: str) -> None:
     """
     if not os.path.exists(dir_path):
         os.makedirs(dir_path)
-        print(f"디렉토리 생성: {dir_path}")
\ No newline at end of file
+        print(f"디렉토리 생성: {dir_path}")
+
+def detect_encoding(file_path: str, sample_size: int = cfg.ENCODING_SAMPLE_BYTES) -> str:
+    """
+    파일 앞부분(최대 sample_size 바이트)과 BOM만 보고 텍스트 인코딩 판별
+    
+    앞부분이 모두 ASCII이면 판별할 수 없으므로 ASCII가 아닌 바이트가 처음 나오는
+    구간까지 바이트 단위로만 건너뛰며 확인한다 (파싱 없음).
+    
+    Args:
+        file_path: 파일 경로
+        sample_size: 검사할 최대 바이트 수
+        
+    Returns:
+        'utf-8-sig', 'utf-16', 'utf-8' 또는 cfg.INPUT_FALLBACK_ENCODING(cp949)
+    """
+    with open(file_path, 'rb') as f:
+        sample = f.read(sample_size)
+        
+        if sample.startswith(codecs.BOM_UTF8):
+            return 'utf-8-sig'
+        if sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+            return 'utf-16'
+        
+        # ASCII 구간은 어느 인코딩으로도 같으므로 처음 비 ASCII 바이트가 나올 때까지 건너뜀
+        while sample.isascii():
+            block = f.read(sample_size)
+            if not block:
+                return cfg.DEFAULT_ENCODING
+            sample = block
+    
+    try:
+        # 샘플 끝에서 잘린 멀티바이트 문자는 오류로 보지 않음
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return cfg.INPUT_FALLBACK_ENCODING
+
+def zip_files(file_paths: List[str], zip_path: str) -> str:
+    """
+    여러 파일을 하나의 zip 파일로 묶기 (zip 안에는 파일명만 사용)
+    
+    Args:
+        file_paths: 묶을 파일 경로 목록
+        zip_path: 만들 zip 파일 경로
+        
+    Returns:
+        zip 파일 경로
+    """
+    with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for file_path in file_paths:
+            archive.write(file_path, arcname=os.path.basename(file_path))
+    return zip_path
@@ -0,0 +1,220 @@
+"""
+웹 변환 작업 큐 및 작업별 로그 캡처 유틸리티
+"""
+import io
+import sys
+import threading
+import time
+import itertools
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, TextIO
+
+
+class JobQueueFullError(RuntimeError):
+    """
+    대기열이 가득 차서 작업을 받을 수 없을 때 발생
+    """
+
+
+class _ThreadLocalStdout(io.TextIOBase):
+    """
+    스레드마다 출력 대상을 바꿀 수 있는 stdout 대리 객체
+
+    출력 대상이 지정되지 않은 스레드는 원래 stdout으로 출력한다.
+    """
+
+    def __init__(self, default: TextIO):
+        self._default = default
+        self._local = threading.local()
+
+    def _target(self) -> Optional[TextIO]:
+        return getattr(self._local, 'streams', [self._default])[-1]
+
+    def write(self, text: str) -> int:
+        target = self._target()
+        if target is None:  # 출력 버림
+            return len(text)
+        return target.write(text)
+
+    def flush(self) -> None:
+        target = self._target()
+        if target is not None:
+            target.flush()
+
+    @contextmanager
+    def redirect(self, stream: Optional[TextIO]) -> Iterator[None]:
+        streams = getattr(self._local, 'streams', None)
+        if streams is None:
+            streams = self._local.streams = [self._default]
+        streams.append(stream)
+        try:
+            yield
+        finally:
+            streams.pop()
+
+
+_stdout_lock = threading.Lock()
+
+
+def _thread_local_stdout() -> _ThreadLocalStdout:
+    """
+    sys.stdout을 스레드별 대리 객체로 한 번만 교체하고 반환
+    """
+    with _stdout_lock:
+        if not isinstance(sys.stdout, _ThreadLocalStdout):
+            sys.stdout = _ThreadLocalStdout(sys.stdout)
+        return sys.stdout
+
+
+@contextmanager
+def capture_output(stream: Optional[TextIO]) -> Iterator[None]:
+    """
+    현재 스레드의 print 출력만 stream으로 보냄 (None이면 출력 버림)
+
+    다른 스레드의 출력에는 영향을 주지 않으므로 동시에 처리 중인 작업의 로그가 섞이지 않는다.
+
+    Args:
+        stream: 출력을 받을 스트림 (예: io.StringIO) 또는 None
+    """
+    with _thread_local_stdout().redirect(stream):
+        yield
+
+
+class Job:
+    """
+    작업 큐에 등록된 작업 하나 (결과, 로그, 대기/처리 시간)
+    """
+
+    def __init__(self, job_id: int, capture_log: bool = True):
+        self.id = job_id
+        self.log = io.StringIO() if capture_log else None
+        self.future: Future = Future()
+        self.submitted_at = time.perf_counter()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def wait_time(self) -> float:
+        """대기열에서 기다린 시간(초)"""
+        end = self.started_at if self.started_at is not None else time.perf_counter()
+        return end - self.submitted_at
+
+    @property
+    def run_time(self) -> float:
+        """실제 처리 시간(초)"""
+        if self.started_at is None:
+            return 0.0
+        end = self.finished_at if self.finished_at is not None else time.perf_counter()
+        return end - self.started_at
+
+    def log_text(self) -> str:
+        """캡처된 로그 문자열"""
+        return self.log.getvalue() if self.log is not None else ""
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        """작업 결과 반환 (작업 중 발생한 예외는 그대로 다시 발생)"""
+        return self.future.result(timeout)
+
+
+class JobQueue:
+    """
+    크기가 제한된 스레드 풀 작업 큐
+
+    동시에 max_workers개까지 처리하고, 처리 중인 작업 외에 max_pending개까지
+    대기시킨다. 그 이상 들어오면 JobQueueFullError를 발생시켜 요청을 거절한다.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 16, history_size: int = 200):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='voucher-job')
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._queued = 0
+        self._running = 0
+        self._counts = {'submitted': 0, 'completed': 0, 'failed': 0, 'rejected': 0}
+        self._wait_times: deque = deque(maxlen=history_size)
+        self._run_times: deque = deque(maxlen=history_size)
+
+    def submit(self, func: Callable[..., Any], *args: Any, capture_log: bool = True, **kwargs: Any) -> Job:
+        """
+        작업 등록
+
+        Args:
+            func: 실행할 함수
+            *args, **kwargs: func에 전달할 인자
+            capture_log: 작업 중 print 출력을 job.log에 모을지 여부 (False면 버림)
+
+        Returns:
+            등록된 작업 (job.result()로 결과 대기)
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._counts['rejected'] += 1
+            raise JobQueueFullError(
+                f"처리 대기 중인 요청이 많습니다 (최대 {self.max_workers + self.max_pending}건). 잠시 후 다시 시도해주세요."
+            )
+
+        job = Job(next(self._ids), capture_log)
+        with self._lock:
+            self._queued += 1
+            self._counts['submitted'] += 1
+
+        self._executor.submit(self._run, job, func, args, kwargs)
+        return job
+
+    def _run(self, job: Job, func: Callable[..., Any], args: tuple, kwargs: Dict[str, Any]) -> None:
+        job.started_at = time.perf_counter()
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._wait_times.append(job.wait_time)
+
+        try:
+            with capture_output(job.log):
+                result = func(*args, **kwargs)
+        except BaseException as e:
+            self._finish(job, failed=True)
+            job.future.set_exception(e)
+        else:
+            self._finish(job, failed=False)
+            job.future.set_result(result)
+
+    def _finish(self, job: Job, failed: bool) -> None:
+        job.finished_at = time.perf_counter()
+        with self._lock:
+            self._running -= 1
+            self._counts['failed' if failed else 'completed'] += 1
+            self._run_times.append(job.run_time)
+        self._slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        대기열 상태 및 지연 시간 통계 반환
+
+        Returns:
+            {queue_depth, running, max_workers, max_pending, submitted, completed, failed, rejected,
+             avg_wait_sec, max_wait_sec, avg_run_sec, max_run_sec} (시간은 최근 작업 기준)
+        """
+        with self._lock:
+            wait_times = list(self._wait_times)
+            run_times = list(self._run_times)
+            stats = {
+                'queue_depth': self._queued,
+                'running': self._running,
+                'max_workers': self.max_workers,
+                'max_pending': self.max_pending,
+                **self._counts,
+            }
+        stats['avg_wait_sec'] = sum(wait_times) / len(wait_times) if wait_times else 0.0
+        stats['max_wait_sec'] = max(wait_times, default=0.0)
+        stats['avg_run_sec'] = sum(run_times) / len(run_times) if run_times else 0.0
+        stats['max_run_sec'] = max(run_times, default=0.0)
+        return stats
+
+    def shutdown(self, wait: bool = True) -> None:
+        """작업 큐 종료"""
+        self._executor.shutdown(wait=wait)
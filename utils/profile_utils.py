@@ -0,0 +1,168 @@
+"""
+파이프라인 단계별 시간/메모리 측정 유틸리티
+"""
+import os
+import json
+import time
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import resource  # Unix 전용 (Windows에서는 RSS 측정 생략)
+except ImportError:
+    resource = None
+
+
+# 동시에 실행 중인 프로파일러 수 (tracemalloc은 프로세스 전역이므로 마지막 사용자가 끔)
+_tracemalloc_users = 0
+_tracemalloc_lock = threading.Lock()
+
+
+def _start_tracemalloc() -> None:
+    global _tracemalloc_users
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _tracemalloc_users += 1
+
+
+def _stop_tracemalloc() -> None:
+    global _tracemalloc_users
+    with _tracemalloc_lock:
+        _tracemalloc_users -= 1
+        if _tracemalloc_users == 0 and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """
+    프로세스 최대 RSS(MB) 반환 (측정할 수 없으면 None)
+    """
+    if resource is None:
+        return None
+    # Linux는 KB, macOS는 바이트 단위
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if os.uname().sysname == 'Darwin' else peak / 1024
+
+
+class StageProfiler:
+    """
+    파이프라인 단계별 wall/CPU 시간, 메모리, 처리 행 수 기록기
+
+    벽시계 시간은 항상 기록하고, memory=True일 때만 tracemalloc으로 단계별 할당
+    증가량/최대치를 측정한다 (측정 중에는 처리가 느려짐). CPU 시간은 현재 스레드
+    기준이며, tracemalloc과 RSS는 프로세스 전역 값이므로 웹에서 여러 작업이 동시에
+    실행 중이면 다른 작업의 할당이 섞일 수 있다.
+    """
+
+    def __init__(self, memory: bool = False, **meta: Any):
+        self.memory = memory
+        self.meta: Dict[str, Any] = dict(meta)
+        self.stages: List[Dict[str, Any]] = []
+        self.started_at = datetime.now()
+        self._start = time.perf_counter()
+        self._cpu_start = time.thread_time()
+        if memory:
+            _start_tracemalloc()
+
+    @contextmanager
+    def stage(self, name: str, rows: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        블록 하나를 단계로 측정
+
+        Args:
+            name: 단계 이름
+            rows: 처리 행 수 (블록 안에서 record['rows']로 나중에 지정해도 됨)
+
+        Returns:
+            단계 기록 딕셔너리 (with ... as record)
+        """
+        record: Dict[str, Any] = {'stage': name, 'rows': rows}
+        if self.memory:
+            tracemalloc.reset_peak()
+            mem_start = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield record
+        finally:
+            record['wall_sec'] = round(time.perf_counter() - start, 6)
+            record['cpu_sec'] = round(time.thread_time() - cpu_start, 6)
+            if self.memory:
+                current, peak = tracemalloc.get_traced_memory()
+                record['mem_delta_mb'] = round((current - mem_start) / (1024 * 1024), 3)
+                record['mem_peak_mb'] = round((peak - mem_start) / (1024 * 1024), 3)
+                record['rss_peak_mb'] = _peak_rss_mb()
+            self.stages.append(record)
+
+    def timings(self) -> Dict[str, float]:
+        """
+        단계명: wall 시간(초) 딕셔너리
+        """
+        return {record['stage']: record['wall_sec'] for record in self.stages}
+
+    def finish(self) -> Dict[str, Any]:
+        """
+        측정 종료 후 실행 전체 기록 반환 (JSON 직렬화 가능)
+
+        Returns:
+            {started_at, wall_sec, cpu_sec, rss_peak_mb, stages, ...meta}
+        """
+        if self.memory:
+            _stop_tracemalloc()
+            self.memory = False
+        return {
+            **self.meta,
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'wall_sec': round(time.perf_counter() - self._start, 6),
+            'cpu_sec': round(time.thread_time() - self._cpu_start, 6),
+            'rss_peak_mb': _peak_rss_mb(),
+            'stages': self.stages,
+        }
+
+
+def write_profile(record: Dict[str, Any], profile_dir: str, name: str = 'profile') -> str:
+    """
+    실행 기록을 JSON 파일로 저장
+
+    Args:
+        record: StageProfiler.finish()로 만든 기록
+        profile_dir: 저장 폴더
+        name: 파일명 접두어
+
+    Returns:
+        저장된 파일 경로
+    """
+    os.makedirs(profile_dir, exist_ok=True)
+    path = os.path.join(profile_dir, f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(record, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def format_profile(record: Dict[str, Any]) -> List[str]:
+    """
+    실행 기록을 화면 표시용 문자열 목록으로 변환
+
+    Args:
+        record: StageProfiler.finish()로 만든 기록
+
+    Returns:
+        단계별 한 줄씩의 문자열 목록
+    """
+    lines = [f"[프로파일] 전체 {record['wall_sec']:.3f}초 (CPU {record['cpu_sec']:.3f}초)"]
+    for stage in record['stages']:
+        line = f"- {stage['stage']}: {stage['wall_sec']:.3f}초 (CPU {stage['cpu_sec']:.3f}초)"
+        if stage.get('rows') is not None:
+            line += f", {stage['rows']}행"
+        if 'mem_peak_mb' in stage:
+            line += f", 메모리 +{stage['mem_delta_mb']:.1f}MB (최대 +{stage['mem_peak_mb']:.1f}MB)"
+        if 'bytes_per_row' in stage:
+            line += f", 행당 {stage['bytes_per_row']:.0f}바이트"
+        lines.append(line)
+    if record.get('rss_peak_mb') is not None:
+        lines.append(f"최대 RSS: {record['rss_peak_mb']:.1f}MB")
+    return lines
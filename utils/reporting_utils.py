@@ -0,0 +1,63 @@
+"""
+처리 결과 요약 및 보고서 유틸리티
+"""
+import pandas as pd
+from typing import Dict, Any
+
+def print_data_summary(summary: Dict[str, Any], company_config: Dict[str, Any]) -> None:
+    """
+    데이터 요약 정보 출력
+
+    Args:
+        summary: summarize_data로 생성한 요약 정보
+        company_config: 렌탈사 설정 정보
+    """
+    print("\n===== 처리 결과 요약 =====")
+    print(f"적요: {company_config.get('note_prefix', '')}")
+    print(f"처리 건수: {summary['total_count']}건")
+    print(f"총 금액: {int(summary['total_amount']):,}원")
+
+    print("계정별 건수:")
+    for acct, count in summary['account_counts'].items():
+        print(f"- {acct}: {count}건")
+
+    mapping_summary = summary.get('mapping_summary', {})
+    print(f"매핑된 팀 수: {mapping_summary.get('mapped_count', 0)}개")
+
+def generate_report_file(summary: Dict[str, Any], erp_df: pd.DataFrame, report_file: str) -> bool:
+    """
+    처리 결과 보고서를 텍스트 파일로 저장
+
+    Args:
+        summary: summarize_data로 생성한 요약 정보
+        erp_df: ERP 데이터프레임
+        report_file: 보고서 파일 경로
+
+    Returns:
+        저장 성공 여부
+    """
+    try:
+        lines = [
+            "ERP 자동 전표 처리 보고서",
+            f"처리 건수: {summary['total_count']}건",
+            f"총 금액: {int(summary['total_amount']):,}원",
+            f"전표 라인 수: {len(erp_df)}개",
+            "",
+            "[계정별 건수]",
+        ]
+        for acct, count in summary['account_counts'].items():
+            lines.append(f"{acct}: {count}건")
+
+        lines.append("")
+        lines.append("[팀명 매핑 결과]")
+        for team in summary.get('mapping_summary', {}).get('mapped_teams', []):
+            lines.append(f"{team['original']} -> {team['mapped']} (계정: {team['acct']}, 프로젝트: {team['pjt']})")
+
+        with open(report_file, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+
+        print(f"보고서 저장 완료: {report_file}")
+        return True
+    except Exception as e:
+        print(f"보고서 저장 중 오류 발생: {e}")
+        return False